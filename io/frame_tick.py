@@ -5,6 +5,9 @@ _debug_counter = 0
 REPLACE the content of /project1/io/frame_tick with this code.
 
 This version reloads modules dynamically to avoid caching issues.
+Every universe bound in sacn_dispatch.UNIVERSE_SOURCES is read once per frame
+and published through the shared DMX snapshot service; only universes whose
+payload changed are decoded.
 """
 
 import sys
@@ -22,10 +25,11 @@ else:
     import sacn_dispatch
 
 SACN_EXEC_DAT_PATH = "/project1/io/sacn_exec"
-DEFAULT_CHOP_PATH = "/project1/io/EOS_Universe_016"
+DEFAULT_UNIVERSE = 16
 
 
 def _resolve_sacn_chop():
+    """Return the CHOP wired into sacn_exec, if any."""
     dat = op(SACN_EXEC_DAT_PATH)
     if dat:
         if dat.inputs and dat.inputs[0].isCHOP:
@@ -35,26 +39,15 @@ def _resolve_sacn_chop():
             chop = op(chop_par.eval())
             if chop and chop.isCHOP:
                 return chop
-    chop = op(DEFAULT_CHOP_PATH)
-    if chop and chop.isCHOP:
-        return chop
     return None
 
 
-def _chop_to_bytes(chop):
-    if chop.numSamples == 0:
-        return bytes()
-    data = []
-    for channel in chop.chans():
-        raw = channel[0]
-        # CHOP delivers DMX values directly (0-255), not normalized (0-1)
-        value = max(0.0, min(255.0, raw))
-        data.append(int(round(value)))
-    if len(data) > 512:
-        data = data[-512:]
-    elif len(data) < 512:
-        data.extend([0] * (512 - len(data)))
-    return bytes(data)
+def _chop_universe(chop):
+    universe_par = getattr(chop.par, "Universe", None)
+    try:
+        return int(universe_par.eval()) if universe_par else DEFAULT_UNIVERSE
+    except Exception:
+        return DEFAULT_UNIVERSE
 
 
 def onFrameStart(dat):
@@ -63,20 +56,20 @@ def onFrameStart(dat):
     if _debug_counter % 60 == 0:  # Print every 60 frames (1 second at 60fps)
         print(f"[frame_tick] Running... counter={_debug_counter}")
 
-    chop = _resolve_sacn_chop()
-    if not chop:
-        return
-    payload = _chop_to_bytes(chop)
-    if not payload:
+    # frame_tick also runs from sacn_exec on every channel change; the shared
+    # snapshot service makes every call after the first one per frame free.
+    frame = absTime.frame
+    if sacn_dispatch.get_service().has_frame(frame):
         return
-    universe_par = getattr(chop.par, "Universe", None)
-    try:
-        universe = int(universe_par.eval()) if universe_par else 16
-    except Exception:
-        universe = 16
 
-    # Clear cache before calling to ensure fresh instance loading
-    if hasattr(sacn_dispatch, '_instances_cache'):
-        sacn_dispatch._instances_cache.clear()
+    extra = {}
+    # A CHOP wired into sacn_exec still works for universes not bound explicitly
+    chop = None if sacn_dispatch.USE_E131_RECEIVER else _resolve_sacn_chop()
+    if chop:
+        universe = _chop_universe(chop)
+        if universe not in sacn_dispatch.UNIVERSE_SOURCES:
+            payload = sacn_dispatch.chop_to_payload(chop)
+            if payload:
+                extra[universe] = payload
 
-    sacn_dispatch.handle_universe(payload, universe)
+    sacn_dispatch.tick(frame, extra)
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict
+from typing import Callable, Dict, Mapping, Union
 
 import s2l_unit as s2l
 
@@ -17,23 +17,87 @@ except:
 # Adjust to your actual dispatcher DAT location.
 MANAGER_DAT_PATH = "/project1/src/s2l_manager/dispatcher"
 
+Payload = Union[bytes, memoryview]
+
+# Universe -> source binding. A source is either a CHOP path or a callable
+# returning the 512-slot payload. Add one entry per sACN In CHOP.
+UNIVERSE_SOURCES: Dict[int, Union[str, Callable[[], bytes]]] = {
+    16: "/project1/io/EOS_Universe_016",
+}
 
 DEBUG_RAW = False
 
-# Performance: Cache instances per universe to avoid reloading config every frame
-_instances_cache: Dict[int, list] = {}
+# Optional native E1.31 receiver (bypasses the sACN In CHOPs when enabled).
+USE_E131_RECEIVER = False
+E131_BIND_ADDRESS = ""
+E131_MULTICAST = True
+# frame_tick reloads this module (importlib.reload re-runs it in the same
+# namespace): stop the receiver of the previous load so its thread and
+# socket do not outlive the reference
+if globals().get("_receiver") is not None:
+    globals()["_receiver"].stop()
+_receiver: s2l.E131Receiver | None = None
+
+# Prebuilt universe -> decode plan index (rebuilt only on config changes)
+_universe_index: Dict[int, s2l.DecodePlan] | None = None
+_decoder: s2l.MultiUniverseDecoder | None = None
+# One snapshot per universe and frame, shared by every registered consumer
+_service: s2l.DMXSnapshotService | None = None
 # Performance: Cache defaults to avoid reloading config every frame
 _defaults_cache: Dict[str, Dict[str, int]] | None = None
 
 
-def _instances_for_universe(universe: int) -> list[s2l.InstanceDefinition]:
-    if universe not in _instances_cache:
-        _instances_cache[universe] = [
-            inst
-            for inst in s2l.load_instances()
-            if inst.enabled and inst.universe == universe
-        ]
-    return _instances_cache[universe]
+def rebuild_index(force_reload: bool = False) -> Dict[int, s2l.DecodePlan]:
+    """(Re)build the universe index from instances.csv."""
+    global _universe_index, _decoder, _service
+    _universe_index = s2l.build_universe_index(s2l.load_instances(force_reload=force_reload))
+    if _decoder is None:
+        _decoder = s2l.MultiUniverseDecoder(_universe_index, scaling=False)
+        _service = s2l.DMXSnapshotService(_decoder)
+        _service.register(_forward_to_manager)
+    else:
+        _decoder.reset(_universe_index)
+        _service.reset()  # type: ignore[union-attr]
+        _reload_manager_instances()
+    return _universe_index
+
+
+def _reload_manager_instances() -> None:
+    """Let the manager drop rows (and publish removals) for deleted instances."""
+    target = op(MANAGER_DAT_PATH) if op else None  # type: ignore[misc]
+    reload = getattr(target.module, "reload_instances", None) if target else None
+    if callable(reload):
+        reload()
+
+
+def _get_decoder() -> s2l.MultiUniverseDecoder:
+    if _decoder is None:
+        rebuild_index()
+    return _decoder  # type: ignore[return-value]
+
+
+def get_service() -> s2l.DMXSnapshotService:
+    """Return the shared DMX snapshot service (built on first use)."""
+    if _service is None:
+        rebuild_index()
+    return _service  # type: ignore[return-value]
+
+
+def register_consumer(consumer: Callable[[s2l.DMXSnapshot], None]) -> None:
+    """Receive every new universe snapshot; consumers must not mutate it."""
+    get_service().register(consumer)
+
+
+def unregister_consumer(consumer: Callable[[s2l.DMXSnapshot], None]) -> None:
+    get_service().unregister(consumer)
+
+
+def latest_snapshot(universe: int) -> s2l.DMXSnapshot | None:
+    return get_service().latest(universe)
+
+
+def plan_for_universe(universe: int) -> s2l.DecodePlan | None:
+    return _get_decoder().plan_for(universe)
 
 
 def _get_defaults() -> Dict[str, Dict[str, int]]:
@@ -44,34 +108,83 @@ def _get_defaults() -> Dict[str, Dict[str, int]]:
     return _defaults_cache
 
 
-def handle_universe(payload: bytes, universe: int) -> None:
-    """Decode DMX payload for a universe and forward it to the manager."""
-    if not payload:
-        return
-
-    instances = _instances_for_universe(universe)
-    if not instances:
-        return
-
-    if DEBUG_RAW:
-        # Show first 20 bytes of payload
-        first_bytes = [payload[i] if i < len(payload) else None for i in range(20)]
-        print(f"[sacn_dispatch] Payload first 20 bytes: {first_bytes}")
-
-        for inst in instances:
-            start = inst.start_address - 1
-            print(f"[sacn_dispatch] Instance {inst.instance}: start_address={inst.start_address}, offset={start}")
-            coarse = payload[start] if start < len(payload) else None
-            fine = payload[start + 1] if start + 1 < len(payload) else None
-            print(f"[sacn_dispatch] raw bytes {inst.instance}: payload[{start}]={coarse}, payload[{start+1}]={fine}")
-
-    try:
-        values: Dict[str, Dict[str, int]] = s2l.decode_universe(payload, instances, scaling=False)
-    except s2l.DMXBufferError as exc:
-        print(f"[sacn_dispatch] invalid DMX buffer: {exc}")
-        return
-
-    defaults = _get_defaults()
+def chop_to_payload(chop) -> bytes:
+    """Convert a sACN In CHOP into a 512-slot DMX payload."""
+    if chop.numSamples == 0:
+        return bytes()
+    data = []
+    for channel in chop.chans():
+        raw = channel[0]
+        # CHOP delivers DMX values directly (0-255), not normalized (0-1)
+        value = max(0.0, min(255.0, raw))
+        data.append(int(round(value)))
+    if len(data) > 512:
+        data = data[-512:]
+    elif len(data) < 512:
+        data.extend([0] * (512 - len(data)))
+    return bytes(data)
+
+
+def start_receiver() -> s2l.E131Receiver | None:
+    """Start the native E1.31 receiver for every indexed universe."""
+    global _receiver
+    if _receiver is not None and _receiver.running:
+        return _receiver
+    universes = _get_decoder().universes
+    if not universes:
+        print("[sacn_dispatch] no universes indexed; E1.31 receiver not started")
+        return None
+    _receiver = s2l.E131Receiver(
+        universes, bind_address=E131_BIND_ADDRESS, multicast=E131_MULTICAST
+    )
+    _receiver.start()
+    print(f"[sacn_dispatch] E1.31 receiver listening for universes {list(universes)}")
+    return _receiver
+
+
+def stop_receiver() -> None:
+    global _receiver
+    if _receiver is not None:
+        _receiver.stop()
+        _receiver = None
+
+
+def read_sources() -> Dict[int, Payload]:
+    """Read the current payload of every bound universe source."""
+    if USE_E131_RECEIVER:
+        receiver = _receiver or start_receiver()
+        # Views into the receiver buffers; only universes with fresh packets
+        return dict(receiver.poll()) if receiver else {}
+
+    payloads: Dict[int, Payload] = {}
+    for universe, source in UNIVERSE_SOURCES.items():
+        if callable(source):
+            payload = source()
+        else:
+            chop = op(source) if op else None  # type: ignore[misc]
+            if not chop or not chop.isCHOP:
+                continue
+            payload = chop_to_payload(chop)
+        if payload:
+            payloads[universe] = payload
+    return payloads
+
+
+def _debug_dump(payload: Payload, plan: s2l.DecodePlan) -> None:
+    # Show first 20 bytes of payload
+    first_bytes = [payload[i] if i < len(payload) else None for i in range(20)]
+    print(f"[sacn_dispatch] U{plan.universe} payload first 20 bytes: {first_bytes}")
+
+    for inst in plan.instances:
+        start = inst.start_address - 1
+        print(f"[sacn_dispatch] Instance {inst.instance}: start_address={inst.start_address}, offset={start}")
+        coarse = payload[start] if start < len(payload) else None
+        fine = payload[start + 1] if start + 1 < len(payload) else None
+        print(f"[sacn_dispatch] raw bytes {inst.instance}: payload[{start}]={coarse}, payload[{start+1}]={fine}")
+
+
+def _forward_to_manager(snapshot: s2l.DMXSnapshot) -> None:
+    """Default consumer: push decoded values into the S2L manager dispatcher."""
     target = op(MANAGER_DAT_PATH)  # type: ignore[name-defined]
     if not target:
         print(f"[sacn_dispatch] manager not found at {MANAGER_DAT_PATH}")
@@ -82,4 +195,43 @@ def handle_universe(payload: bytes, universe: int) -> None:
         print(f"[sacn_dispatch] manager at {MANAGER_DAT_PATH} missing update_from_dmx()")
         return
 
-    update(universe, values, defaults)
+    update(snapshot.universe, snapshot.values, _get_defaults(), frame=snapshot.frame)
+
+
+def handle_universes(payloads: Mapping[int, Payload], frame: int | None = None) -> None:
+    """Publish a snapshot for every changed universe payload.
+
+    With a frame number, repeated calls within the same frame are ignored.
+    """
+    service = get_service()
+
+    if DEBUG_RAW:
+        for universe, payload in payloads.items():
+            plan = service.decoder.plan_for(universe)
+            if plan and payload:
+                _debug_dump(payload, plan)
+
+    service.publish(frame, payloads)
+    for universe, exc in service.decoder.errors.items():
+        print(f"[sacn_dispatch] invalid DMX buffer for universe {universe}: {exc}")
+    for consumer, exc in service.consumer_errors:
+        print(f"[sacn_dispatch] consumer {getattr(consumer, '__name__', consumer)} failed: {exc}")
+
+
+def tick(frame: int, extra_payloads: Mapping[int, Payload] | None = None) -> None:
+    """Read all sources and publish snapshots at most once per frame."""
+    service = get_service()
+    if service.has_frame(frame):
+        return
+    payloads = read_sources()
+    if extra_payloads:
+        for universe, payload in extra_payloads.items():
+            payloads.setdefault(universe, payload)
+    handle_universes(payloads, frame)
+
+
+def handle_universe(payload: Payload, universe: int) -> None:
+    """Decode DMX payload for a universe and forward it to the manager."""
+    if not payload:
+        return
+    handle_universes({universe: payload})
@@ -1,18 +1,51 @@
+try:
+    from eos_osc import get_cache as _output_cache, get_pool as _output_pool
+except ImportError:  # src/ not on sys.path (bootstrap not run)
+    _output_cache = _output_pool = None
+
+
+def _dispatch_replies(replies):
+    # Replies of tcp:// consoles go to the same handler as the OSC In DAT
+    if not replies:
+        return
+    try:
+        handler = mod('/project1/palette_logic/eos_notify_handler')
+    except Exception as exc:
+        print('[tick_exec] eos_notify_handler unavailable, dropped', len(replies), 'replies:', exc)
+        return
+    for _ip, address, args in replies:
+        handler.on_osc_receive(address, args)
+
+
 def onFrameStart(frame):
+    # Send rate-limited trailing values (fader/submaster levels) once per frame
+    # and write the per-console OSC queues
+    if _output_cache is not None:
+        _output_cache().flush()
+        _output_pool().flush()
     base = op('/project1')
     if not base:
         return
+    if _output_pool is not None:
+        _dispatch_replies(_output_pool().poll())
+    try:
+        state = mod('/project1/palette_logic/state')
+    except Exception as exc:
+        print('[tick_exec] palette modules unavailable:', exc)
+        return
+    state.attach_base(base)
+    # Palette replies are staged in state; write them to the pal_* DATs in one
+    # batch, also while the sync is disabled (replies to manual requests)
+    state.flush_tables()
     if not bool(base.fetch('PALETTE_SYNC_ENABLED', False)):
         # Palette sync disabled; keep DAT quiet.
         return
     try:
         watchdog = mod('/project1/palette_logic/watchdog')
         pump = mod('/project1/palette_logic/pump')
-        state = mod('/project1/palette_logic/state')
     except Exception as exc:
         print('[tick_exec] palette modules unavailable:', exc)
         return
-    state.attach_base(base)
     # Use project timeline FPS (default 60 if not set)
     fps = max(int(project.cookRate), 1) if hasattr(project, 'cookRate') else 60
     if frame % fps == 0:
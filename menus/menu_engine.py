@@ -1,6 +1,13 @@
 # /project1/layers/menus/menu_engine – minimal & robust
 import re
 
+try:
+    # Shared last-sent cache (src/eos_osc): fader values are deduplicated
+    # against every other module that drives the same Eos address
+    from eos_osc import get_cache as _output_cache
+except ImportError:  # src/ not on sys.path (bootstrap not run)
+    _output_cache = None
+
 OSCDAT = op('/project1/io/oscout1')
 STATE  = op('/project1')  # Storage: ACTIVE_MENU ? {None, 1..5}
 DRV    = op('/project1/io/driver_led')
@@ -449,8 +456,20 @@ def _send_osc(addr, payload):
         pass
     try:
         OSCDAT.sendOSC(addr, payload)
+        return True
     except Exception as e:
         print("[osc ERR]", addr, payload, e)
+        return False
+
+def _send_osc_value(addr, payload):
+    """Absolute values (fader levels): skip redundant sends, rate-limit per address.
+
+    Key presses and encoder deltas must keep using _send_osc.
+    """
+    if _output_cache is None:
+        _send_osc(addr, payload)
+        return
+    _output_cache().offer(addr, payload, send=_send_osc)
 
 def handle_event(topic, value):
     _ensure_active()
@@ -632,9 +651,9 @@ def handle_event(topic, value):
             y = _quantize_fader_value(y)
             path, scale = _lookup(act, base_topic)
             if path:
-                _send_osc(path, [float(y) * scale])
+                _send_osc_value(path, [float(y) * scale])
             else:
-                _send_osc('/' + base_topic, [float(y)])
+                _send_osc_value('/' + base_topic, [float(y)])
         return True
 
     # 4) Standard: Lookup und raus
@@ -1,6 +1,12 @@
 """Parse incoming EOS OSC payloads and update palette tables."""
-import re
-from typing import Sequence
+from typing import Callable, Dict, List, Sequence
+
+try:
+    from eos_osc.router import OscRouter
+except ImportError:  # src/ not on sys.path (bootstrap not run yet)
+    import sys
+    sys.path.append(project.folder + '/src')
+    from eos_osc.router import OscRouter
 
 # TouchDesigner-compatible module loading
 def _get_module(name):
@@ -10,21 +16,32 @@ def _get_module(name):
         raise RuntimeError("Project base not found")
     return mod(f'/project1/palette_logic/{name}')
 
+
+# Optional DATs: older project files lack them; the tables are filled anyway
+_optional: Dict[str, object] = {}
+
+
+def _optional_module(name):
+    """palette_logic module ``name``, or None (warned once) if the DAT is missing."""
+    if name not in _optional:
+        try:
+            _optional[name] = _get_module(name)
+        except Exception as exc:
+            _optional[name] = None
+            print(f"[palette] WARN palette_logic/{name} unavailable ({exc}); see PALETTE_SYNC_TEST.md")
+    return _optional[name]
+
+
 state = _get_module('state')
 pump = _get_module('pump')
 ORDER = state.ORDER
-TABLE_HEADER = state.TABLE_HEADER
 
-RE_COUNT = re.compile(r"^/eos/out/get/(?P<typ>ip|fp|cp|bp)/count$")
-RE_LIST = re.compile(
-    r"^/eos/out/get/(?P<typ>ip|fp|cp|bp)/(?P<num>\d+)/list/(?P<idx>\d+)/(?:\d+)$"
-)
-RE_CHANNELS = re.compile(
-    r"^/eos/out/get/(?P<typ>ip|fp|cp|bp)/(?P<num>\d+)/channels/list/(?P<idx>\d+)/(?:\d+)$"
-)
-RE_BYTYPE = re.compile(
-    r"^/eos/out/get/(?P<typ>ip|fp|cp|bp)/(?P<num>\d+)/bytype/list/(?P<idx>\d+)/(?:\d+)$"
-)
+TYPES = "ip|fp|cp|bp"
+SHOW_NAME_ADDRESS = "/eos/out/show/name"
+COUNT_ROUTE = f"/eos/out/get/{{typ:{TYPES}}}/count"
+LIST_ROUTE = f"/eos/out/get/{{typ:{TYPES}}}/{{num:int}}/list/{{idx:int}}/{{:int}}"
+CHANNELS_ROUTE = f"/eos/out/get/{{typ:{TYPES}}}/{{num:int}}/channels/list/{{idx:int}}/{{:int}}"
+BYTYPE_ROUTE = f"/eos/out/get/{{typ:{TYPES}}}/{{num:int}}/bytype/list/{{idx:int}}/{{:int}}"
 
 
 def _clean_label(tokens: Sequence[object]) -> str:
@@ -41,73 +58,118 @@ def _clean_label(tokens: Sequence[object]) -> str:
 
 
 def _update_row(palette_type: str, index: int, **fields) -> None:
-    # index is now the 1-based palette number (not 0-based array index)
-    rows = max(state.state.counts.get(palette_type, 0), index)
-    table = state.ensure_table(palette_type, rows)
-    if not table:
-        return
-    header = TABLE_HEADER
-    # Row 0 = header, Row 1 = Palette #1, etc.
-    row = index
-    table[row, header.index("index")] = str(index)
-    if state.state.counts.get(palette_type, 0) < index:
-        state.state.counts[palette_type] = index
-    for key, value in fields.items():
-        if value is None or key not in header:
-            continue
-        table[row, header.index(key)] = str(value)
+    # index: 0-based list index of the reply (as requested with /index/{n});
+    # it lands in table row index + 1 (row 0 = header), the row the cache
+    # keeps for that index. Staged, written by tick_exec
+    if state.state.counts.get(palette_type, 0) < index + 1:
+        state.state.counts[palette_type] = index + 1
+    state.stage_index(palette_type, index, index=index, **fields)
 
 
-def on_osc_receive(address: str, args: Sequence[object], timestamp: float = 0.0) -> None:
-    base = op("/project1")
-    state.attach_base(base)
-    state.mark_activity()
-    if not address.startswith("/eos/out/get/"):
+def _on_show_name(name: str) -> None:
+    st = state.state
+    if name == st.show_name:
         return
+    print(f"[palette] show: '{name}'")
+    if st.show_name:
+        # Another show was loaded: tables must be planned against the cache again
+        for palette_type in ORDER:
+            st.planned_counts[palette_type] = None
+    st.show_name = name
 
-    match = RE_COUNT.match(address)
-    if match:
-        palette_type = match.group("typ")
-        count = int(float(args[0])) if args else 0
-        print(f"[palette] DEBUG received count: {palette_type}={count} | OSC: {address} {args}")
-        pump.queue_counts(base, {palette_type: count})
-        return
 
-    match = RE_LIST.match(address)
-    if match:
-        palette_type = match.group("typ")
-        palette_num = int(match.group("num"))
-        index = int(float(args[0])) if args else int(match.group("idx"))
-        uid = str(args[1]) if len(args) > 1 else ""
-        label = _clean_label(args[2:])
-        print(f"[palette] DEBUG received list: {palette_type} #{palette_num} idx={index} uid={uid} label='{label}'")
-        _update_row(
-            palette_type, index, num=palette_num, uid=uid, label=label
-        )
-        pump.on_list_ack(base, palette_type, index)
-        return
+def _on_count(args: Sequence[object], palette_type: str) -> None:
+    count = int(float(args[0])) if args else 0
+    print(f"[palette] DEBUG received count: {palette_type}={count} | OSC: /eos/out/get/{palette_type}/count {args}")
+    pump.queue_counts(state.get_base(), {palette_type: count})
 
-    match = RE_CHANNELS.match(address)
-    if match:
-        palette_type = match.group("typ")
-        index = int(float(args[0])) if args else int(match.group("idx"))
-        channels = " ".join(str(item) for item in args[1:])
-        print(f"[palette] DEBUG received channels: {palette_type} #{index} channels='{channels}'")
-        _update_row(palette_type, index, channels=channels)
-        return
 
-    match = RE_BYTYPE.match(address)
-    if match:
-        palette_type = match.group("typ")
-        palette_num = int(match.group("num"))  # Actual palette number from EOS
-        request_index = int(float(args[0])) if args else 0  # The 0-based index we requested
-        bytype = " ".join(str(item) for item in args[1:])
-        print(f"[palette] DEBUG received bytype: {palette_type} palette#{palette_num} (request_index={request_index}) bytype='{bytype}'")
-        # Write to row palette_num
-        _update_row(palette_type, palette_num, bytype=bytype)
-        # IMPORTANT: ACK to pump so it continues with next palette!
-        pump.on_list_ack(base, palette_type, request_index)
-        return
+def _on_list(args: Sequence[object], palette_type: str, palette_num: int, idx: int) -> None:
+    index = int(float(args[0])) if args else idx
+    uid = str(args[1]) if len(args) > 1 else ""
+    label = _clean_label(args[2:])
+    print(f"[palette] DEBUG received list: {palette_type} #{palette_num} idx={index} uid={uid} label='{label}'")
+    _update_row(
+        palette_type, index, num=palette_num, uid=uid, label=label
+    )
+    pump.on_list_ack(state.get_base(), palette_type, index, palette_num)
+
+
+def _on_channels(args: Sequence[object], palette_type: str, palette_num: int, idx: int) -> None:
+    index = int(float(args[0])) if args else idx
+    channels = " ".join(str(item) for item in args[1:])
+    print(f"[palette] DEBUG received channels: {palette_type} #{index} channels='{channels}'")
+    _update_row(palette_type, index, channels=channels)
+    palette_index = _optional_module('palette_index')
+    if palette_index is not None:
+        palette_index.index.set_channels(palette_type, palette_num, channels)
+
+
+def _on_bytype(args: Sequence[object], palette_type: str, palette_num: int, idx: int) -> None:
+    # palette_num: actual palette number from EOS
+    request_index = int(float(args[0])) if args else idx  # The 0-based index we requested
+    bytype = " ".join(str(item) for item in args[1:])
+    print(f"[palette] DEBUG received bytype: {palette_type} palette#{palette_num} (request_index={request_index}) bytype='{bytype}'")
+    # Same row as the list / channels replies of this index
+    _update_row(palette_type, request_index, bytype=bytype)
+    palette_index = _optional_module('palette_index')
+    if palette_index is not None:
+        palette_index.index.set_bytype(palette_type, palette_num, bytype)
+    # IMPORTANT: ACK to pump so it continues with next palette!
+    pump.on_list_ack(state.get_base(), palette_type, request_index, palette_num)
+
+
+def _on_notify(args: Sequence[object], palette_type: str) -> None:
+    # args[0] is the notify list index, the rest are changed palette numbers
+    numbers = _optional_module('notify').parse_numbers(args[1:])
+    if numbers:
+        pump.queue_numbers(state.get_base(), palette_type, numbers)
+
+
+# One trie walk per message instead of a regex cascade; unrecognized
+# addresses are counted (router.unmatched / router.last_unmatched)
+router = OscRouter()
+router.add(SHOW_NAME_ADDRESS, lambda args: _on_show_name(str(args[0]) if args else ""), "show_name")
+router.add(COUNT_ROUTE, _on_count, "count")
+router.add(LIST_ROUTE, _on_list, "list")
+router.add(CHANNELS_ROUTE, _on_channels, "channels")
+router.add(BYTYPE_ROUTE, _on_bytype, "bytype")
+_notify_resolved = False  # notify route is added on the first message
+
+
+# Extra consumers of every EOS message (e.g. subscribe_manager sync tasks)
+_listeners: List[Callable[[str, Sequence[object]], object]] = []
+
+
+def add_listener(listener: Callable[[str, Sequence[object]], object]) -> None:
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[str, Sequence[object]], object]) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _add_notify_route() -> None:
+    """Route /eos/out/notify once the notify DAT is resolved (first message)."""
+    global _notify_resolved
+    _notify_resolved = True
+    notify = _optional_module('notify')
+    if notify is not None:
+        router.add(notify.NOTIFY_ROUTE, _on_notify, "notify")
+
+
+def on_osc_receive(address: str, args: Sequence[object], timestamp: float = 0.0) -> None:
+    if not _notify_resolved:
+        _add_notify_route()
+    state.attach_base(op("/project1"))
+    state.mark_activity()
+    router.dispatch(address, args)
+    for listener in tuple(_listeners):
+        listener(address, args)
+
 
-    # Log unrecognized EOS messages for debugging
-    print(f"[palette] DEBUG unrecognized OSC: {address} {args}")
+def report() -> dict:
+    """Messages handled per route (plus unmatched) since the last reset."""
+    return router.report()
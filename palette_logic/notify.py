@@ -0,0 +1,55 @@
+"""Parse EOS change notifications for palettes.
+
+EOS sends ``/eos/out/notify/{type}/list/<list index>/<list count>`` with the
+arguments ``<list index>, <number>, <number>, ...`` when palettes are created,
+edited or deleted. Numbers may arrive as ints, floats or strings, and ranges
+as ``"5-9"``.
+"""
+from typing import Iterable, List
+
+# Route pattern for eos_osc.OscRouter
+NOTIFY_ROUTE = "/eos/out/notify/{typ:ip|fp|cp|bp}/list/{:int}/{:int}"
+
+# Guard against a malformed range flooding the request queue
+MAX_RANGE = 1000
+
+
+def _number(token) -> int:
+    value = float(token)
+    if value != int(value):
+        raise ValueError(f"not a palette number: {token!r}")
+    return int(value)
+
+
+def parse_numbers(args: Iterable[object]) -> List[int]:
+    """Palette numbers named by the notify arguments (without the list index)."""
+    numbers: List[int] = []
+    seen = set()
+    for token in args:
+        text = str(token).strip()
+        if not text:
+            continue
+        try:
+            if "-" in text.lstrip("-"):
+                low_text, high_text = text.split("-", 1)
+                low, high = _number(low_text), _number(high_text)
+                if high < low or high - low >= MAX_RANGE:
+                    print(f"[palette] WARN ignoring notify range {text}")
+                    continue
+                values = range(low, high + 1)
+            else:
+                values = (_number(text),)
+        except ValueError:
+            print(f"[palette] WARN ignoring notify token {text!r}")
+            continue
+        for value in values:
+            if value > 0 and value not in seen:
+                seen.add(value)
+                numbers.append(value)
+    return numbers
+
+
+__all__ = [
+    "NOTIFY_ROUTE",
+    "parse_numbers",
+]
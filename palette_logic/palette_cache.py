@@ -0,0 +1,200 @@
+"""On-disk cache of the pal_* tables for fast palette resync.
+
+The cache is one compact JSON file:
+
+    {"version": 1, "show": "<show name>", "types": {"ip": [[index, num, uid, label, channels, bytype], ...], ...}}
+
+Row ``r`` of a type belongs to request index ``r`` (0-based, as in
+``/eos/get/{type}/index/{r}``; table row ``r + 1``, see state.row_for_index).
+``plan_resync`` compares the known rows (on-disk cache at startup, the
+table during a session) with the count EOS reports:
+
+- same count or more palettes: restore the rows (the table is usable at
+  once), fetch the new indices and run a ``UidCheck`` over the rest; an
+  unchanged show costs only the probes
+- fewer palettes: indices shifted, full refetch
+
+Edits that keep the count and every uid (labels, channels) are not
+detected; during a session /eos/out/notify refetches them, offline edits
+need a manual resync (subscribe_manager.sync_palettes).
+
+After an /eos/out/notify the changed palette numbers are known:
+``plan_notified`` refetches from the index where the first of them is (or
+was) in the number order, keeping the rows before it.
+
+Rows without a uid (interrupted sync) are always fetched again.
+
+``UidCheck`` finds the first index shifted by inserted or deleted palettes
+with a binary search: it requests single indices and compares the uid EOS
+reports with the known one. Every row from the first mismatch on is fetched
+again.
+"""
+import json
+import os
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+CACHE_VERSION = 1
+CACHE_FILE = "palette_cache.json"
+NUM_COLUMN = 1  # TABLE_HEADER: index, num, uid, label, channels, bytype
+UID_COLUMN = 2
+
+Row = List[str]
+
+
+def _uid(row: Row) -> str:
+    return row[UID_COLUMN] if len(row) > UID_COLUMN else ""
+
+
+class UidCheck:
+    """Binary search for the first restored row whose uid no longer matches.
+
+    Inserting or deleting a palette shifts every later index, so the rows
+    before the first shifted index match and the rows from it on do not.
+    ``probe`` is the index to request next; feed the uid EOS reports for it
+    to ``answer``. Rows without a cached uid count as matching (they are
+    fetched anyway).
+    """
+
+    def __init__(self, uids: Sequence[str]) -> None:
+        self.uids = list(uids)
+        self.lo = 0
+        self.hi = len(self.uids)
+
+    @property
+    def done(self) -> bool:
+        return self.lo >= self.hi
+
+    @property
+    def probe(self) -> Optional[int]:
+        return None if self.done else (self.lo + self.hi) // 2
+
+    @property
+    def first_shifted(self) -> int:
+        """First index to refetch (``len(uids)``: all rows verified)."""
+        return self.lo
+
+    def answer(self, index: int, uid: Optional[str]) -> bool:
+        """Uid reported for ``index`` (None: no reply); False if not the probe."""
+        if index != self.probe:
+            return False
+        expected = self.uids[index]
+        if not expected or uid == expected:
+            self.lo = index + 1
+        else:
+            self.hi = index
+        return True
+
+
+class ResyncPlan(NamedTuple):
+    restore: bool          # write the cached rows into the table first
+    fetch: List[int]       # request indices still to fetch
+    check: Optional[UidCheck] = None   # verify the restored rows
+
+
+def plan_resync(cached_rows: Optional[Sequence[Row]], count: int) -> ResyncPlan:
+    """Which indices must be fetched when EOS reports ``count`` palettes."""
+    count = max(count, 0)
+    if not cached_rows or len(cached_rows) > count:
+        return ResyncPlan(False, list(range(count)))
+    uids = [_uid(row) for row in cached_rows]
+    missing = [i for i, uid in enumerate(uids) if not uid]
+    check = UidCheck(uids) if len(missing) < len(uids) else None
+    return ResyncPlan(True, missing + list(range(len(cached_rows), count)), check)
+
+
+def _num(row: Row) -> Optional[float]:
+    try:
+        return float(row[NUM_COLUMN])
+    except (IndexError, ValueError):
+        return None
+
+
+def plan_notified(rows: Sequence[Row], count: int, numbers) -> ResyncPlan:
+    """Plan for a count change caused by notified palette ``numbers``.
+
+    The rows are in palette number order, so an inserted or deleted palette
+    only shifts the indices from its own position on: the number of rows
+    with a lower palette number. (Counted rather than bisected: the reply to
+    the notify fetch may already have overwritten the row at that index.)
+    """
+    count = max(count, 0)
+    nums = [_num(row) for row in rows]
+    if not numbers or any(num is None for num in nums):
+        return plan_resync(rows, count)
+    first = min(sum(1 for num in nums if num < number) for number in numbers)
+    first = min(first, count)
+    missing = [i for i, row in enumerate(rows[:first]) if not _uid(row)]
+    return ResyncPlan(True, missing + list(range(first, count)))
+
+
+class PaletteCache:
+    """Cached rows per palette type, loaded from / saved to ``path``."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.show = ""
+        self.types: Dict[str, List[Row]] = {}
+        self.loaded = False
+
+    def load(self) -> bool:
+        """Read the cache file; False (and an empty cache) if missing or invalid."""
+        self.loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as exc:
+            print(f"[palette] WARN ignoring palette cache {self.path}: {exc}")
+            return False
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return False
+        types = data.get("types") or {}
+        self.show = str(data.get("show") or "")
+        self.types = {
+            str(t): [[str(cell) for cell in row] for row in rows]
+            for t, rows in types.items() if isinstance(rows, list)
+        }
+        return True
+
+    def rows(self, palette_type: str, show: str = "") -> Optional[List[Row]]:
+        """Cached rows, or None if there are none or they belong to another show."""
+        if not self.loaded:
+            self.load()
+        if show and self.show and show != self.show:
+            return None
+        return self.types.get(palette_type)
+
+    def update(self, palette_type: str, rows: Sequence[Row], show: str = "") -> bool:
+        """Replace the rows of one type; True if anything changed."""
+        rows = [list(row) for row in rows]
+        changed = self.types.get(palette_type) != rows or (show and show != self.show)
+        self.types[palette_type] = rows
+        if show:
+            self.show = show
+        return bool(changed)
+
+    def save(self) -> bool:
+        data = {"version": CACHE_VERSION, "show": self.show, "types": self.types}
+        tmp = self.path + ".tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(data, fh, separators=(",", ":"), ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            print(f"[palette] WARN could not write palette cache {self.path}: {exc}")
+            return False
+        return True
+
+
+__all__ = [
+    "CACHE_FILE",
+    "PaletteCache",
+    "ResyncPlan",
+    "UidCheck",
+    "plan_notified",
+    "plan_resync",
+]
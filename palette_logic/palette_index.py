@@ -0,0 +1,186 @@
+"""Inverted indices over palette channels and bytype.
+
+The pal_* tables keep ``channels`` / ``bytype`` as space-joined strings.
+``PaletteIndex`` holds them parsed:
+
+- per palette: sorted ``array('i')`` of channel numbers
+- per type: channel -> set of palette numbers, bytype -> set of palette numbers
+
+It is updated per reply by eos_notify_handler (and from cached rows by the
+pump), so "which palettes touch channel 101?" is a dict lookup.
+
+Channel lists use EOS notation: ``"1-5 7 10 Thru 12"``, ``"1-5,7"``; parts
+(``"101.2"``) count as their channel.
+"""
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+MAX_CHANNEL = 99999   # EOS channel limit; guards against runaway ranges
+
+_RANGE_SEP = re.compile(r"\s*(?:-|\bthru\b)\s*", re.IGNORECASE)
+_SPLIT = re.compile(r"[\s,;]+")
+
+
+def _channel(text: str) -> Optional[int]:
+    head = text.split(".", 1)[0]
+    if not head.isdigit():
+        return None
+    value = int(head)
+    return value if 0 < value <= MAX_CHANNEL else None
+
+
+def parse_channels(tokens) -> array:
+    """Sorted unique channel numbers of an EOS channel list (str or tokens)."""
+    text = tokens if isinstance(tokens, str) else " ".join(str(t) for t in tokens)
+    channels: Set[int] = set()
+    for part in _SPLIT.split(_RANGE_SEP.sub("-", text.strip())):
+        if not part:
+            continue
+        low_text, sep, high_text = part.partition("-")
+        low = _channel(low_text)
+        if low is None:
+            continue
+        high = _channel(high_text) if sep else low
+        if high is None:
+            continue
+        if high < low:
+            low, high = high, low
+        channels.update(range(low, high + 1))
+    return array("i", sorted(channels))
+
+
+def parse_bytype(tokens) -> List[str]:
+    """Parameter types of a bytype reply (e.g. ``["Intensity", "Color"]``)."""
+    text = tokens if isinstance(tokens, str) else " ".join(str(t) for t in tokens)
+    seen: List[str] = []
+    for word in text.split():
+        if word not in seen:
+            seen.append(word)
+    return seen
+
+
+class PaletteIndex:
+    """Channel and bytype indices for all palette types."""
+
+    def __init__(self) -> None:
+        self.channels: Dict[str, Dict[int, array]] = {}
+        self.bytypes: Dict[str, Dict[int, List[str]]] = {}
+        self._by_channel: Dict[str, Dict[int, Set[int]]] = {}
+        self._by_bytype: Dict[str, Dict[str, Set[int]]] = {}
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def set_channels(self, palette_type: str, num: int, channels) -> None:
+        """Replace the channels of palette ``num`` (array, str or tokens)."""
+        if not isinstance(channels, array):
+            channels = parse_channels(channels)
+        per_palette = self.channels.setdefault(palette_type, {})
+        old = per_palette.get(num)
+        if old == channels:
+            return
+        inverted = self._by_channel.setdefault(palette_type, {})
+        if old is not None:
+            for channel in old:
+                _discard(inverted, channel, num)
+        if channels:
+            per_palette[num] = channels
+            for channel in channels:
+                inverted.setdefault(channel, set()).add(num)
+        else:
+            per_palette.pop(num, None)
+
+    def set_bytype(self, palette_type: str, num: int, bytype) -> None:
+        names = parse_bytype(bytype)
+        per_palette = self.bytypes.setdefault(palette_type, {})
+        old = per_palette.get(num)
+        if old == names:
+            return
+        inverted = self._by_bytype.setdefault(palette_type, {})
+        for name in old or ():
+            _discard(inverted, name.lower(), num)
+        if names:
+            per_palette[num] = names
+            for name in names:
+                inverted.setdefault(name.lower(), set()).add(num)
+        else:
+            per_palette.pop(num, None)
+
+    def remove(self, palette_type: str, num: int) -> None:
+        self.set_channels(palette_type, num, array("i"))
+        self.set_bytype(palette_type, num, "")
+
+    def clear(self, palette_type: Optional[str] = None) -> None:
+        types = [palette_type] if palette_type else list(self.channels.keys() | self.bytypes.keys())
+        for key in types:
+            self.channels.pop(key, None)
+            self.bytypes.pop(key, None)
+            self._by_channel.pop(key, None)
+            self._by_bytype.pop(key, None)
+
+    def load_rows(self, palette_type: str, rows: Sequence[Sequence[str]], header: Sequence[str]) -> None:
+        """Rebuild one type from table rows (e.g. restored from the cache)."""
+        self.clear(palette_type)
+        cols = {name: col for col, name in enumerate(header)}
+        num_col, chan_col, type_col = cols["num"], cols["channels"], cols["bytype"]
+        for row in rows:
+            if len(row) <= num_col or not row[num_col].isdigit():
+                continue
+            num = int(row[num_col])
+            if len(row) > chan_col and row[chan_col]:
+                self.set_channels(palette_type, num, row[chan_col])
+            if len(row) > type_col and row[type_col]:
+                self.set_bytype(palette_type, num, row[type_col])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def palettes_for_channel(self, palette_type: str, channel: int) -> Set[int]:
+        """Palette numbers of ``palette_type`` that contain ``channel``."""
+        return set(self._by_channel.get(palette_type, {}).get(channel, ()))
+
+    def palettes_for_channels(self, palette_type: str, channels: Iterable[int], match_all: bool = False) -> Set[int]:
+        """Palettes touching any (or, with ``match_all``, every) of ``channels``."""
+        inverted = self._by_channel.get(palette_type, {})
+        result: Optional[Set[int]] = None
+        for channel in channels:
+            nums = inverted.get(channel, set())
+            if result is None:
+                result = set(nums)
+            elif match_all:
+                result &= nums
+            else:
+                result |= nums
+            if match_all and not result:
+                break
+        return result or set()
+
+    def palettes_for_bytype(self, palette_type: str, name: str) -> Set[int]:
+        return set(self._by_bytype.get(palette_type, {}).get(name.lower(), ()))
+
+    def channels_of(self, palette_type: str, num: int) -> array:
+        return self.channels.get(palette_type, {}).get(num, array("i"))
+
+
+def _discard(inverted: Dict, key, num: int) -> None:
+    nums = inverted.get(key)
+    if nums is not None:
+        nums.discard(num)
+        if not nums:
+            del inverted[key]
+
+
+index = PaletteIndex()
+
+
+def get_index() -> PaletteIndex:
+    return index
+
+
+__all__ = [
+    "PaletteIndex",
+    "get_index",
+    "parse_bytype",
+    "parse_channels",
+]
@@ -1,6 +1,13 @@
-"""Serial palette index pump."""
+"""Palette sync engine: pipelined requests with a sliding window per palette type.
+
+Every palette request goes through here (index fetches after a count,
+number fetches from notifications and subscribe_manager.sync_palettes), so
+in-flight requests are deduplicated, timeouts and retries are shared, and
+``report()`` gives the throughput of the whole sync.
+"""
+import os
 import time
-from typing import Dict
+from typing import Dict, Set
 
 # TouchDesigner-compatible module loading
 def _get_module(name):
@@ -10,12 +17,35 @@ def _get_module(name):
         raise RuntimeError("Project base not found")
     return mod(f'/project1/palette_logic/{name}')
 
+
+# Optional DATs: older project files lack them; the tables are filled anyway
+_optional: Dict[str, object] = {}
+
+
+def _optional_module(name):
+    """palette_logic module ``name``, or None (warned once) if the DAT is missing."""
+    if name not in _optional:
+        try:
+            _optional[name] = _get_module(name)
+        except Exception as exc:
+            _optional[name] = None
+            print(f"[palette] WARN palette_logic/{name} unavailable ({exc}); see PALETTE_SYNC_TEST.md")
+    return _optional[name]
+
+
 state = _get_module('state')
+palette_cache = _get_module('palette_cache')
 ORDER = state.ORDER
 
-INDEX_TIMEOUT = 3.0
-RETRY_LIMIT = 3
-MIN_REQUEST_INTERVAL = 0.05  # 50ms = max 20 requests/second per palette type
+INDEX_TIMEOUT = state.INDEX_TIMEOUT
+RETRY_LIMIT = state.RETRY_LIMIT
+# Upper bound of requests in flight per type; override with
+# op('/project1').store('PALETTE_FETCH_WINDOW', n)
+WINDOW_MAX = state.WINDOW_MAX
+# A count request without reply is not repeated within this time
+COUNT_DEDUP = INDEX_TIMEOUT
+
+_cache = None
 
 
 def attach_base(base) -> None:
@@ -28,111 +58,320 @@ def queue_counts(base, mapping: Dict[str, int]) -> None:
     state.state.last_count_request = now
     print(f"[palette] DEBUG received counts: {mapping}")
     for palette_type, count in mapping.items():
+        state.state.count_pending[palette_type] = None
         _apply_count(palette_type, int(count))
     for palette_type in mapping.keys():
-        _send_next_index(palette_type)
+        _fill_window(palette_type)
+
+
+def _window_max() -> int:
+    base = state.get_base()
+    try:
+        value = int(base.fetch('PALETTE_FETCH_WINDOW', WINDOW_MAX)) if base else WINDOW_MAX
+    except (TypeError, ValueError):
+        value = WINDOW_MAX
+    return max(value, 1)
+
+
+def _cache_path() -> str:
+    """Cache file: project storage PALETTE_CACHE_PATH or <project folder>/cache/."""
+    base = state.get_base()
+    custom = base.fetch('PALETTE_CACHE_PATH', '') if base else ''
+    if custom:
+        return str(custom)
+    try:
+        folder = project.folder
+    except NameError:
+        folder = '.'
+    return os.path.join(folder, 'cache', palette_cache.CACHE_FILE)
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = palette_cache.PaletteCache(_cache_path())
+    return _cache
 
 
 def _apply_count(palette_type: str, count: int) -> None:
     count = max(0, count)
     st = state.state
+    planned = st.planned_counts[palette_type]
+    window = st.windows[palette_type]
+    notified = st.notified[palette_type]
+    st.notified[palette_type] = set()
+    if planned == count and not (window.done and window.failed):
+        # Unchanged count: keep the running fetch / the table as it is.
+        # Edits of existing palettes arrive as /eos/out/notify (queue_numbers).
+        return
+    if planned is None:
+        # First count this session: compare with the on-disk cache
+        known = get_cache().rows(palette_type, st.show_name)
+    else:
+        known = state.read_rows(palette_type)[:planned]
+    if planned is not None and notified:
+        # Inserted/deleted palettes are known: refetch from their index on
+        plan = palette_cache.plan_notified(known, count, notified)
+    else:
+        plan = palette_cache.plan_resync(known, count)
+    if plan.restore and planned is None:
+        state.write_rows(palette_type, known)
+    palette_index = _optional_module('palette_index')
+    if palette_index is not None and plan.restore:
+        palette_index.index.load_rows(palette_type, known[:count], state.TABLE_HEADER)
+    elif palette_index is not None:
+        palette_index.index.clear(palette_type)
     st.counts[palette_type] = count
-    queue = st.queues[palette_type]
-    queue.clear()
+    st.planned_counts[palette_type] = count
+    window.max_size = _window_max()
     # EOS API uses 0-based indices for requests: /eos/get/{type}/index/0, index/1, ...
     # EOS responds with actual palette numbers in the reply address
-    queue.extend(range(count))  # 0, 1, 2, ..., count-1
-    st.active[palette_type] = None
-    st.sent_at[palette_type] = 0.0
-    st.attempts[palette_type] = 0
-    state.ensure_table(palette_type, count)
-    print(f"[palette] DEBUG {palette_type} queue initialized: {count} indices (0-{count-1})")
+    now = time.perf_counter()
+    window.reset(plan.fetch, now)
+    # Known rows are trusted only after their uids were verified
+    st.uid_checks[palette_type] = plan.check
+    state.resize_rows(palette_type, count)
+    _next_probe(palette_type, now)
+    source = "cache" if planned is None else "table"
+    reused = min(len(known), count) if plan.restore else 0
+    verify = ", verifying uids" if plan.check is not None else ""
+    print(f"[palette] {palette_type}: {count} palettes, {reused} from {source}, fetching {len(plan.fetch)}{verify}")
+
+
+def _next_probe(palette_type: str, now: float) -> None:
+    """Queue the next uid probe, or the shifted rows once the check is done."""
+    st = state.state
+    check = st.uid_checks[palette_type]
+    if check is None:
+        return
+    window = st.windows[palette_type]
+    if not check.done:
+        window.extend([check.probe], now)
+        return
+    st.uid_checks[palette_type] = None
+    stale = list(range(check.first_shifted, len(check.uids)))
+    if stale:
+        window.extend(stale, now)
+        print(f"[palette] {palette_type}: uids shifted from index {check.first_shifted}, refetching {len(stale)}")
+
+
+def _check_uid(palette_type: str, index: int, now: float, answered: bool = True) -> None:
+    """Feed the reply (or the given-up request) for ``index`` to the uid check."""
+    check = state.state.uid_checks[palette_type]
+    if check is None or index != check.probe:
+        return
+    row = state.read_index(palette_type, index) if answered else None
+    check.answer(index, row[palette_cache.UID_COLUMN] if row else None)
+    _next_probe(palette_type, now)
+
+
+def queue_numbers(base, palette_type: str, numbers, check_count: bool = True) -> int:
+    """Fetch palettes by number (``/eos/get/{type}/{num}``); returns count queued.
+
+    Numbers already queued or in flight are not requested again, nor are
+    palettes whose row is still queued in the index window. With
+    ``check_count`` (EOS notify: palettes may have been added or deleted)
+    the count is requested as well; ``_apply_count`` only acts if it changed.
+    """
+    state.attach_base(base)
+    numbers = list(numbers)
+    if check_count:
+        # An insert/delete shifts the indices from these numbers on (_apply_count)
+        state.state.notified[palette_type].update(numbers)
+    window = state.state.number_windows[palette_type]
+    window.max_size = _window_max()
+    queued = _queued_numbers(palette_type)
+    added = window.extend([n for n in numbers if n not in queued], time.perf_counter())
+    state.state.stats.deduped += len(numbers) - added
+    if added:
+        print(f"[palette] {palette_type}: fetching {added} palettes by number")
+    if check_count:
+        request_count(palette_type)
+    _fill_window(palette_type, window)
+    return added
+
+
+def _queued_numbers(palette_type: str) -> Set[int]:
+    """Palette numbers of the rows still queued in the index window.
+
+    Their index reply carries the number and acks the number window too
+    (on_list_ack). Requests already in flight may predate the change that
+    was notified, so only unsent ones count.
+    """
+    queue = state.state.windows[palette_type].queue
+    if not queue:
+        return set()
+    column = palette_cache.NUM_COLUMN
+    numbers = set()
+    for index in queue:
+        row = state.read_index(palette_type, index)
+        if row and row[column].isdigit():
+            numbers.add(int(row[column]))
+    return numbers
+
+
+def request_count(palette_type: str, force: bool = False) -> bool:
+    """Send ``/eos/get/{type}/count`` unless one is already outstanding."""
+    st = state.state
+    now = time.perf_counter()
+    pending = st.count_pending[palette_type]
+    if not force and pending is not None and now - pending < COUNT_DEDUP:
+        st.stats.counts_deduped += 1
+        return False
+    osc = state.get_osc_out()
+    if not osc:
+        print(f"[palette] WARN osc_out DAT missing; cannot request {palette_type} count")
+        return False
+    # EOS API: /eos/get/{type}/count
+    osc.sendOSC(f"/eos/get/{palette_type}/count", [])
+    st.count_pending[palette_type] = now
+    st.last_count_request = now
+    st.stats.count_requests += 1
+    return True
 
 
-def on_list_ack(base, palette_type: str, index: int) -> None:
+def request_all_counts(base, force: bool = False) -> int:
+    state.attach_base(base)
+    return sum(request_count(palette_type, force) for palette_type in ORDER)
+
+
+def _store_cache(palette_type: str) -> None:
+    """Write the finished table of ``palette_type`` to the on-disk cache."""
+    st = state.state
+    rows = state.read_rows(palette_type)[:st.counts[palette_type]]
+    cache = get_cache()
+    if cache.update(palette_type, rows, st.show_name):
+        cache.save()
+
+
+def on_list_ack(base, palette_type: str, index: int, number=None) -> None:
     """Acknowledge receipt of palette data for given index.
 
+    Replies may arrive in any order; they are matched by index against the
+    requests in flight (and by palette number against notify fetches).
+
     Args:
         index: The 0-based index that was requested (NOT the palette number)
+        number: Palette number from the reply address, if known
     """
     state.attach_base(base)
     st = state.state
-    active = st.active[palette_type]
-    if active != index:
-        print(f"[palette] DEBUG {palette_type} ACK mismatch: expected index {active}, got {index}")
-        return
-    queue = st.queues[palette_type]
-    remaining = len(queue)
-    if queue and queue[0] == index:
-        queue.popleft()
-    elif index in queue:
-        queue.remove(index)
-    st.active[palette_type] = None
-    st.sent_at[palette_type] = 0.0
-    st.attempts[palette_type] = 0
-    print(f"[palette] DEBUG {palette_type} index {index} ACK (queue: {remaining-1} remaining)")
-    _send_next_index(palette_type)
+    now = time.perf_counter()
+    matched = False
+    for window, key in ((st.windows[palette_type], index), (st.number_windows[palette_type], number)):
+        if key is None or not window.ack(key, now):
+            continue  # duplicate (list + bytype reply) or not requested
+        matched = True
+        if window is st.windows[palette_type]:
+            _check_uid(palette_type, index, now)
+        _fill_window(palette_type, window)
+        if window.done:
+            _report_done(palette_type, window)
+    if matched:
+        st.stats.replies += 1
+    else:
+        st.stats.unrequested += 1
+
+
+def _request_address(palette_type: str, window, key) -> str:
+    if window is state.state.number_windows[palette_type]:
+        return f"/eos/get/{palette_type}/{key}"
+    # Correct EOS OSC API: /eos/get/{type}/index/{index}
+    return f"/eos/get/{palette_type}/index/{key}"
 
 
 def tick(base) -> None:
     state.attach_base(base)
     st = state.state
     now = time.perf_counter()
+    for palette_type in sorted(st.cache_due):
+        # One tick after the last ack: its channels/bytype replies are in too
+        st.cache_due.discard(palette_type)
+        if st.windows[palette_type].done:
+            _store_cache(palette_type)
     for palette_type in ORDER:
-        active = st.active[palette_type]
-        if active is None:
-            if st.queues[palette_type]:
-                _send_next_index(palette_type)
-            continue
-        if now - st.sent_at[palette_type] <= INDEX_TIMEOUT:
-            continue
+        for window in (st.windows[palette_type], st.number_windows[palette_type]):
+            if window.in_flight:
+                _expire(palette_type, window, now)
+            if window.queue:
+                _fill_window(palette_type, window)
+
+
+def _expire(palette_type: str, window, now: float) -> None:
+    resend, given_up = window.expire(now)
+    for key in given_up:
+        print(f"[palette] WARN giving up on {_request_address(palette_type, window, key)}")
+        if window is state.state.windows[palette_type]:
+            _check_uid(palette_type, key, now, answered=False)
+    if resend:
         osc = state.get_osc_out()
-        if not osc:
-            continue
-        if st.attempts[palette_type] >= RETRY_LIMIT:
-            queue = st.queues[palette_type]
-            if queue and queue[0] == active:
-                queue.popleft()
-            st.active[palette_type] = None
-            st.attempts[palette_type] = 0
-            print(f"[palette] WARN giving up on {palette_type} index {active}")
-            _send_next_index(palette_type)
-        else:
-            # Correct EOS OSC API: /eos/get/{type}/index/{index}
-            osc.sendOSC(f"/eos/get/{palette_type}/index/{active}", [])
-            st.sent_at[palette_type] = now
-            st.attempts[palette_type] += 1
+        if osc:
+            for key in resend:
+                osc.sendOSC(_request_address(palette_type, window, key), [])
+            state.state.stats.resends += len(resend)
             print(
-                f"[palette] resend {palette_type} index {active} attempt {st.attempts[palette_type]}"
+                f"[palette] resend {palette_type} {resend} "
+                f"(window {window.window}, timeout {window.timeout:.2f}s)"
             )
+    if given_up and window.done:
+        _report_done(palette_type, window)
 
 
-def _send_next_index(palette_type: str) -> None:
-    st = state.state
-    if st.active[palette_type] is not None:
-        return
-    queue = st.queues[palette_type]
-    if not queue:
+def _fill_window(palette_type: str, window=None) -> None:
+    """Request queued indices until the window is full (default: index window)."""
+    if window is None:
+        window = state.state.windows[palette_type]
+    if not window.queue or len(window.in_flight) >= window.window:
         return
-
-    # Rate limiting: enforce minimum interval between requests
-    now = time.perf_counter()
-    time_since_last = now - st.sent_at[palette_type]
-    if time_since_last < MIN_REQUEST_INTERVAL:
-        # Uncomment for verbose rate limiting debug:
-        # print(f"[palette] DEBUG {palette_type} rate limited (wait {MIN_REQUEST_INTERVAL - time_since_last:.3f}s)")
-        return  # Too soon, wait for next tick
-
     osc = state.get_osc_out()
     if not osc:
         print(f"[palette] ERROR {palette_type} OSC Out not found!")
         return
-    index = queue[0]
-    # Correct EOS OSC API: /eos/get/{type}/index/{index}
     # EOS will respond with /eos/out/get/{type}/{palette_num}/list/... containing actual palette data
-    print(f"[palette] DEBUG {palette_type} sending OSC: /eos/get/{palette_type}/index/{index}")
-    osc.sendOSC(f"/eos/get/{palette_type}/index/{index}", [])
-    st.active[palette_type] = index
-    st.sent_at[palette_type] = now
-    st.attempts[palette_type] = 1
-    print(f"[palette] send {palette_type} index {index}")
+    keys = window.take(time.perf_counter())
+    for key in keys:
+        osc.sendOSC(_request_address(palette_type, window, key), [])
+    state.state.stats.requests += len(keys)
+
+
+def _report_done(palette_type: str, window) -> None:
+    elapsed = time.perf_counter() - window.started_at
+    rtt = f"{window.srtt * 1000.0:.0f}ms" if window.srtt is not None else "n/a"
+    print(
+        f"[palette] {palette_type} synced: {window.completed} palettes in {elapsed:.2f}s "
+        f"({window.failed} failed, window {window.window}, rtt {rtt})"
+    )
+    state.state.cache_due.add(palette_type)
+
+
+def report(now=None) -> dict:
+    """Engine counters, throughput and per-type window state."""
+    st = state.state
+    now = time.perf_counter() if now is None else now
+    stats = st.stats
+    types = {}
+    for palette_type in ORDER:
+        window = st.windows[palette_type]
+        numbers = st.number_windows[palette_type]
+        types[palette_type] = {
+            "count": st.counts[palette_type],
+            "queued": len(window.queue) + len(numbers.queue),
+            "in_flight": len(window.in_flight) + len(numbers.in_flight),
+            "window": window.window,
+            "timeout": round(window.timeout, 3),
+        }
+    return {
+        "requests": stats.requests,
+        "resends": stats.resends,
+        "replies": stats.replies,
+        "unrequested": stats.unrequested,
+        "deduped": stats.deduped,
+        "count_requests": stats.count_requests,
+        "counts_deduped": stats.counts_deduped,
+        "replies_per_s": round(stats.throughput(now), 1),
+        "types": types,
+    }
+
+
+def reset_stats() -> None:
+    state.state.stats.reset()
@@ -1,10 +1,10 @@
-def _update():
-    mod('/project1/palette_logic/update_slot_state').update_slot_state()
+def _update(dat=None):
+    mod('/project1/palette_logic/update_slot_state').update_slot_state(changed=dat)
 
 def onStart():
     _update()
     return
 
 def onTableChange(dat):
-    _update()
+    _update(dat)
     return
@@ -1,10 +1,194 @@
 """Palette state management for EOS palette synchronisation."""
 import time
 from collections import deque
-from typing import Deque, Dict, Optional
+from typing import Deque, Dict, List, Optional, Set, Tuple
 
 ORDER = ["ip", "fp", "cp", "bp"]
 TABLE_HEADER = ["index", "num", "uid", "label", "channels", "bytype"]
+COLUMNS = {name: col for col, name in enumerate(TABLE_HEADER)}
+
+# Sliding-window fetch of /eos/get/{type}/index/{n} (see pump.py)
+WINDOW_START = 4          # requests in flight per type at sync start
+WINDOW_MIN = 1
+WINDOW_MAX = 32
+INDEX_TIMEOUT = 3.0       # upper bound; the adaptive timeout is usually far lower
+MIN_INDEX_TIMEOUT = 0.25
+RETRY_LIMIT = 3
+# Shrink the window when replies queue up at the console (RTT above this x the best RTT)
+RTT_QUEUE_FACTOR = 2.0
+RTT_ALPHA = 0.125         # smoothing of RTT mean / deviation (as TCP)
+RTT_BETA = 0.25
+
+
+def row_for_index(index: int) -> int:
+    """pal_* table row of request index ``index`` (0-based; row 0 is the header).
+
+    The same mapping as the row store (``read_rows()[index]``) and the on-disk
+    cache (cached row ``index``).
+    """
+    return index + 1
+
+
+class FetchWindow:
+    """Index requests of one palette type with up to ``size`` replies outstanding.
+
+    Replies are matched by index, so they may arrive in any order. Each
+    in-flight index has its own send time and attempt count. The window
+    doubles per round trip at first (slow start), then grows by one per
+    window of replies; it shrinks when a request times out or when the reply
+    latency rises well above the best observed one (the console is
+    queueing). The timeout follows the smoothed RTT.
+    """
+
+    def __init__(
+        self,
+        size: float = WINDOW_START,
+        min_size: int = WINDOW_MIN,
+        max_size: int = WINDOW_MAX,
+        timeout: float = INDEX_TIMEOUT,
+        retry_limit: int = RETRY_LIMIT,
+    ) -> None:
+        self.size = float(size)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_timeout = timeout
+        self.retry_limit = retry_limit
+        self.queue: Deque[int] = deque()
+        self.in_flight: Dict[int, float] = {}
+        self.attempts: Dict[int, int] = {}
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+        self.min_rtt: Optional[float] = None
+        self.slow_start = True
+        self.started_at = 0.0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def window(self) -> int:
+        return max(self.min_size, min(int(self.size), self.max_size))
+
+    @property
+    def timeout(self) -> float:
+        if self.srtt is None:
+            return self.max_timeout
+        return min(max(self.srtt + 4.0 * self.rttvar, MIN_INDEX_TIMEOUT), self.max_timeout)
+
+    @property
+    def done(self) -> bool:
+        return not self.queue and not self.in_flight
+
+    def reset(self, indices, now: float = 0.0) -> None:
+        """Start a new fetch of ``indices``; RTT estimates are kept."""
+        self.queue.clear()
+        self.queue.extend(indices)
+        self.in_flight.clear()
+        self.attempts.clear()
+        self.started_at = now
+        self.completed = 0
+        self.failed = 0
+
+    def extend(self, indices, now: float = 0.0) -> int:
+        """Queue more indices (skipping queued / in-flight ones); returns count added."""
+        if self.done:
+            self.started_at = now
+            self.completed = 0
+            self.failed = 0
+        added = 0
+        for index in indices:
+            if index in self.in_flight or index in self.queue:
+                continue
+            self.queue.append(index)
+            added += 1
+        return added
+
+    def take(self, now: float) -> List[int]:
+        """Indices to request now (fills the window from the queue)."""
+        out = []
+        while self.queue and len(self.in_flight) < self.window:
+            index = self.queue.popleft()
+            self.in_flight[index] = now
+            self.attempts[index] = 1
+            out.append(index)
+        return out
+
+    def ack(self, index: int, now: float) -> bool:
+        """Reply for ``index`` arrived; False if it was not outstanding."""
+        sent_at = self.in_flight.pop(index, None)
+        if sent_at is None:
+            if index in self.queue:  # answered before we asked (e.g. notify)
+                self.queue.remove(index)
+                self.completed += 1
+                return True
+            return False
+        # Karn: only unambiguous replies (first attempt) give an RTT sample
+        if self.attempts.pop(index, 1) == 1:
+            self._sample_rtt(now - sent_at)
+        self.completed += 1
+        return True
+
+    def expire(self, now: float) -> Tuple[List[int], List[int]]:
+        """Return (indices to resend, indices given up) for timed-out requests."""
+        timeout = self.timeout
+        resend: List[int] = []
+        given_up: List[int] = []
+        for index, sent_at in list(self.in_flight.items()):
+            if now - sent_at <= timeout:
+                continue
+            if self.attempts[index] >= self.retry_limit:
+                del self.in_flight[index]
+                del self.attempts[index]
+                self.failed += 1
+                given_up.append(index)
+            else:
+                self.in_flight[index] = now
+                self.attempts[index] += 1
+                resend.append(index)
+        if resend or given_up:
+            # loss or overload: halve the window (once per expiry pass)
+            self.size = max(float(self.min_size), self.size / 2.0)
+            self.slow_start = False
+        return resend, given_up
+
+    def _sample_rtt(self, rtt: float) -> None:
+        if rtt < 0.0:
+            return
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2.0
+        else:
+            self.rttvar += RTT_BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += RTT_ALPHA * (rtt - self.srtt)
+        self.min_rtt = rtt if self.min_rtt is None else min(self.min_rtt, rtt)
+        if self.srtt > RTT_QUEUE_FACTOR * self.min_rtt:
+            self.slow_start = False
+            self.size = max(float(self.min_size), self.size - 1.0 / max(self.size, 1.0))
+        else:
+            step = 1.0 if self.slow_start else 1.0 / max(self.size, 1.0)
+            self.size = min(float(self.max_size), self.size + step)
+
+
+class SyncStats:
+    """Request counters of the palette sync engine (see pump.report())."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self, now: Optional[float] = None) -> None:
+        self.since = time.perf_counter() if now is None else now
+        self.requests = 0          # palette requests sent (first attempts)
+        self.resends = 0
+        self.replies = 0           # replies matched to a request
+        self.unrequested = 0       # duplicate / late / foreign replies
+        self.deduped = 0           # requests skipped: already queued or in flight
+        self.count_requests = 0
+        self.counts_deduped = 0
+
+    def throughput(self, now: Optional[float] = None) -> float:
+        """Matched replies per second since the last reset."""
+        now = time.perf_counter() if now is None else now
+        elapsed = now - self.since
+        return self.replies / elapsed if elapsed > 0 else 0.0
 
 
 class PaletteState:
@@ -16,13 +200,34 @@ class PaletteState:
         self.last_count_request = 0.0
         self.subscribed = False
         self.counts: Dict[str, int] = {t: 0 for t in ORDER}
-        self.queues: Dict[str, Deque[int]] = {t: deque() for t in ORDER}
-        self.active: Dict[str, Optional[int]] = {t: None for t in ORDER}
-        self.sent_at: Dict[str, float] = {t: 0.0 for t in ORDER}
-        self.attempts: Dict[str, int] = {t: 0 for t in ORDER}
+        # Count the table was last planned for (None = not yet this session)
+        self.planned_counts: Dict[str, Optional[int]] = {t: None for t in ORDER}
+        self.show_name = ""
+        self.windows: Dict[str, FetchWindow] = {t: FetchWindow() for t in ORDER}
+        # Palette numbers named by /eos/out/notify (fetched with /eos/get/{type}/{num})
+        self.number_windows: Dict[str, FetchWindow] = {t: FetchWindow() for t in ORDER}
+        # Pending (not yet requested) indices per type
+        self.queues: Dict[str, Deque[int]] = {t: self.windows[t].queue for t in ORDER}
+        # Row store: pal_{type} data rows (table row r = rows[r - 1]), loaded from
+        # the DAT on first use and written back once per frame (flush_tables)
+        self.rows: Dict[str, Optional[List[List[str]]]] = {t: None for t in ORDER}
+        self.dirty_rows: Dict[str, Set[int]] = {t: set() for t in ORDER}
+        self.resized: Set[str] = set()
+        # Single engine for every palette request (pump): outstanding count
+        # requests per type (send time) and shared counters
+        self.count_pending: Dict[str, Optional[float]] = {t: None for t in ORDER}
+        # Running uid verification of restored rows (palette_cache.UidCheck)
+        self.uid_checks: Dict[str, Optional[object]] = {t: None for t in ORDER}
+        # Palette numbers named by notifications since the last count reply
+        self.notified: Dict[str, Set[int]] = {t: set() for t in ORDER}
+        # Finished types whose table goes to the on-disk cache on the next tick
+        self.cache_due: Set[str] = set()
+        self.stats = SyncStats()
 
     def attach_base(self, base) -> None:
         if base and base != self.base:
+            if self.base is not None:
+                self.reset_rows()  # other project: rows belong to other DATs
             self.base = base
 
     def get_table(self, palette_type: str):
@@ -30,34 +235,124 @@ class PaletteState:
             return None
         return self.base.op(f"palette_logic/pal_{palette_type}")
 
-    def ensure_table(self, palette_type: str, rows: int):
+    def _rows(self, palette_type: str) -> List[List[str]]:
+        rows = self.rows[palette_type]
+        if rows is None:
+            rows = self.rows[palette_type] = self._load_rows(palette_type)
+        return rows
+
+    def _load_rows(self, palette_type: str) -> List[List[str]]:
         table = self.get_table(palette_type)
         if not table:
-            return None
-        if table.numRows == 0:
-            table.appendRow(TABLE_HEADER)
+            return []
+        width = min(table.numCols, len(TABLE_HEADER))
+        pad = [""] * (len(TABLE_HEADER) - width)
+        return [
+            [table[row, col].val for col in range(width)] + pad
+            for row in range(1, table.numRows)
+        ]
+
+    def resize_rows(self, palette_type: str, rows: int) -> None:
+        """Set the number of data rows (the DAT follows on the next flush)."""
+        data = self._rows(palette_type)
+        rows = max(rows, 0)
+        if len(data) == rows:
+            return
+        if len(data) > rows:
+            del data[rows:]
+            self.dirty_rows[palette_type] = {r for r in self.dirty_rows[palette_type] if r <= rows}
         else:
-            while table.numCols < len(TABLE_HEADER):
-                table.appendCol("")
-            for col, name in enumerate(TABLE_HEADER):
-                table[0, col] = name
-        desired = max(rows, 0) + 1
-        while table.numRows > desired:
-            table.deleteRow(table.numRows - 1)
-        while table.numRows < desired:
-            table.appendRow([""] * table.numCols)
-        return table
+            data.extend([""] * len(TABLE_HEADER) for _ in range(rows - len(data)))
+        self.resized.add(palette_type)
+
+    def stage_row(self, palette_type: str, row: int, **fields) -> None:
+        """Update cells of table row ``row`` (1-based, row 0 is the header)."""
+        if row < 1:
+            return
+        data = self._rows(palette_type)
+        if row > len(data):
+            self.resize_rows(palette_type, row)
+        values = data[row - 1]
+        for key, value in fields.items():
+            col = COLUMNS.get(key)
+            if col is None or value is None:
+                continue
+            values[col] = str(value)
+        self.dirty_rows[palette_type].add(row)
+
+    def stage_index(self, palette_type: str, request_index: int, **fields) -> None:
+        """Update cells of the row of ``request_index`` (0-based)."""
+        if request_index < 0:
+            return
+        self.stage_row(palette_type, row_for_index(request_index), **fields)
+
+    def read_index(self, palette_type: str, index: int) -> Optional[List[str]]:
+        """Cells of the row of request index ``index`` (None if out of range)."""
+        data = self._rows(palette_type)
+        return list(data[index]) if 0 <= index < len(data) else None
+
+    def read_rows(self, palette_type: str) -> List[List[str]]:
+        """Data rows of pal_{type} (without header) as lists of strings."""
+        return [list(values) for values in self._rows(palette_type)]
+
+    def write_rows(self, palette_type: str, rows) -> None:
+        data = self._rows(palette_type)
+        if len(rows) > len(data):
+            self.resize_rows(palette_type, len(rows))
+        dirty = self.dirty_rows[palette_type]
+        for r, values in enumerate(rows, start=1):
+            values = [str(v) for v in values[:len(TABLE_HEADER)]]
+            data[r - 1] = values + [""] * (len(TABLE_HEADER) - len(values))
+            dirty.add(r)
+
+    def flush_tables(self) -> int:
+        """Write staged rows to the pal_* DATs; returns the number of rows written."""
+        written = 0
+        for palette_type in ORDER:
+            dirty = self.dirty_rows[palette_type]
+            if not dirty and palette_type not in self.resized:
+                continue
+            table = self.get_table(palette_type)
+            if not table:
+                continue
+            data = self._rows(palette_type)
+            if (palette_type in self.resized or table.numRows != len(data) + 1
+                    or table.numCols != len(TABLE_HEADER)):
+                table.setSize(len(data) + 1, len(TABLE_HEADER))
+                table.replaceRow(0, TABLE_HEADER)
+                self.resized.discard(palette_type)
+            for row in sorted(dirty):
+                table.replaceRow(row, data[row - 1])
+            written += len(dirty)
+            dirty.clear()
+        return written
+
+    def reset_rows(self) -> None:
+        """Forget the row store (next access reloads from the DATs)."""
+        for palette_type in ORDER:
+            self.rows[palette_type] = None
+            self.dirty_rows[palette_type].clear()
+        self.resized.clear()
 
 
 state = PaletteState()
 __all__ = [
     "ORDER",
     "TABLE_HEADER",
+    "FetchWindow",
+    "SyncStats",
+    "row_for_index",
     "state",
     "attach_base",
     "get_base",
     "get_table",
-    "ensure_table",
+    "resize_rows",
+    "stage_row",
+    "stage_index",
+    "read_index",
+    "read_rows",
+    "write_rows",
+    "flush_tables",
     "get_osc_out",
     "mark_activity",
     "note_subscribe",
@@ -77,8 +372,32 @@ def get_table(palette_type: str):
     return state.get_table(palette_type)
 
 
-def ensure_table(palette_type: str, rows: int):
-    return state.ensure_table(palette_type, rows)
+def resize_rows(palette_type: str, rows: int) -> None:
+    state.resize_rows(palette_type, rows)
+
+
+def stage_row(palette_type: str, row: int, **fields) -> None:
+    state.stage_row(palette_type, row, **fields)
+
+
+def stage_index(palette_type: str, request_index: int, **fields) -> None:
+    state.stage_index(palette_type, request_index, **fields)
+
+
+def read_index(palette_type: str, index: int):
+    return state.read_index(palette_type, index)
+
+
+def read_rows(palette_type: str):
+    return state.read_rows(palette_type)
+
+
+def write_rows(palette_type: str, rows) -> None:
+    state.write_rows(palette_type, rows)
+
+
+def flush_tables() -> int:
+    return state.flush_tables()
 
 
 def get_osc_out():
@@ -5,93 +5,104 @@ Copy this into a Text DAT in TouchDesigner (e.g. `subscribe_manager`) and import
 the module via `mod('/project1/palette_logic/subscribe_manager')`.
 """
 
-import time
-from collections import deque
-from typing import Deque, Dict, Iterable, Optional, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence
 
 
 OSC_OUT_PATH = "/project1/io/oscout1"
 STATUS_DAT = "eos_status"
 PAL_TYPES: Sequence[str] = ("ip", "fp", "cp", "bp")
-_MAX_INDEX_REQUESTS = 512  # safety guard against runaway loops
-_LAST_COUNTS: Dict[str, int] = {}
-_INDEX_QUEUES: Dict[str, Deque[int]] = {pal: deque() for pal in PAL_TYPES}
-_ACTIVE_INDEX: Dict[str, Optional[int]] = {pal: None for pal in PAL_TYPES}
 _SUBSCRIBE_BACKOFF = 5.0
 _COUNT_BACKOFF = 2.0
-_LAST_COUNT_REQUEST = 0.0
+_SYNC_TASKS: Dict[str, object] = {}  # running sync_task.SyncTask per palette type
 
 
-def _ensure_header(table):
-    if table.numRows == 0:
-        table.appendRow(["num", "uid", "label"])
+def _pump():
+    """The palette sync engine; every palette request goes through it."""
+    return mod('/project1/palette_logic/pump')
 
 
-def _trim_table(pal_type: str, count: int):
-    table = op(f"pal_{pal_type}")
-    if not table:
-        return
-    _ensure_header(table)
-    desired = max(0, count) + 1
-    while table.numRows > desired:
-        table.deleteRow(table.numRows - 1)
-    while table.numRows < desired:
-        table.appendRow(["", "", ""])
+def _base():
+    return op('/project1')
 
 
-def _extend_table(pal_type: str, count: int):
-    _trim_table(pal_type, count)
+class EosStatus:
+    """Connection state held in memory; ``eos_status`` is only a display mirror."""
 
+    FIELDS = ("last_seen", "is_subscribed", "last_subscribe")
 
-def _get_status_table():
-    table = op(STATUS_DAT)
-    if table is None:
-        raise RuntimeError(f"Missing DAT '{STATUS_DAT}' for EOS status tracking.")
-    return table
+    def __init__(self) -> None:
+        self.last_seen = 0.0
+        self.is_subscribed = False
+        self.last_subscribe = 0.0
+        self.loaded = False
+        self.mirrored_at = float("-inf")
+        self._mirrored: Dict[str, str] = {}
 
+    def rows(self) -> Dict[str, str]:
+        return {
+            "last_seen": str(self.last_seen),
+            "is_subscribed": "1" if self.is_subscribed else "0",
+            "last_subscribe": str(self.last_subscribe),
+        }
 
-def _row_index(table, key: str) -> int:
-    """Return DAT row index for the given key or -1 if missing."""
-    for idx, row in enumerate(table.rows()):
-        if len(row) and row[0].val == key:
-            return idx
-    return -1
+    def load(self, table) -> None:
+        """Take over the values of the DAT once (e.g. after a module reload).
 
+        Timestamps only move forward: a value already set in memory (e.g. by
+        ``mark_activity`` before the first load) is newer than the DAT's.
+        """
+        self.loaded = True
+        if table is None:
+            return
+        for key in self.FIELDS:
+            row = table.row(key)
+            if row is None or len(row) < 2:
+                continue
+            value = row[1].val
+            self._mirrored[key] = value
+            if key == "is_subscribed":
+                self.is_subscribed = self.is_subscribed or value == "1"
+                continue
+            try:
+                setattr(self, key, max(getattr(self, key), float(value)))
+            except ValueError:
+                pass
 
-def _set_status(key: str, value: str):
-    table = _get_status_table()
-    idx = _row_index(table, key)
-    if idx < 0:
-        table.appendRow([key, value])
-    else:
-        table[idx, 1] = value
+
+STATUS = EosStatus()
+STATUS_MIRROR_INTERVAL = 1.0  # seconds between eos_status DAT updates
 
 
-def _get_status(key: str, default: str = "0") -> str:
+def _get_status_table():
+    return op(STATUS_DAT)
+
+
+def get_status() -> EosStatus:
+    if not STATUS.loaded:
+        STATUS.load(_get_status_table())
+    return STATUS
+
+
+def mirror_status(force: bool = False) -> None:
+    """Write changed status values to the eos_status DAT (rate limited)."""
+    status = get_status()
+    now = absTime.seconds
+    if not force and now - status.mirrored_at < STATUS_MIRROR_INTERVAL:
+        return
+    status.mirrored_at = now
     table = _get_status_table()
-    idx = _row_index(table, key)
-    if idx < 0:
-        return default
-    return table[idx, 1].val
-
-
-def _wait_for_message(match, timeout=5.0):
-    osc_in = op("/project1/io/oscin1_from_eos")
-    if osc_in is None:
-        raise RuntimeError("OSC In DAT '/project1/io/oscin1_from_eos' not found")
-    last = int(osc_in.numRows)
-    deadline = time.perf_counter() + timeout
-    while time.perf_counter() < deadline:
-        current = int(osc_in.numRows)
-        if current > last:
-            rows = [osc_in.row(i) for i in range(last, current)]
-            last = current
-            for row in rows:
-                result = match(row)
-                if result is not None:
-                    return result
-        time.sleep(0.05)
-    raise RuntimeError("Timeout waiting for OSC response")
+    if table is None:
+        return
+    for key, value in status.rows().items():
+        if status._mirrored.get(key) == value:
+            continue
+        row = table.row(key)
+        if row is None:
+            table.appendRow([key, value])
+        else:
+            row[1].val = value
+        status._mirrored[key] = value
+
 
 def _send_osc(path: str, args: Iterable):
     osc_out = op(OSC_OUT_PATH)
@@ -102,7 +113,7 @@ def _send_osc(path: str, args: Iterable):
 
 def mark_activity():
     """Update the timestamp when we receive any OSC from EOS."""
-    _set_status("last_seen", str(absTime.seconds))
+    get_status().last_seen = absTime.seconds
 
 
 def ensure_subscribed(force: bool = False, send_get: bool = True):
@@ -113,18 +124,19 @@ def ensure_subscribed(force: bool = False, send_get: bool = True):
         force: if True, always send the subscribe command.
         send_get: if True, request /get/<type>/index after subscribing.
     """
-    subscribed = _get_status("is_subscribed") == "1"
+    status = get_status()
+    subscribed = status.is_subscribed
     now = absTime.seconds
-    last_seen = float(_get_status("last_seen", "0"))
-    last_subscribe = float(_get_status("last_subscribe", "0"))
+    last_seen = status.last_seen
+    last_subscribe = status.last_subscribe
 
     should_subscribe = force or not subscribed or (now - last_seen > _SUBSCRIBE_BACKOFF and now - last_subscribe > _SUBSCRIBE_BACKOFF)
 
     if should_subscribe:
         if now - last_subscribe >= 0.5 or force:
             _send_osc("/eos/subscribe", [1])
-            _set_status("is_subscribed", "1")
-            _set_status("last_subscribe", str(now))
+            status.is_subscribed = True
+            status.last_subscribe = now
             if send_get:
                 request_all_counts()
     elif send_get and now - last_seen > _COUNT_BACKOFF:
@@ -133,146 +145,97 @@ def ensure_subscribed(force: bool = False, send_get: bool = True):
 
 def request_all_counts():
     """Request palette counts for every type so we can enumerate indices."""
-    osc_in = op("/project1/io/oscin1_from_eos")
-    if osc_in:
-        osc_in.store("last_row", osc_in.numRows)
-    global _LAST_COUNT_REQUEST
-    _LAST_COUNT_REQUEST = absTime.seconds
-    for pal_type in PAL_TYPES:
-        request_palette_count(pal_type)
+    _pump().request_all_counts(_base())
 
 
 def request_palette_count(pal_type: str):
     """Ask EOS how many palettes of a given type exist."""
-    _send_osc(f"/eos/get/{pal_type}/count", [])
+    _pump().request_count(pal_type)
 
 
 def request_indices_for_count(pal_type: str, count: int):
-    """Synchronise a palette type with EOS by requesting each index once."""
-    count = max(0, min(int(count), _MAX_INDEX_REQUESTS))
-    prev = _LAST_COUNTS.get(pal_type, 0)
-    queue = _INDEX_QUEUES[pal_type]
-    active = _ACTIVE_INDEX[pal_type]
-
-    if count <= 0:
-        queue.clear()
-        _ACTIVE_INDEX[pal_type] = None
-        _LAST_COUNTS[pal_type] = 0
-        _trim_table(pal_type, 0)
-        return
-
-    restart = count < prev or prev == 0
-
-    if restart:
-        queue.clear()
-        _ACTIVE_INDEX[pal_type] = None
-        _trim_table(pal_type, count)
-        # EOS uses 1-based palette numbers (1, 2, 3, ..., count)
-        queue.extend(range(1, count + 1))
-        _LAST_COUNTS[pal_type] = count
-        print(f"[palette] restart queue {pal_type}: count={count}")
-        _send_next_index(pal_type)
-        return
-
-    if count > prev:
-        # Add new palette numbers (1-based)
-        new_indices = list(range(prev + 1, count + 1))
-        queue.extend(new_indices)
-        _extend_table(pal_type, count)
-        _LAST_COUNTS[pal_type] = count
-        print(f"[palette] extend queue {pal_type}: add {new_indices}")
-        if active is None:
-            _send_next_index(pal_type)
-        return
+    """Synchronise a palette type with EOS for a known count (pump plans the fetch)."""
+    _pump().queue_counts(_base(), {pal_type: int(count)})
 
-    # count unchanged; kick queue if idle
-    _LAST_COUNTS[pal_type] = count
-    if active is None and queue:
-        _send_next_index(pal_type)
 
+def notify_index_processed(pal_type: str, index: int):
+    """Reply for palette number ``index`` arrived (normally acked by eos_notify_handler)."""
+    _pump().on_list_ack(_base(), pal_type, None, index)
 
-def _send_next_index(pal_type: str):
-    queue = _INDEX_QUEUES[pal_type]
-    if _ACTIVE_INDEX[pal_type] is not None:
-        return
-    if not queue:
-        return
-    palette_num = queue.popleft()
-    _ACTIVE_INDEX[pal_type] = palette_num
-    # Use correct EOS OSC API: /eos/get/{type}/{num}/list/{index}/{count}
-    _send_osc(f"/eos/get/{pal_type}/{palette_num}/list/0/1", [])
-    print(f"[palette] send {pal_type} palette #{palette_num}")
 
+class _PumpEngine:
+    """SyncTask engine: requests go through the pump (dedup, window, retries)."""
 
-def notify_index_processed(pal_type: str, index: int):
-    active = _ACTIVE_INDEX.get(pal_type)
-    if active == index:
-        _ACTIVE_INDEX[pal_type] = None
-    queue = _INDEX_QUEUES.get(pal_type)
-    if queue is None:
-        return
-    if queue:
-        _send_next_index(pal_type)
+    def request_count(self, pal_type: str):
+        return _pump().request_count(pal_type)
 
+    def request_palettes(self, pal_type: str, numbers: List[int]):
+        return _pump().queue_numbers(_base(), pal_type, numbers, check_count=False)
 
 
 def sync_palettes(pal_type: str = 'ip', timeout: float = 5.0):
-    """Fetch all palette entries for the given type in a blocking manner."""
+    """Start a non-blocking sync of one palette type; returns the running SyncTask.
+
+    Replies are matched as they arrive (listener on eos_notify_handler); the
+    task is stepped once per frame by ``tick_sync`` (watchdog_exec) for
+    timeouts. ``sync_status()`` shows progress and ETA.
+    """
     handler = mod('/project1/palette_logic/eos_notify_handler')
     osc_out = op(OSC_OUT_PATH)
     if not handler or not osc_out:
         raise RuntimeError('OSC modules not initialised')
-
-    def _count_match(row):
-        parsed = handler._parse_count_row(row)
-        if parsed and parsed['type'] == pal_type:
-            return parsed['count']
-        return None
-
-    def _index_match(expected_index):
-        def _inner(row):
-            parsed = handler._parse_palette_row(row)
-            if parsed and parsed['type'] == pal_type and parsed['index'] == expected_index:
-                return parsed
-            return None
-        return _inner
-
-    osc_in = op('/project1/io/oscin1_from_eos')
-    if osc_in is None:
-        raise RuntimeError("OSC In DAT '/project1/io/oscin1_from_eos' not found")
-
-    osc_in.store('last_row', osc_in.numRows)
-    _send_osc(f'/eos/get/{pal_type}/count', [])
-    prev_count = _LAST_COUNTS.get(pal_type, 0)
     try:
-        count = _wait_for_message(_count_match, timeout=timeout)
-    except RuntimeError:
-        if prev_count > 0:
-            count = prev_count
-        else:
-            raise
-    _trim_table(pal_type, count)
-
-    # EOS uses 1-based palette numbers
-    for palette_num in range(1, count + 1):
-        osc_in.store('last_row', osc_in.numRows)
-        # Use correct EOS OSC API: /eos/get/{type}/{num}/list/{index}/{count}
-        _send_osc(f'/eos/get/{pal_type}/{palette_num}/list/0/1', [])
-        try:
-            parsed = _wait_for_message(_index_match(palette_num), timeout=timeout)
-        except RuntimeError:
-            print(f'[palette] WARN timeout waiting for {pal_type} palette #{palette_num}')
-            continue
-        handler._update_palette_row(pal_type, palette_num, parsed['num'], parsed['uid'], parsed['label'])
+        sync_task = mod('/project1/palette_logic/sync_task')
+    except Exception as exc:
+        raise RuntimeError('palette_logic/sync_task DAT missing (see PALETTE_SYNC_TEST.md)') from exc
+    cancel_sync(pal_type)
+    prev_count = mod('/project1/palette_logic/state').state.counts.get(pal_type, 0)
+    task = sync_task.SyncTask(pal_type, _PumpEngine(), timeout=timeout, prev_count=prev_count)
+    _SYNC_TASKS[pal_type] = task
+    handler.add_listener(_on_sync_message)
+    task.start()
+    if task.done:
+        _finish_sync(pal_type, task)
+    return task
 
-    _INDEX_QUEUES[pal_type].clear()
-    _ACTIVE_INDEX[pal_type] = None
-    _LAST_COUNTS[pal_type] = count
-    print(f'[palette] {pal_type} sync complete ({count} entries)')
 
 def sync_intensity_palettes(timeout: float = 5.0):
     return sync_palettes('ip', timeout=timeout)
 
+
+def _on_sync_message(address: str, args) -> None:
+    for task in tuple(_SYNC_TASKS.values()):
+        task.on_message(address, args)
+
+
+def tick_sync() -> None:
+    """Advance running sync tasks (call once per frame)."""
+    for pal_type, task in tuple(_SYNC_TASKS.items()):
+        if not task.step():
+            _finish_sync(pal_type, task)
+
+
+def _finish_sync(pal_type: str, task) -> None:
+    if _SYNC_TASKS.get(pal_type) is task:
+        del _SYNC_TASKS[pal_type]
+    if not _SYNC_TASKS:
+        mod('/project1/palette_logic/eos_notify_handler').remove_listener(_on_sync_message)
+
+
+def cancel_sync(pal_type: Optional[str] = None) -> None:
+    for key in [pal_type] if pal_type else list(_SYNC_TASKS):
+        task = _SYNC_TASKS.get(key)
+        if task is not None:
+            task.cancel()
+            _finish_sync(key, task)
+
+
+def sync_status() -> Dict[str, str]:
+    """Progress of running sync tasks per palette type."""
+    return {pal_type: task.status() for pal_type, task in _SYNC_TASKS.items()}
+
+
 def reset_subscription_state():
     """Mark the subscription as unknown; used when EOS disconnects."""
-    _set_status("is_subscribed", "0")
+    get_status().is_subscribed = False
+    mirror_status(force=True)
@@ -0,0 +1,196 @@
+"""Cooperative (non-blocking) palette sync for one palette type.
+
+Replaces the blocking ``subscribe_manager.sync_palettes`` loop. The sync is a
+generator that yields what it waits for; it never sleeps:
+
+- requests are handed to an engine (the pump: windowed, deduplicated,
+  retried) instead of being sent one by one
+- replies are fed in with ``on_message(address, args)`` (listener of
+  eos_notify_handler) and resume the generator immediately, in any order
+- ``step(now)`` is called once per frame and only handles timeouts: the
+  task gives up when no reply arrived for ``timeout`` seconds
+
+Progress (``completed`` / ``total``) and an ETA are available at any time.
+The table rows themselves are written by eos_notify_handler as usual.
+"""
+import time
+from typing import Generator, List, Optional, Protocol, Set, Tuple
+
+try:
+    from eos_osc.router import OscRouter
+except ImportError:  # src/ not on sys.path (bootstrap not run yet)
+    import sys
+    sys.path.append(project.folder + '/src')
+    from eos_osc.router import OscRouter
+
+Key = Tuple[object, ...]
+
+PROGRESS_STEPS = 10  # progress lines per sync
+
+
+class SyncEngine(Protocol):
+    """What a SyncTask needs from the request engine (pump module adapter)."""
+
+    def request_count(self, pal_type: str) -> object: ...
+
+    def request_palettes(self, pal_type: str, numbers: List[int]) -> object: ...
+
+
+class SyncTask:
+    """Fetch the count and then every palette of ``pal_type`` through ``engine``."""
+
+    def __init__(self, pal_type: str, engine: SyncEngine, timeout: float = 5.0, prev_count: int = 0) -> None:
+        self.pal_type = pal_type
+        self.timeout = timeout
+        self.prev_count = prev_count
+        self.total: Optional[int] = None
+        self.completed = 0
+        self.failed = 0
+        self.error = ""
+        self.started_at = 0.0
+        self.finished_at: Optional[float] = None
+        self._engine = engine
+        self._pending: Set[int] = set()
+        self._router = OscRouter()
+        self._router.add(f"/eos/out/get/{pal_type}/count", self._on_count)
+        self._router.add(f"/eos/out/get/{pal_type}/{{num:int}}/list/{{:int}}/{{:int}}", self._on_list)
+        self._gen: Optional[Generator[Key, object, None]] = None
+        self._waiting: Optional[Key] = None
+        self._deadline = 0.0
+        self._reported = 0
+
+    # ------------------------------------------------------------------
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def progress(self) -> float:
+        if not self.total:
+            return 1.0 if self.done else 0.0
+        return min((self.completed + self.failed) / self.total, 1.0)
+
+    def eta(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until done, from the average time per palette so far."""
+        handled = self.completed + self.failed
+        if self.total is None or not handled:
+            return None
+        now = time.perf_counter() if now is None else now
+        return (now - self.started_at) / handled * max(self.total - handled, 0)
+
+    def status(self, now: Optional[float] = None) -> str:
+        if self.error:
+            return f"{self.pal_type}: failed ({self.error})"
+        total = "?" if self.total is None else self.total
+        eta = self.eta(now)
+        eta_text = f", eta {eta:.1f}s" if eta is not None and not self.done else ""
+        return f"{self.pal_type}: {self.completed}/{total} ({self.failed} failed{eta_text})"
+
+    # ------------------------------------------------------------------
+    def start(self, now: Optional[float] = None) -> "SyncTask":
+        self.started_at = time.perf_counter() if now is None else now
+        self._gen = self._run()
+        self._advance(None, self.started_at)
+        return self
+
+    def on_message(self, address: str, args) -> bool:
+        """Reply from EOS; True if it was the one the task waits for."""
+        if self._waiting is None:
+            return False
+        found = self._router.match(address)
+        if found is None:
+            return False
+        route, captures = found
+        result = route.handler(args, *captures)
+        if result is None:
+            return False
+        self._advance(result, time.perf_counter())
+        return True
+
+    def step(self, now: Optional[float] = None) -> bool:
+        """Per-frame tick: resume on timeout; False once the task is finished."""
+        now = time.perf_counter() if now is None else now
+        if self._waiting is not None and now >= self._deadline:
+            self._advance(None, now)
+        return not self.done
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if self._gen is not None:
+            self._gen.close()
+        self._finish(time.perf_counter(), reason)
+
+    # ------------------------------------------------------------------
+    def _on_count(self, args) -> Optional[Key]:
+        if self._waiting != ("count",):
+            return None
+        return ("count", int(float(args[0])) if args else 0)
+
+    def _on_list(self, args, num: int) -> Optional[Key]:
+        if self._waiting != ("list",) or num not in self._pending:
+            return None
+        return ("list", num)
+
+    def _advance(self, result, now: float) -> None:
+        """Resume the generator with ``result`` (None = timed out)."""
+        self._waiting = None
+        try:
+            self._waiting = self._gen.send(result)
+        except StopIteration:
+            self._finish(now)
+            return
+        self._deadline = now + self.timeout
+        self._report(now)
+
+    def _run(self) -> Generator[Key, object, None]:
+        pal_type = self.pal_type
+        self._engine.request_count(pal_type)
+        reply = yield ("count",)
+        if reply is None:
+            if self.prev_count <= 0:
+                self.error = "timeout waiting for count"
+                return
+            print(f"[palette] WARN {pal_type} count timeout, using previous count {self.prev_count}")
+            count = self.prev_count
+        else:
+            count = max(reply[1], 0)
+        self.total = count
+        # EOS uses 1-based palette numbers; the engine paces the requests
+        self._pending = set(range(1, count + 1))
+        if self._pending:
+            self._engine.request_palettes(pal_type, sorted(self._pending))
+        while self._pending:
+            reply = yield ("list",)
+            if reply is None:
+                missing = sorted(self._pending)
+                print(f"[palette] WARN {pal_type} sync: no reply for {len(missing)} palettes {missing[:10]}")
+                self.failed += len(missing)
+                self._pending.clear()
+                return
+            self._pending.discard(reply[1])
+            self.completed += 1
+
+    def _report(self, now: float) -> None:
+        if not self.total:
+            return
+        step = int(self.progress * PROGRESS_STEPS)
+        if step > self._reported:
+            self._reported = step
+            print(f"[palette] sync {self.status(now)}")
+
+    def _finish(self, now: float, error: str = "") -> None:
+        if self.done:
+            return
+        self._waiting = None
+        self.error = self.error or error
+        self.finished_at = now
+        elapsed = now - self.started_at
+        if self.error:
+            print(f"[palette] ERROR {self.pal_type} sync: {self.error}")
+        else:
+            print(f"[palette] {self.pal_type} sync complete ({self.total} entries, {self.failed} failed, {elapsed:.2f}s)")
+
+
+__all__ = [
+    "SyncEngine",
+    "SyncTask",
+]
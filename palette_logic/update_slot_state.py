@@ -6,7 +6,7 @@ file into a DAT (or copy the contents) and call ``update_slot_state()`` from a
 DAT Execute or whenever palette data changes.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 
 PALETTE_TABLES: Dict[str, str] = {
@@ -23,6 +23,98 @@ SLOT_TEMPLATES: Dict[str, str] = {
 
 SLOT_STATE_DAT = "slot_state"
 UI_STATE_DAT = "ui_state"
+SLOT_FIELDS: Tuple[str, ...] = ("slot", "num", "label", "has_palette")
+
+PaletteEntry = Tuple[str, str]          # (num, label)
+SlotRow = Tuple[str, str, str, str]     # SLOT_FIELDS
+
+
+class SlotView:
+    """Cached slot view: compact palette rows, page slices and written slot rows.
+
+    ``render`` returns only the cells whose value differs from what was last
+    written to slot_state, so paging or a palette reply touches O(changed
+    slots) cells.
+    """
+
+    def __init__(self) -> None:
+        self.palettes: Dict[str, List[PaletteEntry]] = {}
+        self.slots: Dict[str, List[str]] = {}
+        self._pages: Dict[Tuple[str, int], List[SlotRow]] = {}
+        self.written: List[Optional[SlotRow]] = []
+
+    def set_palettes(self, palette_type: str, entries: Sequence[PaletteEntry]) -> None:
+        entries = list(entries)
+        if self.palettes.get(palette_type) == entries:
+            return
+        self.palettes[palette_type] = entries
+        self._drop_pages(palette_type)
+
+    def set_slots(self, palette_type: str, slots: Sequence[str]) -> None:
+        slots = list(slots)
+        if self.slots.get(palette_type) == slots:
+            return
+        self.slots[palette_type] = slots
+        self._drop_pages(palette_type)
+
+    def _drop_pages(self, palette_type: str) -> None:
+        for key in [k for k in self._pages if k[0] == palette_type]:
+            del self._pages[key]
+
+    def page(self, palette_type: str, page: int) -> List[SlotRow]:
+        key = (palette_type, page)
+        rows = self._pages.get(key)
+        if rows is None:
+            rows = self._pages[key] = self._build_page(palette_type, page)
+        return rows
+
+    def _build_page(self, palette_type: str, page: int) -> List[SlotRow]:
+        slots = self.slots.get(palette_type, [])
+        entries = self.palettes.get(palette_type, [])
+        start = max(0, (page - 1) * len(slots))
+        rows = []
+        for slot_idx, slot_name in enumerate(slots):
+            palette_index = start + slot_idx
+            if palette_index < len(entries):
+                num, label = entries[palette_index]
+                rows.append((slot_name, num, label or num, "1"))
+            else:
+                rows.append((slot_name, "0", "--", "0"))
+        return rows
+
+    def render(self, palette_type: str, page: int) -> List[Tuple[int, int, str]]:
+        """Changed cells as (row, field index, value); row 1 is the first slot."""
+        rows = self.page(palette_type, page)
+        if len(self.written) < len(rows):
+            self.written.extend([None] * (len(rows) - len(self.written)))
+        changes = []
+        for slot_idx, row in enumerate(rows):
+            old = self.written[slot_idx]
+            if old == row:
+                continue
+            for field, value in enumerate(row):
+                if old is None or old[field] != value:
+                    changes.append((slot_idx + 1, field, value))
+            self.written[slot_idx] = row
+        return changes
+
+    def forget(self, palette_type: str, palettes: bool = True, slots: bool = True) -> None:
+        """Drop cached source rows of one type (re-read on next use)."""
+        if palettes:
+            self.palettes.pop(palette_type, None)
+        if slots:
+            self.slots.pop(palette_type, None)
+        self._drop_pages(palette_type)
+
+    def reset(self) -> None:
+        """Forget everything, including what was written to slot_state."""
+        self.palettes.clear()
+        self.slots.clear()
+        self._pages.clear()
+        self.written = []
+
+
+VIEW = SlotView()
 
 
 def _table_headers(table) -> Dict[str, int]:
@@ -31,83 +123,88 @@ def _table_headers(table) -> Dict[str, int]:
     return {cell.val: idx for idx, cell in enumerate(header_row)}
 
 
-def _dict_from_table(table) -> Dict[str, str]:
-    """Convert a two-column table (key/value) into a dictionary."""
-    result = {}
-    for row in table.rows()[1:]:
-        if len(row) < 2:
-            continue
-        result[row[0].val] = row[1].val
-    return result
+def _ui_value(table, key: str, default: str) -> str:
+    cell = table[key, 1]
+    return cell.val if cell is not None and cell.val != "" else default
 
 
-def _get_palette_rows(palette_type: str) -> List[List[str]]:
+def _palette_table(palette_type: str):
     table_name = PALETTE_TABLES.get(palette_type)
     if not table_name:
         raise ValueError(f"Unsupported palette type '{palette_type}'")
     table = op(table_name)
     if table is None:
         raise RuntimeError(f"Missing DAT '{table_name}' for palette type '{palette_type}'")
-    return table.rows()[1:]  # skip header
+    return table
+
 
+def _get_palette_entries(palette_type: str) -> List[PaletteEntry]:
+    table = _palette_table(palette_type)
+    headers = _table_headers(table) if table.numRows else {}
+    # pal_* tables: index, num, uid, label, ... (older tables: num, uid, label)
+    nums = table.col(headers.get("num", 0))
+    labels = table.col(headers.get("label", 2))
+    if not nums:
+        return []
+    labels = labels or []
+    return [
+        (nums[r].val, labels[r].val if r < len(labels) else "")
+        for r in range(1, len(nums))  # skip header
+    ]
 
-def _get_slot_template_rows(palette_type: str) -> List[List[str]]:
+
+def _get_slot_names(palette_type: str) -> List[str]:
     template_name = SLOT_TEMPLATES.get(palette_type)
     if not template_name:
         raise ValueError(f"Unsupported palette type '{palette_type}'")
     table = op(template_name)
     if table is None:
         raise RuntimeError(f"Missing DAT '{template_name}' for palette type '{palette_type}'")
-    return table.rows()[1:]  # skip header
+    column = table.col(0) or []
+    return [cell.val for cell in column[1:]]  # skip header
 
 
-def update_slot_state(palette_type: Optional[str] = None):
+def update_slot_state(palette_type: Optional[str] = None, changed=None):
     """
     Populate the slot_state table from the palette list.
 
+    Only cells that differ from the last written values are touched.
+
     Args:
         palette_type: Optional explicit palette type (ip/fp/cp/bp). If omitted,
                       the value from ui_state.current_type is used.
+        changed: The DAT that changed (from onTableChange). Only that DAT is
+                 re-read; None re-reads everything and rewrites all slots.
     """
     slot_state = op(SLOT_STATE_DAT)
     if slot_state is None:
         raise RuntimeError(f"Missing DAT '{SLOT_STATE_DAT}'")
 
-    headers = _table_headers(slot_state)
-
     ui_state = op(UI_STATE_DAT)
     if ui_state is None:
         raise RuntimeError(f"Missing DAT '{UI_STATE_DAT}'")
 
-    state = _dict_from_table(ui_state)
-    palette_type = palette_type or state.get("current_type", "ip")
-    page = int(state.get("page", 1) or 1)
-
-    palette_rows = _get_palette_rows(palette_type)
-    template_rows = _get_slot_template_rows(palette_type)
-
-    page_size = len(template_rows)
-    start_index = max(0, (page - 1) * page_size)
-
-    for slot_idx, template_row in enumerate(template_rows):
-        slot_name = template_row[0].val
-        state_row_index = slot_idx + 1  # +1 because row 0 is header
-
-        palette_index = start_index + slot_idx
-        if palette_index < len(palette_rows):
-            palette_row = palette_rows[palette_index]
-            num = palette_row[0].val
-            label = palette_row[2].val or num
-            has_palette = "1"
-        else:
-            num = "0"
-            label = "--"
-            has_palette = "0"
-
-        slot_state[state_row_index, headers["slot"]] = slot_name
-        slot_state[state_row_index, headers["num"]] = num
-        slot_state[state_row_index, headers["label"]] = label
-        slot_state[state_row_index, headers["has_palette"]] = has_palette
+    palette_type = palette_type or _ui_value(ui_state, "current_type", "ip")
+    page = int(_ui_value(ui_state, "page", "1"))
+    if changed is None:
+        VIEW.reset()
+    else:
+        changed_name = getattr(changed, "name", None)
+        for key in PALETTE_TABLES:
+            if changed_name == PALETTE_TABLES[key]:
+                VIEW.forget(key, slots=False)
+            elif changed_name == SLOT_TEMPLATES[key]:
+                VIEW.forget(key, palettes=False)
+
+    if palette_type not in VIEW.palettes:
+        VIEW.set_palettes(palette_type, _get_palette_entries(palette_type))
+    if palette_type not in VIEW.slots:
+        VIEW.set_slots(palette_type, _get_slot_names(palette_type))
+
+    headers = _table_headers(slot_state)
+    columns = [headers[field] for field in SLOT_FIELDS]
+    for row, field, value in VIEW.render(palette_type, page):
+        slot_state[row, columns[field]] = value
 
 
 # Allow manual testing inside TouchDesigner by calling this DAT directly.
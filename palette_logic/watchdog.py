@@ -10,9 +10,11 @@ def _get_module(name):
     return mod(f'/project1/palette_logic/{name}')
 
 state = _get_module('state')
+pump = _get_module('pump')
 ORDER = state.ORDER
 
 SUBSCRIBE_BACKOFF = 5.0
+# Safety net only: edits arrive as /eos/out/notify, an unchanged count is a no-op
 COUNT_BACKOFF = 10.0
 
 
@@ -40,14 +42,9 @@ def ensure_subscribed(base) -> None:
 
 
 def request_all_counts(base) -> None:
+    # Through the pump: a count still outstanding (e.g. from a notify or a
+    # sync task) is not requested twice
     state.attach_base(base)
-    st = state.state
-    osc = state.get_osc_out()
-    if not osc:
-        print("[palette] WARN osc_out DAT missing; cannot request counts")
-        return
-    st.last_count_request = time.perf_counter()
     for palette_type in ORDER:
-        # EOS API: /eos/get/{type}/count
-        osc.sendOSC(f"/eos/get/{palette_type}/count", [])
-        print(f"[palette] count request {palette_type}")
+        if pump.request_count(palette_type):
+            print(f"[palette] count request {palette_type}")
@@ -0,0 +1,28 @@
+"""Shared Eos OSC helpers (codec, value cache, rate limiting, per-console outputs, TCP, routing)."""
+
+from .codec import Bundle, Message, OscDecodeError, decode_packet, encode_message  # noqa: F401
+from .output_cache import OutputCache, OutputStats, get_cache  # noqa: F401
+from .pool import Destination, OutputPool, cache_key, get_pool, split_ips  # noqa: F401
+from .router import OscRouter, Route  # noqa: F401
+from .slip import SlipDecoder  # noqa: F401
+from .tcp_transport import TcpTransport  # noqa: F401
+
+__all__ = [
+    "Bundle",
+    "Destination",
+    "Message",
+    "OscDecodeError",
+    "OscRouter",
+    "OutputCache",
+    "OutputPool",
+    "OutputStats",
+    "Route",
+    "SlipDecoder",
+    "TcpTransport",
+    "cache_key",
+    "decode_packet",
+    "encode_message",
+    "get_cache",
+    "get_pool",
+    "split_ips",
+]
@@ -0,0 +1,274 @@
+"""Pure-Python OSC 1.0 codec (messages and bundles) for headless use and tests.
+
+TouchDesigner encodes OSC inside ``sendOSC``; everything else (TCP
+transport, benchmarks, tests outside TD) uses this module:
+
+- the padded encoding of an address is cached (Eos traffic reuses a small
+  set of addresses)
+- each type-tag signature gets a precompiled ``struct.Struct``: all
+  fixed-size arguments of a message are packed/unpacked in one call
+- decoding works on ``memoryview``s without copying the packet; strings
+  are decoded to ``str``, blobs are returned as ``memoryview`` slices of the
+  packet (copy with ``bytes()`` to keep them beyond the packet's lifetime)
+
+Supported types: i f s b h d t T F N (OSC 1.0 plus the common extensions).
+"""
+
+from __future__ import annotations
+
+import numbers
+import struct
+from functools import lru_cache
+from typing import Iterator, List, NamedTuple, Sequence, Tuple, Union
+
+BUNDLE_TAG = b"#bundle\x00"
+IMMEDIATE = 1  # timetag "now"
+
+# Fixed-size argument types: struct code per OSC tag
+_FIXED = {"i": "i", "f": "f", "h": "q", "d": "d", "t": "Q"}
+# Tags without argument data
+_CONSTANTS = {"T": True, "F": False, "N": None}
+
+_INT32 = struct.Struct(">i")
+_BUNDLE_HEADER = struct.Struct(">8sQ")
+
+_ADDRESS_CACHE_SIZE = 4096
+_SCAN_WINDOW = 64
+
+
+class Message(NamedTuple):
+    address: str
+    args: List[object]
+
+
+class Bundle(NamedTuple):
+    timetag: int
+    elements: List[Union[Message, "Bundle"]]
+
+
+Packet = Union[Message, Bundle]
+
+
+def _padded(data: bytes) -> bytes:
+    """``data`` plus NUL terminator, padded to a multiple of 4."""
+    return data + b"\x00" * (4 - len(data) % 4)
+
+
+# ----------------------------------------------------------------------
+# Encoding
+# ----------------------------------------------------------------------
+@lru_cache(maxsize=_ADDRESS_CACHE_SIZE)
+def encode_address(address: str) -> bytes:
+    """Padded address bytes (cached)."""
+    return _padded(address.encode("utf-8"))
+
+
+def _tag(value: object) -> str:
+    if value is True:
+        return "T"
+    if value is False:
+        return "F"
+    if value is None:
+        return "N"
+    if isinstance(value, str):
+        return "s"
+    # Integral/Real also cover numpy scalars (np.int64, np.float32, ...)
+    if isinstance(value, numbers.Integral):
+        return "i" if -0x80000000 <= value <= 0x7FFFFFFF else "h"
+    if isinstance(value, numbers.Real):
+        return "f"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "b"
+    raise TypeError(f"unsupported OSC argument type: {type(value).__name__}")
+
+
+@lru_cache(maxsize=256)
+def _signature(tags: str) -> Tuple[bytes, struct.Struct, bool]:
+    """Padded type-tag string, Struct for the fixed args, fixed-only flag."""
+    fixed = "".join(_FIXED[t] for t in tags if t in _FIXED)
+    fixed_only = all(t in _FIXED or t in _CONSTANTS for t in tags)
+    return _padded(("," + tags).encode("ascii")), struct.Struct(">" + fixed), fixed_only
+
+
+@lru_cache(maxsize=None)
+def _struct_for(code: str) -> struct.Struct:
+    return struct.Struct(">" + code)
+
+
+def _encode_variable(tag: str, value: object) -> bytes:
+    if tag == "s":
+        return _padded(str(value).encode("utf-8"))
+    data = bytes(value)  # blob
+    return _INT32.pack(len(data)) + data + b"\x00" * (-len(data) % 4)
+
+
+def encode_message(address: str, args: Sequence[object] = ()) -> bytes:
+    """Encode one OSC message."""
+    if not args:
+        return encode_address(address) + b",\x00\x00\x00"
+    tags = "".join([_tag(value) for value in args])
+    tag_bytes, fixed, fixed_only = _signature(tags)
+    if fixed_only:
+        values = [v for t, v in zip(tags, args) if t in _FIXED]
+        return encode_address(address) + tag_bytes + fixed.pack(*values)
+    # Mixed: fixed-size values are packed one by one in argument order
+    parts = [encode_address(address), tag_bytes]
+    for tag, value in zip(tags, args):
+        code = _FIXED.get(tag)
+        if code is not None:
+            parts.append(_struct_for(code).pack(value))
+        elif tag not in _CONSTANTS:
+            parts.append(_encode_variable(tag, value))
+    return b"".join(parts)
+
+
+def encode_bundle(elements: Sequence[Union[Packet, bytes]], timetag: int = IMMEDIATE) -> bytes:
+    """Encode a bundle of messages/bundles (or already encoded packets)."""
+    parts = [_BUNDLE_HEADER.pack(BUNDLE_TAG, timetag)]
+    for element in elements:
+        if isinstance(element, Bundle):
+            data = encode_bundle(element.elements, element.timetag)
+        elif isinstance(element, Message):
+            data = encode_message(element.address, element.args)
+        else:
+            data = bytes(element)
+        parts.append(_INT32.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def encode_packet(packet: Packet) -> bytes:
+    if isinstance(packet, Bundle):
+        return encode_bundle(packet.elements, packet.timetag)
+    return encode_message(packet.address, packet.args)
+
+
+# ----------------------------------------------------------------------
+# Decoding
+# ----------------------------------------------------------------------
+class OscDecodeError(ValueError):
+    """Malformed OSC packet."""
+
+
+def _read_string(view: memoryview, pos: int) -> Tuple[str, int]:
+    # Search the terminator in small copied windows, not in a copy of the rest
+    end = len(view)
+    i = pos
+    while i < end:
+        zero = bytes(view[i:i + _SCAN_WINDOW]).find(b"\x00")
+        if zero >= 0:
+            stop = i + zero
+            return str(view[pos:stop], "utf-8", "replace"), (stop + 4) & ~3
+        i += _SCAN_WINDOW
+    raise OscDecodeError("unterminated OSC string")
+
+
+@lru_cache(maxsize=256)
+def _decode_plan(tags: str) -> Tuple[struct.Struct, bool, bool]:
+    """Struct for the fixed args, fixed-only flag, constants-present flag."""
+    for tag in tags:
+        if tag not in _FIXED and tag not in _CONSTANTS and tag not in "sb":
+            raise OscDecodeError(f"unsupported OSC type tag {tag!r}")
+    _, fixed, fixed_only = _signature(tags)
+    return fixed, fixed_only, any(t in _CONSTANTS for t in tags)
+
+
+def decode_message(data: Union[bytes, bytearray, memoryview]) -> Message:
+    """Decode one OSC message without copying ``data``."""
+    view = data if isinstance(data, memoryview) else memoryview(data)
+    try:
+        address, pos = _read_string(view, 0)
+        if pos >= len(view):
+            return Message(address, [])  # pre-1.0 message without type tags
+        tag_str, pos = _read_string(view, pos)
+        if not tag_str.startswith(","):
+            raise OscDecodeError(f"missing type tags in {address}")
+        tags = tag_str[1:]
+        fixed, fixed_only, constants = _decode_plan(tags)
+        if fixed_only and not constants:
+            return Message(address, list(fixed.unpack_from(view, pos)))
+        if fixed_only:
+            values = iter(fixed.unpack_from(view, pos))
+            return Message(address, [
+                _CONSTANTS[t] if t in _CONSTANTS else next(values) for t in tags
+            ])
+        args: List[object] = []
+        for tag in tags:
+            code = _FIXED.get(tag)
+            if code is not None:
+                packer = _struct_for(code)
+                args.append(packer.unpack_from(view, pos)[0])
+                pos += packer.size
+            elif tag in _CONSTANTS:
+                args.append(_CONSTANTS[tag])
+            elif tag == "s":
+                value, pos = _read_string(view, pos)
+                args.append(value)
+            else:  # blob
+                size = _INT32.unpack_from(view, pos)[0]
+                start = pos + 4
+                if size < 0 or start + size > len(view):
+                    raise OscDecodeError(f"blob exceeds packet in {address}")
+                args.append(view[start:start + size])
+                pos = start + size + (-size % 4)
+        return Message(address, args)
+    except struct.error as exc:
+        raise OscDecodeError(f"truncated OSC message: {exc}") from exc
+
+
+def is_bundle(data: Union[bytes, bytearray, memoryview]) -> bool:
+    return bytes(data[:8]) == BUNDLE_TAG
+
+
+def decode_bundle(data: Union[bytes, bytearray, memoryview]) -> Bundle:
+    view = data if isinstance(data, memoryview) else memoryview(data)
+    if len(view) < _BUNDLE_HEADER.size or not is_bundle(view):
+        raise OscDecodeError("not an OSC bundle")
+    _, timetag = _BUNDLE_HEADER.unpack_from(view, 0)
+    elements: List[Packet] = []
+    pos = _BUNDLE_HEADER.size
+    end = len(view)
+    while pos < end:
+        if pos + 4 > end:
+            raise OscDecodeError("truncated bundle element size")
+        size = _INT32.unpack_from(view, pos)[0]
+        pos += 4
+        if size < 0 or pos + size > end:
+            raise OscDecodeError("bundle element exceeds packet")
+        elements.append(decode_packet(view[pos:pos + size]))
+        pos += size
+    return Bundle(timetag, elements)
+
+
+def decode_packet(data: Union[bytes, bytearray, memoryview]) -> Packet:
+    """Decode a message or a bundle."""
+    if is_bundle(data):
+        return decode_bundle(data)
+    return decode_message(data)
+
+
+def iter_messages(data: Union[bytes, bytearray, memoryview, Packet]) -> Iterator[Message]:
+    """All messages of a packet, bundles flattened in order."""
+    packet = decode_packet(data) if not isinstance(data, (Message, Bundle)) else data
+    if isinstance(packet, Message):
+        yield packet
+        return
+    for element in packet.elements:
+        yield from iter_messages(element)
+
+
+__all__ = [
+    "Bundle",
+    "IMMEDIATE",
+    "Message",
+    "OscDecodeError",
+    "decode_bundle",
+    "decode_message",
+    "decode_packet",
+    "encode_address",
+    "encode_bundle",
+    "encode_message",
+    "encode_packet",
+    "is_bundle",
+    "iter_messages",
+]
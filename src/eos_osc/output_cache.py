@@ -0,0 +1,273 @@
+"""Last-sent value cache and adaptive rate limiter for continuous Eos OSC output."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Sequence
+
+SendFunc = Callable[[str, List[object]], object]
+
+DEFAULT_DEADBAND = 0.01       # values closer than this to the last sent one are redundant
+DEFAULT_MIN_INTERVAL = 0.05   # seconds between two sends of one address
+DEFAULT_MAX_INTERVAL = 0.25   # upper bound when the limiter backs off
+DEFAULT_TARGET_RATE = 200.0   # messages per second above which the interval grows
+RATE_WINDOW_S = 1.0           # time constant of the measured send rate
+
+
+@dataclass
+class _Entry:
+    address: str = ""
+    last: Optional[List[object]] = None
+    last_sent: float = float("-inf")
+    pending: Optional[List[object]] = None
+    pending_send: Optional[SendFunc] = None
+    # Set while ``pending`` is a trailing value inside the deadband: when it
+    # became pending (sent once it stayed unchanged for one interval)
+    trailing_since: Optional[float] = None
+
+
+@dataclass
+class OutputStats:
+    """Counters since the last ``reset_stats()``."""
+
+    offered: int = 0
+    sent: int = 0
+    redundant: int = 0   # equal to / within the deadband of the last sent value
+    coalesced: int = 0   # pending value replaced or dropped before it was sent
+    failed: int = 0
+
+    @property
+    def suppressed(self) -> int:
+        """Offers that did not (yet) reach Eos."""
+        return max(self.offered - self.sent - self.failed, 0)
+
+    @property
+    def suppression_ratio(self) -> float:
+        return self.suppressed / self.offered if self.offered else 0.0
+
+
+def _within_deadband(a: Sequence[object], b: Sequence[object], deadband: float) -> bool:
+    if len(a) != len(b):
+        return False
+    for x, y in zip(a, b):
+        if isinstance(x, (int, float)) and isinstance(y, (int, float)) \
+                and not isinstance(x, bool) and not isinstance(y, bool):
+            if abs(x - y) >= deadband and x != y:
+                return False
+        elif x != y:
+            return False
+    return True
+
+
+class OutputCache:
+    """Suppress redundant and too frequent sends per OSC address.
+
+    ``offer()`` sends a value immediately, drops it when it is within the
+    deadband of the last sent value, or keeps it as the pending value of its
+    address while the minimum interval runs. ``flush()`` (once per frame)
+    sends due pending values, so the final value of a fader move always
+    arrives. A value inside the deadband is held as trailing value and
+    flushed once it stayed unchanged for one interval, so a fader that
+    stops at 0.0 after 0.008 still gets there while jitter is suppressed.
+    The interval grows with the measured send rate above ``target_rate``
+    and shrinks back when traffic calms down.
+
+    Only use it for absolute values (levels, fader positions); key presses
+    and relative encoder deltas must not be deduplicated.
+    """
+
+    def __init__(
+        self,
+        send: Optional[SendFunc] = None,
+        *,
+        deadband: float = DEFAULT_DEADBAND,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        target_rate: float = DEFAULT_TARGET_RATE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._send = send
+        self.deadband = deadband
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_rate = target_rate
+        self.interval = min_interval
+        self._clock = clock
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._pending: Dict[Hashable, _Entry] = {}
+        self._rate = 0.0
+        self._rate_sent = 0
+        self._rate_time: Optional[float] = None
+        self.stats = OutputStats()
+
+    # ------------------------------------------------------------------
+    @property
+    def rate(self) -> float:
+        """Measured sends per second (exponentially averaged)."""
+        return self._rate
+
+    def now(self) -> float:
+        """Current time on the cache's clock (take it once per frame)."""
+        return self._clock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def last_value(self, key: Hashable) -> Optional[List[object]]:
+        entry = self._entries.get(key)
+        return None if entry is None else entry.last
+
+    def forget(self, key: Optional[Hashable] = None) -> None:
+        """Drop cached state (all addresses when ``key`` is None)."""
+        if key is None:
+            self._entries.clear()
+            self._pending.clear()
+        else:
+            self._entries.pop(key, None)
+            self._pending.pop(key, None)
+
+    def reset_stats(self) -> None:
+        self.stats = OutputStats()
+
+    def report(self) -> Dict[str, float]:
+        s = self.stats
+        return {
+            "offered": s.offered,
+            "sent": s.sent,
+            "redundant": s.redundant,
+            "coalesced": s.coalesced,
+            "failed": s.failed,
+            "pending": self.pending,
+            "suppression_ratio": round(s.suppression_ratio, 3),
+            "rate": round(self._rate, 1),
+            "interval": round(self.interval, 3),
+        }
+
+    # ------------------------------------------------------------------
+    def offer(
+        self,
+        address: str,
+        args: Sequence[object],
+        *,
+        now: Optional[float] = None,
+        send: Optional[SendFunc] = None,
+        key: Optional[Hashable] = None,
+    ) -> bool:
+        """Send ``args`` to ``address`` unless redundant or rate limited.
+
+        Returns True when the value went out now. A rate-limited value is
+        kept as pending and sent by ``flush()``. ``key`` separates equal
+        addresses on different destinations (default: the address).
+        """
+        now = self._clock() if now is None else now
+        values = list(args)
+        if key is None:
+            key = address
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry(address)
+        self.stats.offered += 1
+
+        if entry.last is not None and _within_deadband(values, entry.last, self.deadband):
+            self.stats.redundant += 1
+            if values == entry.last:
+                if entry.pending is not None:
+                    # moved away and back again: the pending value is obsolete
+                    self.stats.coalesced += 1
+                    entry.pending = entry.pending_send = entry.trailing_since = None
+                    self._pending.pop(key, None)
+            elif values != entry.pending:
+                # possibly the end of a move: send it if it stays put
+                if entry.pending is not None:
+                    self.stats.coalesced += 1
+                entry.pending = values
+                entry.pending_send = send
+                entry.trailing_since = now
+                self._pending[key] = entry
+            return False
+
+        if now - entry.last_sent < self.interval:
+            if entry.pending is not None:
+                self.stats.coalesced += 1
+            entry.pending = values
+            entry.pending_send = send
+            entry.trailing_since = None
+            self._pending[key] = entry
+            return False
+
+        return self._emit(key, entry, values, send, now)
+
+    def flush(self, now: Optional[float] = None) -> int:
+        """Send pending values whose interval has elapsed; call once per frame."""
+        now = self._clock() if now is None else now
+        sent = 0
+        if self._pending:
+            for key, entry in list(self._pending.items()):
+                if now - entry.last_sent < self.interval:
+                    continue
+                if entry.trailing_since is not None and now - entry.trailing_since < self.interval:
+                    continue
+                del self._pending[key]
+                values, send = entry.pending, entry.pending_send
+                entry.pending = entry.pending_send = entry.trailing_since = None
+                if values is not None and self._emit(key, entry, values, send, now):
+                    sent += 1
+        self._adapt(now)
+        return sent
+
+    # ------------------------------------------------------------------
+    def _emit(self, key: Hashable, entry: _Entry, values: List[object],
+              send: Optional[SendFunc], now: float) -> bool:
+        sender = send or self._send
+        if sender is None:
+            raise RuntimeError("OutputCache has no send function")
+        try:
+            ok = sender(entry.address, values)
+        except Exception:
+            ok = False
+        if ok is False:
+            self.stats.failed += 1
+            return False
+        entry.last = values
+        entry.last_sent = now
+        if entry.pending is not None:
+            entry.pending = entry.pending_send = entry.trailing_since = None
+            self._pending.pop(key, None)
+        self.stats.sent += 1
+        self._rate_sent += 1
+        return True
+
+    def _adapt(self, now: float) -> None:
+        if self._rate_time is None:
+            self._rate_time = now
+            return
+        dt = now - self._rate_time
+        if dt <= 0.0:
+            return
+        alpha = min(dt / RATE_WINDOW_S, 1.0)
+        self._rate += alpha * (self._rate_sent / dt - self._rate)
+        self._rate_sent = 0
+        self._rate_time = now
+        load = self._rate / self.target_rate if self.target_rate > 0 else 0.0
+        self.interval = min(max(self.min_interval * max(load, 1.0), self.min_interval),
+                            self.max_interval)
+
+
+_shared: Optional[OutputCache] = None
+
+
+def get_cache() -> OutputCache:
+    """Process-wide cache shared by every module that sends to Eos."""
+    global _shared
+    if _shared is None:
+        _shared = OutputCache()
+    return _shared
+
+
+__all__ = [
+    "OutputCache",
+    "OutputStats",
+    "get_cache",
+]
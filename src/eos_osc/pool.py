@@ -0,0 +1,272 @@
+"""One OSC output per Eos console, with a send queue flushed once per frame.
+
+Modules hand messages to ``OutputPool.send(eos_ip, address, values)``; the
+pool queues them per destination and ``flush()`` (tick_exec, once per frame)
+writes every queue through that destination's output. Destinations are
+created on first use, so one TouchDesigner node can drive several consoles
+or a primary and a backup console at the same time.
+
+``eos_ip`` may list several consoles (``"10.101.1.100;10.101.1.101"``); the
+message is then queued for each of them. An empty ``eos_ip`` or the primary
+address goes to the project's main output (``/project1/io/oscout1``).
+``tcp://host[:port]`` uses a persistent OSC-over-TCP connection (SLIP)
+instead of an OSC Out DAT; its queue goes out in one write per frame.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .tcp_transport import DEFAULT_TCP_PORT, TcpTransport
+
+SendFunc = Callable[[str, List[object]], object]
+OutputFactory = Callable[[str], Optional[SendFunc]]
+
+_LOG_PREFIX = "[eos_osc.pool]"
+
+# instances.csv default: no console configured → main output
+PRIMARY_IP = "127.0.0.1"
+PRIMARY_OUTPUT_PATH = "/project1/io/oscout1"
+TCP_PREFIX = "tcp://"
+
+_IP_SPLIT = re.compile(r"[\s,;+]+")
+
+
+class Destination:
+    """Send queue and output of one console."""
+
+    def __init__(self, ip: str, output: Optional[SendFunc]) -> None:
+        self.ip = ip
+        self.output = output
+        self.queue: List[Tuple[str, List[object]]] = []
+        self.sent = 0
+        self.failed = 0
+
+    def send(self, address: str, values: Sequence[object]) -> bool:
+        """Queue one message; it goes out with the next ``flush()``."""
+        if self.output is None:
+            self.failed += 1
+            return False
+        self.queue.append((address, list(values)))
+        return True
+
+    def flush(self) -> int:
+        if not self.queue:
+            return 0
+        queue, self.queue = self.queue, []
+        send_batch = getattr(self.output, "send_batch", None)
+        if send_batch is not None:
+            # stream outputs (TCP): the whole frame in one write
+            sent = send_batch(queue)
+            self.failed += len(queue) - sent
+            self.sent += sent
+            return sent
+        sent = 0
+        for address, values in queue:
+            try:
+                ok = self.output(address, values)
+            except Exception as exc:
+                print(f"{_LOG_PREFIX} ERROR sending {address} to {self.ip or 'main output'}: {exc}")
+                ok = False
+            if ok is False:
+                self.failed += 1
+            else:
+                sent += 1
+        self.sent += sent
+        return sent
+
+
+class _Group:
+    """Sender for an ``eos_ip`` that lists several consoles."""
+
+    def __init__(self, destinations: Sequence[Destination]) -> None:
+        self.destinations = tuple(destinations)
+
+    def send(self, address: str, values: Sequence[object]) -> bool:
+        ok = False
+        for destination in self.destinations:
+            ok = destination.send(address, values) or ok
+        return ok
+
+
+def split_ips(eos_ip: Optional[str]) -> Tuple[str, ...]:
+    """Normalise an ``eos_ip`` spec to its destinations ('' = main output)."""
+    ips = [ip for ip in _IP_SPLIT.split(eos_ip or "") if ip]
+    ips = ["" if ip == PRIMARY_IP else ip for ip in ips]
+    return tuple(dict.fromkeys(ips)) or ("",)
+
+
+def cache_key(eos_ip: Optional[str], address: str) -> Hashable:
+    """OutputCache key of ``address`` on ``eos_ip``.
+
+    The main output uses the bare address, like modules that send to
+    oscout1 directly (menu_engine), so they share one cache entry; other
+    consoles are keyed by their normalised destinations.
+    """
+    ips = split_ips(eos_ip)
+    return address if ips == ("",) else (ips, address)
+
+
+class OutputPool:
+    """Per-console outputs and queues, created on first use."""
+
+    def __init__(self, factory: Optional[OutputFactory] = None) -> None:
+        self._factory = factory or default_output_factory
+        self._destinations: Dict[str, Destination] = {}
+        self._senders: Dict[Optional[str], SendFunc] = {}
+
+    def destination(self, ip: str) -> Destination:
+        destination = self._destinations.get(ip)
+        if destination is None:
+            output = self._factory(ip)
+            if output is None:
+                print(f"{_LOG_PREFIX} ERROR: no OSC output for {ip or 'main output'}")
+            destination = self._destinations[ip] = Destination(ip, output)
+        return destination
+
+    def destinations(self) -> Tuple[Destination, ...]:
+        return tuple(self._destinations.values())
+
+    def sender(self, eos_ip: Optional[str] = None) -> SendFunc:
+        """Send callable ``(address, values)`` for an ``eos_ip`` spec (cached)."""
+        sender = self._senders.get(eos_ip)
+        if sender is None:
+            targets = [self.destination(ip) for ip in split_ips(eos_ip)]
+            sender = targets[0].send if len(targets) == 1 else _Group(targets).send
+            self._senders[eos_ip] = sender
+        return sender
+
+    def send(self, eos_ip: Optional[str], address: str, values: Sequence[object] = ()) -> bool:
+        return self.sender(eos_ip)(address, values)
+
+    def poll(self, limit: Optional[int] = None) -> List[Tuple[str, str, List[object]]]:
+        """Replies received by stream outputs (TCP) as ``(ip, address, args)``.
+
+        Call on the main thread (tick_exec) and hand them to the reply
+        handler; UDP replies arrive through the OSC In DAT instead.
+        """
+        replies: List[Tuple[str, str, List[object]]] = []
+        for destination in self._destinations.values():
+            poll = getattr(destination.output, "poll", None)
+            if poll is not None:
+                replies.extend((destination.ip, address, args) for address, args in poll(limit))
+        return replies
+
+    @property
+    def queued(self) -> int:
+        return sum(len(d.queue) for d in self._destinations.values())
+
+    def flush(self) -> int:
+        """Write every destination's queue; call once per frame."""
+        sent = 0
+        for destination in self._destinations.values():
+            if destination.queue:
+                sent += destination.flush()
+        return sent
+
+    def reset(self) -> None:
+        """Forget all outputs (e.g. after OSC DATs were recreated)."""
+        for destination in self._destinations.values():
+            close = getattr(destination.output, "close", None)
+            if close is not None:
+                close()
+        self._destinations.clear()
+        self._senders.clear()
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        return {
+            (d.ip or "main"): {"sent": d.sent, "failed": d.failed, "queued": len(d.queue)}
+            for d in self._destinations.values()
+        }
+
+
+# ----------------------------------------------------------------------
+# TouchDesigner outputs
+# ----------------------------------------------------------------------
+def _td_op():
+    try:
+        import __main__
+        return __main__.op
+    except Exception:
+        return None
+
+
+def _output_name(ip: str) -> str:
+    return "oscout_" + re.sub(r"[^0-9A-Za-z]", "_", ip)
+
+
+def td_output_factory(ip: str) -> Optional[SendFunc]:
+    """OSC Out DAT for ``ip``: oscout1 for the main console, else a copy of it.
+
+    Copies (``oscout_<ip>``) live next to oscout1 and keep its port and
+    protocol; only the network address is changed.
+    """
+    op = _td_op()
+    if op is None:
+        return None
+    try:
+        primary = op(PRIMARY_OUTPUT_PATH)
+    except Exception:
+        primary = None
+    if primary is None:
+        return None
+    if not ip:
+        return primary.sendOSC
+
+    name = _output_name(ip)
+    output = primary.parent().op(name)
+    if output is None:
+        try:
+            output = primary.parent().copy(primary, name=name)
+            output.nodeY = primary.nodeY - 150 * len(primary.parent().findChildren(name="oscout_*"))
+        except Exception as exc:
+            print(f"{_LOG_PREFIX} ERROR creating {name}: {exc}")
+            return None
+        print(f"{_LOG_PREFIX} created {output.path} for {ip}")
+    if output.par.address.eval() != ip:
+        output.par.address = ip
+    return output.sendOSC
+
+
+def tcp_output_factory(spec: str) -> Optional[SendFunc]:
+    """Started TcpTransport for ``tcp://host[:port]``."""
+    host, _, port = spec[len(TCP_PREFIX):].strip("/").partition(":")
+    if not host:
+        return None
+    try:
+        transport = TcpTransport(host, int(port) if port else DEFAULT_TCP_PORT)
+    except ValueError:
+        print(f"{_LOG_PREFIX} ERROR: invalid TCP destination {spec}")
+        return None
+    return transport.start()
+
+
+def default_output_factory(ip: str) -> Optional[SendFunc]:
+    if ip.startswith(TCP_PREFIX):
+        return tcp_output_factory(ip)
+    return td_output_factory(ip)
+
+
+_shared: Optional[OutputPool] = None
+
+
+def get_pool() -> OutputPool:
+    """Process-wide pool shared by every module that sends to Eos."""
+    global _shared
+    if _shared is None:
+        _shared = OutputPool()
+    return _shared
+
+
+__all__ = [
+    "Destination",
+    "OutputPool",
+    "PRIMARY_IP",
+    "cache_key",
+    "default_output_factory",
+    "get_pool",
+    "split_ips",
+    "tcp_output_factory",
+    "td_output_factory",
+]
@@ -0,0 +1,194 @@
+"""Segment-trie OSC address router with typed captures.
+
+Routes are registered with a pattern per address segment::
+
+    router.add("/eos/out/get/{typ:ip|fp|cp|bp}/{num:int}/list/{idx:int}/{:int}", on_list)
+
+- ``name``        literal segment
+- ``{name}``      any segment, captured as ``str``
+- ``{name:int}``  decimal digits, captured as ``int``
+- ``{name:a|b}``  one of the listed words, captured as ``str``
+- ``{:type}``     checked like above but not passed to the handler
+
+``dispatch()`` splits the address once and walks the trie: literal and
+choice segments are one dict lookup each, typed captures are only tried
+when no literal matches. Handlers are called as
+``handler(args, *captures)`` (captures in pattern order). Every route counts
+its hits; unmatched addresses are counted instead of printed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+Handler = Callable[..., object]
+
+
+def _as_int(segment: str) -> Optional[int]:
+    if segment.isdigit() and segment.isascii():
+        return int(segment)
+    return None
+
+
+def _as_str(segment: str) -> Optional[str]:
+    return segment if segment else None
+
+
+_CONVERTERS: Dict[str, Callable[[str], object]] = {"int": _as_int, "str": _as_str}
+
+
+@dataclass
+class Route:
+    pattern: str
+    handler: Handler
+    name: str
+    hits: int = 0
+
+
+@dataclass
+class _Node:
+    literal: Dict[str, "_Node"] = field(default_factory=dict)
+    # segment -> (capture?, child) for {name:a|b} choices
+    choice: Dict[str, Tuple[bool, "_Node"]] = field(default_factory=dict)
+    # (kind, capture?, child), tried in registration order
+    params: List[Tuple[str, bool, "_Node"]] = field(default_factory=list)
+    route: Optional[Route] = None
+
+
+def _split(address: str) -> Optional[List[str]]:
+    if not address.startswith("/"):
+        return None
+    return address[1:].split("/")
+
+
+class OscRouter:
+    """Dispatch OSC messages to handlers by address pattern."""
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self.routes: List[Route] = []
+        self.unmatched = 0
+        self.last_unmatched = ""
+
+    # ------------------------------------------------------------------
+    def add(self, pattern: str, handler: Handler, name: Optional[str] = None) -> Route:
+        segments = _split(pattern)
+        if segments is None:
+            raise ValueError(f"OSC pattern must start with '/': {pattern!r}")
+        node = self._root
+        for segment in segments:
+            node = self._add_segment(node, segment, pattern)
+        if node.route is not None:
+            raise ValueError(f"duplicate OSC route {pattern!r} (already {node.route.pattern!r})")
+        route = Route(pattern, handler, name or pattern)
+        node.route = route
+        self.routes.append(route)
+        return route
+
+    def route(self, pattern: str, name: Optional[str] = None) -> Callable[[Handler], Handler]:
+        """Decorator form of ``add()``."""
+        def register(handler: Handler) -> Handler:
+            self.add(pattern, handler, name)
+            return handler
+        return register
+
+    @staticmethod
+    def _add_segment(node: _Node, segment: str, pattern: str) -> _Node:
+        if not (segment.startswith("{") and segment.endswith("}")):
+            return node.literal.setdefault(segment, _Node())
+        name, _, kind = segment[1:-1].partition(":")
+        capture = bool(name)
+        kind = kind or "str"
+        if "|" in kind or kind not in _CONVERTERS:
+            words = kind.split("|")
+            child = None
+            for word in words:
+                existing = node.choice.get(word)
+                if existing is not None:
+                    if existing[0] != capture or (child is not None and existing[1] is not child):
+                        raise ValueError(f"conflicting choice {segment!r} in {pattern!r}")
+                    child = existing[1]
+            child = child or _Node()
+            for word in words:
+                node.choice[word] = (capture, child)
+            return child
+        for existing_kind, existing_capture, child in node.params:
+            if existing_kind == kind and existing_capture == capture:
+                return child
+        child = _Node()
+        node.params.append((kind, capture, child))
+        return child
+
+    # ------------------------------------------------------------------
+    def match(self, address: str) -> Optional[Tuple[Route, List[object]]]:
+        """Route and captured values for ``address`` (None if no route matches)."""
+        segments = _split(address)
+        if segments is None:
+            return None
+        captures: List[object] = []
+        route = self._walk(self._root, segments, 0, captures)
+        return (route, captures) if route is not None else None
+
+    def _walk(self, node: _Node, segments: List[str], pos: int, captures: List[object]) -> Optional[Route]:
+        if pos == len(segments):
+            return node.route
+        segment = segments[pos]
+        child = node.literal.get(segment)
+        if child is not None:
+            route = self._walk(child, segments, pos + 1, captures)
+            if route is not None:
+                return route
+        chosen = node.choice.get(segment)
+        if chosen is not None:
+            capture, child = chosen
+            if capture:
+                captures.append(segment)
+            route = self._walk(child, segments, pos + 1, captures)
+            if route is not None:
+                return route
+            if capture:
+                captures.pop()
+        for kind, capture, child in node.params:
+            value = _CONVERTERS[kind](segment)
+            if value is None:
+                continue
+            if capture:
+                captures.append(value)
+            route = self._walk(child, segments, pos + 1, captures)
+            if route is not None:
+                return route
+            if capture:
+                captures.pop()
+        return None
+
+    def dispatch(self, address: str, args: Sequence[object] = ()) -> bool:
+        """Call the handler for ``address``; False (and counted) if none matches."""
+        found = self.match(address)
+        if found is None:
+            self.unmatched += 1
+            self.last_unmatched = address
+            return False
+        route, captures = found
+        route.hits += 1
+        route.handler(args, *captures)
+        return True
+
+    # ------------------------------------------------------------------
+    def report(self) -> Dict[str, int]:
+        """Hits per route name plus ``"<unmatched>"``."""
+        counts = {route.name: route.hits for route in self.routes}
+        counts["<unmatched>"] = self.unmatched
+        return counts
+
+    def reset_stats(self) -> None:
+        for route in self.routes:
+            route.hits = 0
+        self.unmatched = 0
+        self.last_unmatched = ""
+
+
+__all__ = [
+    "OscRouter",
+    "Route",
+]
@@ -0,0 +1,65 @@
+"""SLIP framing (RFC 1055) for OSC 1.1 over TCP as used by Eos.
+
+Every packet is sent as ``END <escaped bytes> END``; the leading END lets the
+receiver resynchronise after a broken write. ``SlipDecoder`` is incremental:
+feed it whatever ``recv()`` returned and it yields the completed packets.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+END = b"\xc0"
+ESC = b"\xdb"
+ESC_END = b"\xdb\xdc"
+ESC_ESC = b"\xdb\xdd"
+
+
+def encode(packet: bytes) -> bytes:
+    """Frame one packet."""
+    if ESC in packet:
+        packet = packet.replace(ESC, ESC_ESC)
+    if END in packet:
+        packet = packet.replace(END, ESC_END)
+    return END + packet + END
+
+
+def encode_many(packets) -> bytes:
+    """Frame several packets into one buffer (one ``send`` call)."""
+    return b"".join(encode(packet) for packet in packets)
+
+
+def _unescape(frame: bytes) -> bytes:
+    if ESC not in frame:
+        return frame
+    return frame.replace(ESC_END, END).replace(ESC_ESC, ESC)
+
+
+class SlipDecoder:
+    """Reassemble SLIP frames from an arbitrary split byte stream."""
+
+    def __init__(self) -> None:
+        self._partial = b""
+
+    @property
+    def buffered(self) -> int:
+        return len(self._partial)
+
+    def reset(self) -> None:
+        self._partial = b""
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Add received bytes; return the packets completed by them."""
+        if END not in data:
+            self._partial += data
+            return []
+        parts = (self._partial + data).split(END)
+        self._partial = parts.pop()  # bytes after the last END (incomplete)
+        return [_unescape(part) for part in parts if part]
+
+
+__all__ = [
+    "SlipDecoder",
+    "encode",
+    "encode_many",
+]
@@ -0,0 +1,240 @@
+"""OSC over TCP (SLIP framing, OSC 1.1) to an Eos console.
+
+UDP through an OSC Out DAT loses packets under load (palette sync, fader
+floods), which shows up as pump retries and missed levels. ``TcpTransport``
+keeps one persistent connection instead:
+
+- ``send()`` only queues; ``flush()`` writes everything queued in a frame
+  with a single ``sendall`` (``send_batch`` does both for the output pool)
+- a receive thread connects/reconnects and parses SLIP replies
+  incrementally; decoded messages are handed to ``on_message`` (receive
+  thread) or collected for ``poll()`` on the main thread (TouchDesigner:
+  ``OutputPool.poll()`` from tick_exec). The inbox keeps the newest
+  ``INBOX_LIMIT`` messages when nobody polls.
+
+Messages queued while the console is unreachable are dropped and counted;
+continuous values are sent again by their owners, palette requests are
+retried by the pump.
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional, Sequence, Tuple
+
+from . import slip
+from .codec import Message, OscDecodeError, encode_message, iter_messages
+
+_LOG_PREFIX = "[eos_osc.tcp]"
+
+# Eos: Setup > System > Show Control > OSC > "OSC TCP Format: OSC 1.1 (SLIP)"
+DEFAULT_TCP_PORT = 3032
+CONNECT_TIMEOUT_S = 2.0
+SEND_TIMEOUT_S = 0.5
+RECONNECT_INTERVAL_S = 2.0
+RECV_SIZE = 65536
+INBOX_LIMIT = 4096    # unpolled replies kept; older ones are dropped
+
+MessageCallback = Callable[[str, List[object]], None]
+
+
+# ----------------------------------------------------------------------
+# Transport
+# ----------------------------------------------------------------------
+@dataclass
+class TcpStats:
+    sent: int = 0        # messages written
+    writes: int = 0      # sendall() calls
+    bytes_sent: int = 0
+    received: int = 0
+    dropped: int = 0     # queued while disconnected / lost in a failed write
+    inbox_dropped: int = 0  # replies pushed out of a full inbox (not polled)
+    connects: int = 0
+
+
+class TcpTransport:
+    """Persistent SLIP-framed OSC connection to one console."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = DEFAULT_TCP_PORT,
+        *,
+        on_message: Optional[MessageCallback] = None,
+        connect_timeout: float = CONNECT_TIMEOUT_S,
+        send_timeout: float = SEND_TIMEOUT_S,
+        reconnect_interval: float = RECONNECT_INTERVAL_S,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.on_message = on_message
+        self.connect_timeout = connect_timeout
+        self.send_timeout = send_timeout
+        self.reconnect_interval = reconnect_interval
+        self.stats = TcpStats()
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._out: List[bytes] = []
+        # deque append/popleft are atomic: filled by the receive thread,
+        # drained by poll() on the main thread
+        self._inbox: Deque[Message] = deque(maxlen=INBOX_LIMIT)
+        self._decoder = slip.SlipDecoder()
+        self._stop = threading.Event()
+        self._connected = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __repr__(self) -> str:
+        state = "connected" if self.connected else "disconnected"
+        return f"TcpTransport({self.host}:{self.port}, {state})"
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    # ------------------------------------------------------------------
+    def start(self) -> "TcpTransport":
+        """Start the connect/receive thread (idempotent)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name=f"eos-tcp-{self.host}:{self.port}", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        return self._connected.wait(timeout)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._disconnect()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Sending (main thread)
+    # ------------------------------------------------------------------
+    def send(self, address: str, values: Sequence[object] = ()) -> bool:
+        """Queue one message for the next ``flush()``."""
+        self._out.append(slip.encode(encode_message(address, values)))
+        return True
+
+    __call__ = send
+
+    def send_batch(self, messages: Sequence[Tuple[str, Sequence[object]]]) -> int:
+        """Queue and write several messages in one ``sendall``; returns count sent."""
+        for address, values in messages:
+            self._out.append(slip.encode(encode_message(address, values)))
+        return self.flush()
+
+    def flush(self) -> int:
+        """Write all queued messages with one ``sendall``; returns count sent."""
+        if not self._out:
+            return 0
+        frames, self._out = self._out, []
+        sock = self._sock
+        if sock is None or not self.connected:
+            self.stats.dropped += len(frames)
+            return 0
+        data = b"".join(frames)
+        try:
+            with self._lock:
+                sock.sendall(data)
+        except OSError as exc:
+            print(f"{_LOG_PREFIX} write to {self.host}:{self.port} failed: {exc}")
+            self.stats.dropped += len(frames)
+            self._disconnect()
+            return 0
+        self.stats.sent += len(frames)
+        self.stats.writes += 1
+        self.stats.bytes_sent += len(data)
+        return len(frames)
+
+    # ------------------------------------------------------------------
+    # Receiving
+    # ------------------------------------------------------------------
+    def poll(self, limit: Optional[int] = None) -> List[Message]:
+        """Return replies received since the last call (main thread)."""
+        messages: List[Message] = []
+        while limit is None or len(messages) < limit:
+            try:
+                messages.append(self._inbox.popleft())
+            except IndexError:
+                break
+        return messages
+
+    def _deliver(self, packets: Sequence[bytes]) -> None:
+        for packet in packets:
+            try:
+                messages = list(iter_messages(packet))
+            except OscDecodeError as exc:
+                print(f"{_LOG_PREFIX} dropped malformed packet from {self.host}: {exc}")
+                continue
+            for message in messages:
+                self.stats.received += 1
+                if self.on_message is not None:
+                    try:
+                        self.on_message(*message)
+                    except Exception as exc:
+                        print(f"{_LOG_PREFIX} on_message error for {message.address}: {exc}")
+                else:
+                    if len(self._inbox) == self._inbox.maxlen:
+                        self.stats.inbox_dropped += 1
+                    self._inbox.append(message)
+
+    def _connect(self) -> bool:
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+        except OSError:
+            return False
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(self.send_timeout)
+        self._decoder.reset()
+        self._sock = sock
+        self.stats.connects += 1
+        self._connected.set()
+        print(f"{_LOG_PREFIX} connected to {self.host}:{self.port}")
+        return True
+
+    def _disconnect(self) -> None:
+        self._connected.clear()
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._sock is None and not self._connect():
+                self._stop.wait(self.reconnect_interval)
+                continue
+            sock = self._sock
+            if sock is None:
+                continue
+            try:
+                data = sock.recv(RECV_SIZE)
+            except socket.timeout:
+                continue
+            except OSError:
+                data = b""
+            if not data:
+                if not self._stop.is_set():
+                    print(f"{_LOG_PREFIX} connection to {self.host}:{self.port} lost")
+                self._disconnect()
+                continue
+            self._deliver(self._decoder.feed(data))
+
+
+__all__ = [
+    "DEFAULT_TCP_PORT",
+    "INBOX_LIMIT",
+    "TcpStats",
+    "TcpTransport",
+]
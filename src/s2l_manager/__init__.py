@@ -1,3 +1,3 @@
 """Helper exports for the S2L manager package."""
 
-from .dispatcher import update_from_dmx  # noqa: F401
+from .dispatcher import ChangeEvent, subscribe, unsubscribe, update_from_dmx  # noqa: F401
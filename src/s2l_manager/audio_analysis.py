@@ -0,0 +1,256 @@
+"""
+Streaming audio analysis for the S2L audio mapper (no audio device needed).
+
+Blocks of PCM samples go in, per hop one analysis frame comes out:
+
+    PCM → Hann window → rfft → power spectrum
+        → band levels (low/mid/high and per-instance LowCut_Hz..HighCut_Hz)
+        → spectral flux onsets (kick/snare)
+
+Band levels are in dB relative to a full-scale sine, mapped to 0..1 over
+DYNAMIC_RANGE_DB. All work buffers are allocated once; one transform per hop
+serves every instance range. ``read_wav``/``iter_wav_blocks`` feed recorded
+files through the same path (stdlib ``wave``, PCM 8/16/24/32 bit).
+"""
+
+from __future__ import annotations
+from typing import Callable, Iterator, Optional, Sequence, Tuple
+import wave
+
+import numpy as np
+
+# Output channels (same names as the audio_analysis CHOP)
+CHANNELS = ('low', 'mid', 'high', 'kick', 'snare')
+
+# Fixed spectral bands for low/mid/high (Hz)
+BAND_LIMITS_HZ = {
+    'low': (20.0, 250.0),
+    'mid': (250.0, 4000.0),
+    'high': (4000.0, 20000.0),
+}
+
+# Spectral flux bands for the onset detectors (Hz)
+ONSET_BANDS_HZ = {
+    'kick': (40.0, 150.0),
+    'snare': (1000.0, 5000.0),
+}
+
+DEFAULT_FFT_SIZE = 2048
+DEFAULT_HOP_SIZE = 512
+
+# Level 0.0 is this many dB below a full-scale sine, 1.0 is full scale
+DYNAMIC_RANGE_DB = 60.0
+
+# Onset detection
+LOG_COMPRESSION = 100.0      # log(1 + C * magnitude) before the flux
+ONSET_THRESHOLD_RATIO = 1.5  # flux must exceed the running mean by this factor...
+ONSET_THRESHOLD_DELTA = 0.25  # ...plus this offset
+ONSET_MEAN_TIME_S = 0.5      # time constant of the running flux mean
+MIN_ONSET_INTERVAL_S = 0.1   # refractory time between two onsets of one band
+ONSET_DECAY_S = 0.15         # kick/snare output decays from 1.0 with this time constant
+
+_EPSILON = 1e-12
+
+FrameCallback = Callable[['BandAnalyzer'], None]
+
+
+class BandAnalyzer:
+    """Windowed FFT band energies and spectral flux onsets for streamed PCM.
+
+    ``feed()`` accepts any block length; a frame is analysed every
+    ``hop_size`` samples over the last ``fft_size`` samples. After each frame:
+
+    - ``channels``: levels 0..1 in CHANNELS order
+    - ``range_levels``: levels 0..1 for the ranges given to ``set_ranges()``
+    - ``onsets``/``onset_strength``: per onset band (kick, snare)
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        fft_size: int = DEFAULT_FFT_SIZE,
+        hop_size: int = DEFAULT_HOP_SIZE,
+        on_frame: Optional[FrameCallback] = None,
+    ) -> None:
+        if hop_size <= 0 or hop_size > fft_size:
+            raise ValueError(f"hop_size must be in 1..{fft_size} (is {hop_size})")
+        self.sample_rate = float(sample_rate)
+        self.fft_size = fft_size
+        self.hop_size = hop_size
+        self.on_frame = on_frame
+        self.frame_time = hop_size / self.sample_rate
+
+        num_bins = fft_size // 2 + 1
+        self._freqs = np.fft.rfftfreq(fft_size, 1.0 / self.sample_rate)
+        self._window = np.hanning(fft_size)
+        # mean square of the windowed signal from the one-sided power spectrum
+        self._power_scale = 2.0 / (fft_size * float(np.sum(self._window ** 2)))
+        # magnitude of a full-scale sine → 1.0, then log compression
+        self._log_scale = LOG_COMPRESSION * 2.0 / float(np.sum(self._window))
+        self._buffer = np.zeros(fft_size)
+        self._frame = np.zeros(fft_size)
+        self._spectrum = np.zeros(num_bins, dtype=np.complex128)
+        self._mag = np.zeros(num_bins)
+        self._power = np.zeros(num_bins)
+        self._cumsum = np.zeros(num_bins + 1)
+        self._log_mag = np.zeros(num_bins)
+        self._prev_log_mag = np.zeros(num_bins)
+        self._flux_bins = np.zeros(num_bins)
+        self._pending = 0
+        self._since_reset = 0
+
+        self._channel_lo, self._channel_hi = self._bins_for(
+            [BAND_LIMITS_HZ[name] for name in CHANNELS[:3]]
+        )
+        self._onset_lo, self._onset_hi = self._bins_for(list(ONSET_BANDS_HZ.values()))
+        self._onset_width = np.maximum(self._onset_hi - self._onset_lo, 1)
+        self._range_lo = np.zeros(0, dtype=np.intp)
+        self._range_hi = np.zeros(0, dtype=np.intp)
+
+        self.channels = np.zeros(len(CHANNELS))
+        self.range_levels = np.zeros(0)
+        num_onset = len(ONSET_BANDS_HZ)
+        self.onsets = np.zeros(num_onset, dtype=bool)
+        self.onset_strength = np.zeros(num_onset)
+        self._flux_mean = np.zeros(num_onset)
+        self._since_onset = np.full(num_onset, np.inf)
+        self._mean_alpha = -np.expm1(-self.frame_time / ONSET_MEAN_TIME_S)
+        self._decay = float(np.exp(-self.frame_time / ONSET_DECAY_S))
+        # no onsets until the window holds real samples (startup/reset)
+        self._warmup_frames = -(-fft_size // hop_size)
+        self.frames = 0
+
+    def _bins_for(self, ranges: Sequence[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Map (low_hz, high_hz) ranges to [lo, hi) bin slices into the cumsum."""
+        if not ranges:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        bounds = np.asarray(ranges, dtype=np.float64).reshape(-1, 2)
+        lo = np.searchsorted(self._freqs, bounds[:, 0], side='left')
+        hi = np.searchsorted(self._freqs, bounds[:, 1], side='right')
+        return lo.astype(np.intp), np.maximum(hi, lo).astype(np.intp)
+
+    def set_ranges(self, ranges: Sequence[Tuple[float, float]]) -> None:
+        """Set the (low_hz, high_hz) ranges reported in ``range_levels``."""
+        self._range_lo, self._range_hi = self._bins_for(ranges)
+        self.range_levels = np.zeros(len(self._range_lo))
+
+    def reset(self) -> None:
+        for arr in (self._buffer, self._prev_log_mag, self._flux_mean, self.channels,
+                    self.range_levels, self.onset_strength):
+            arr.fill(0.0)
+        self.onsets.fill(False)
+        self._since_onset.fill(np.inf)
+        self._pending = 0
+        self._since_reset = 0
+
+    def channel(self, name: str) -> float:
+        return float(self.channels[CHANNELS.index(name)])
+
+    def feed(self, samples) -> int:
+        """Append PCM samples and analyse every completed hop; returns frame count.
+
+        ``samples`` is 1-D, or 2-D as (channels, samples) like a CHOP's
+        ``numpyArray()``; multi-channel input is mixed down to mono.
+        """
+        data = np.asarray(samples, dtype=np.float64)
+        if data.ndim > 1:
+            data = data.mean(axis=0)
+        frames = 0
+        pos = 0
+        total = len(data)
+        while pos < total:
+            take = min(self.hop_size - self._pending, total - pos)
+            # shift the analysis window and append the new samples
+            self._buffer[:-take] = self._buffer[take:]
+            self._buffer[-take:] = data[pos:pos + take]
+            self._pending += take
+            pos += take
+            if self._pending == self.hop_size:
+                self._pending = 0
+                self._analyse()
+                frames += 1
+                if self.on_frame is not None:
+                    self.on_frame(self)
+        return frames
+
+    def _levels(self, lo: np.ndarray, hi: np.ndarray, out: np.ndarray) -> None:
+        np.subtract(self._cumsum[hi], self._cumsum[lo], out=out)
+        out *= self._power_scale * 2.0  # full-scale sine has mean square 0.5
+        np.maximum(out, _EPSILON, out=out)
+        np.log10(out, out=out)
+        out *= 10.0 / DYNAMIC_RANGE_DB
+        out += 1.0
+        np.clip(out, 0.0, 1.0, out=out)
+
+    def _analyse(self) -> None:
+        np.multiply(self._buffer, self._window, out=self._frame)
+        np.fft.rfft(self._frame, out=self._spectrum)  # out= needs numpy >= 2.0
+        np.abs(self._spectrum, out=self._mag)
+        np.square(self._mag, out=self._power)
+        np.cumsum(self._power, out=self._cumsum[1:])
+
+        self._levels(self._channel_lo, self._channel_hi, self.channels[:3])
+        if len(self._range_lo):
+            self._levels(self._range_lo, self._range_hi, self.range_levels)
+
+        # Spectral flux: half-wave rectified rise of the log magnitude
+        np.multiply(self._mag, self._log_scale, out=self._log_mag)
+        np.log1p(self._log_mag, out=self._log_mag)
+        np.subtract(self._log_mag, self._prev_log_mag, out=self._flux_bins)
+        np.maximum(self._flux_bins, 0.0, out=self._flux_bins)
+        self._prev_log_mag[:] = self._log_mag
+        np.cumsum(self._flux_bins, out=self._cumsum[1:])
+        flux = (self._cumsum[self._onset_hi] - self._cumsum[self._onset_lo]) / self._onset_width
+
+        threshold = self._flux_mean * ONSET_THRESHOLD_RATIO + ONSET_THRESHOLD_DELTA
+        self._since_onset += self.frame_time
+        self.onsets[:] = (flux > threshold) & (self._since_onset >= MIN_ONSET_INTERVAL_S)
+        if self._since_reset < self._warmup_frames:
+            self.onsets.fill(False)
+        self._since_reset += 1
+        self._since_onset[self.onsets] = 0.0
+        self._flux_mean += self._mean_alpha * (flux - self._flux_mean)
+        self.onset_strength[:] = flux
+
+        envelopes = self.channels[3:]
+        envelopes *= self._decay
+        envelopes[self.onsets] = 1.0
+        self.frames += 1
+
+
+def _pcm_to_float(raw: bytes, sample_width: int) -> np.ndarray:
+    if sample_width == 1:
+        return (np.frombuffer(raw, dtype=np.uint8).astype(np.float64) - 128.0) / 128.0
+    if sample_width == 2:
+        return np.frombuffer(raw, dtype='<i2') / 32768.0
+    if sample_width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        ints = np.where(ints >= 1 << 23, ints - (1 << 24), ints)
+        return ints / float(1 << 23)
+    if sample_width == 4:
+        return np.frombuffer(raw, dtype='<i4') / float(1 << 31)
+    raise ValueError(f"Unsupported WAV sample width: {sample_width} bytes")
+
+
+def iter_wav_blocks(path, block_size: int = DEFAULT_HOP_SIZE) -> Iterator[Tuple[np.ndarray, int]]:
+    """Yield (mono float block, sample_rate) from a PCM WAV file."""
+    with wave.open(str(path), 'rb') as wav:
+        rate = wav.getframerate()
+        num_channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        while True:
+            raw = wav.readframes(block_size)
+            if not raw:
+                return
+            block = _pcm_to_float(raw, width).reshape(-1, num_channels).mean(axis=1)
+            yield block, rate
+
+
+def read_wav(path) -> Tuple[np.ndarray, int]:
+    """Return (mono float samples in -1..1, sample_rate) of a PCM WAV file."""
+    with wave.open(str(path), 'rb') as wav:
+        rate = wav.getframerate()
+        num_channels = wav.getnchannels()
+        samples = _pcm_to_float(wav.readframes(wav.getnframes()), wav.getsampwidth())
+    return samples.reshape(-1, num_channels).mean(axis=1), rate
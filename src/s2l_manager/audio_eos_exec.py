@@ -3,10 +3,11 @@ Execute script for audio-to-Eos mapping.
 Place this on an Execute DAT and set it to run on Frame Start.
 
 This script is called every frame and:
-1. Updates DMX values from Eos to values table
-2. Rebuilds audio_params_table from values
-3. Processes audio analysis with S2L parameters
+1. Makes sure the shared DMX snapshot for this frame exists (values table)
+2. Routes every S2L instance's audio band to its own decoded Submaster
+3. Processes audio analysis with each instance's S2L parameters
 4. Sends OSC to Eos submasters
+5. Fires cue GOs on beats/bars for instances in Mode 1001+ or FX_Auto = 1
 """
 
 import sys
@@ -33,42 +34,45 @@ if 'C:/_DEV/TOUCHDESIGNER/src/s2l_manager' not in sys.path:
 
 # Import modules
 import audio_eos_mapper as mapper
-import s2l_unit as s2l
+from audio_analysis import BandAnalyzer
+from audio_routing import AudioRouter
+from beat_clock import BeatClock, BeatCueScheduler
+# DMX snapshots come from the shared service in io/sacn_dispatch, which also
+# feeds the dispatcher. Asking for a frame that frame_tick already handled is free.
+import sacn_dispatch
 
-# DMX Update Configuration
-DMX_CHOP_PATH = "/project1/io/EOS_Universe_016"
 DISPATCHER_DAT_PATH = "/project1/src/s2l_manager/dispatcher"
-DMX_UNIVERSE = 16
 
-# Cache for DMX processing
-_dmx_instances_cache = None
-_dmx_defaults_cache = None
 _last_dmx_update_frame = -100  # Update DMX every N frames
+_params_subscribed = False
 
-# Configuration: Map audio channels to Eos submaster numbers
-# Adjust these submaster numbers to match your Eos show
-# IMPORTANT: Channel names must EXACTLY match your audio_analysis CHOP!
-SUBMASTER_MAPPING = {
-    'low': 11,              # Bass frequencies → Submaster 11
-    'mid': 12,              # Mid frequencies → Submaster 12
-    'high': 13,             # High frequencies → Submaster 13
-    'kick': 14,             # Kick drum → Submaster 14
-    'snare': 15,            # Snare → Submaster 15
-    'rythm': 16,            # Rhythm detection → Submaster 16 (note: 'rythm' not 'rhythm')
-    'smsd': 17,             # Spectral Mean Standard Deviation → Submaster 17
-    'fmsd': 18,             # Flux Mean Standard Deviation → Submaster 18
-    'spectralCentroid': 19, # Spectral Centroid → Submaster 19
-}
+# Routing: each instance reads its `band` column from instances.csv
+# (low, mid, high, kick, snare, rythm, smsd, fmsd, spectralCentroid) and
+# drives the Submaster it receives over DMX.
+# IMPORTANT: Band names must EXACTLY match your audio_analysis CHOP!
+_router = None
 
 # Enable/disable mapping
 ENABLE_MAPPING = True
+# Analyse raw PCM from an audio input CHOP instead of reading the
+# audio_analysis CHOP; low/mid/high then honour each instance's LowCut_Hz/HighCut_Hz
+USE_PCM_ANALYSIS = False
+AUDIO_IN_CHOP_PATH = '/project1/s2l_audio/audio_in'
+_analyzer = None
+
+# Beat clock for Mode 1001+ (cue every N bars) and FX_Auto = 1 (cue every beat).
+# Fed with the analyzer's onset strength, or per TD frame with this CHOP channel:
+BEAT_CHANNEL = 'kick'
+CHOP_FRAME_RATE = 60.0
+_beat_clock = None
+_cue_scheduler = None
 # How often to update DMX (every N frames, 1=every frame, 10=every 10 frames)
 DMX_UPDATE_INTERVAL = 5
 
 
 def _update_dmx_values(current_frame):
-    """Update DMX values from Eos to values table."""
-    global _dmx_instances_cache, _dmx_defaults_cache, _last_dmx_update_frame, op
+    """Make sure this frame's DMX snapshot has been published."""
+    global _last_dmx_update_frame
 
     # Only update every N frames to reduce CPU load
     if current_frame - _last_dmx_update_frame < DMX_UPDATE_INTERVAL:
@@ -77,57 +81,37 @@ def _update_dmx_values(current_frame):
     _last_dmx_update_frame = current_frame
 
     try:
-        # Get DMX CHOP
-        dmx_chop = op(DMX_CHOP_PATH)
-        if not dmx_chop or dmx_chop.numSamples == 0:
-            return
-
-        # Convert CHOP to bytes
-        data = []
-        for channel in dmx_chop.chans():
-            raw = channel[0]
-            value = max(0.0, min(255.0, raw))
-            data.append(int(round(value)))
-
-        # Pad to 512 bytes
-        if len(data) > 512:
-            data = data[-512:]
-        elif len(data) < 512:
-            data.extend([0] * (512 - len(data)))
-
-        payload = bytes(data)
-
-        # Get instances (cached)
-        if _dmx_instances_cache is None:
-            all_instances = s2l.load_instances()
-            _dmx_instances_cache = [
-                inst for inst in all_instances
-                if inst.enabled and inst.universe == DMX_UNIVERSE
-            ]
-
-        if not _dmx_instances_cache:
-            return
-
-        # Decode DMX
-        values = s2l.decode_universe(payload, _dmx_instances_cache, scaling=False)
-
-        # Get defaults (cached)
-        if _dmx_defaults_cache is None:
-            _dmx_defaults_cache = s2l.load_defaults()
-
-        # Get dispatcher and update
-        dispatcher_dat = op(DISPATCHER_DAT_PATH)
-        if dispatcher_dat:
-            update_func = getattr(dispatcher_dat.module, "update_from_dmx", None)
-            if callable(update_func):
-                update_func(DMX_UNIVERSE, values, _dmx_defaults_cache)
-
+        sacn_dispatch.tick(current_frame)
     except Exception as e:
         # Log errors occasionally, not every frame
         if current_frame % 300 == 0:  # Every 5 seconds at 60fps
             print(f"[audio_eos_exec] DMX update error: {e}")
 
 
+def _on_param_changes(events):
+    """Dispatcher subscriber: mark routing table and parameter cache stale."""
+    if _router is not None:
+        _router.on_changes(events)
+    if _cue_scheduler is not None:
+        _cue_scheduler.on_changes(events)
+    for event in events:
+        if event.parameter in mapper.PARAM_COLUMNS:
+            mapper.invalidate_params()
+            return
+
+
+def _ensure_param_subscription():
+    global _params_subscribed, _router, _cue_scheduler
+    if _params_subscribed:
+        return
+    dispatcher_dat = op(DISPATCHER_DAT_PATH)
+    if dispatcher_dat and hasattr(dispatcher_dat.module, "subscribe"):
+        _router = AudioRouter(dispatcher_dat.module)
+        _cue_scheduler = BeatCueScheduler(dispatcher_dat.module)
+        dispatcher_dat.module.subscribe(_on_param_changes)
+        _params_subscribed = True
+
+
 def onFrameStart(frame):
     """Called every frame start - processes audio and sends OSC to Eos."""
     global op
@@ -141,28 +125,33 @@ def onFrameStart(frame):
             return
 
     # STEP 1: Update DMX values from Eos every N frames
-    _update_dmx_values(frame)
+    # absTime.frame (not the timeline frame) is the key frame_tick publishes
+    # under, so the snapshot service dedups the second call in a frame
+    _update_dmx_values(absTime.frame)
+    _ensure_param_subscription()
 
     if not ENABLE_MAPPING:
         return
 
     try:
+        if USE_PCM_ANALYSIS:
+            _process_pcm(frame)
+            return
+
         # STEP 2: Get operators
         audio_analysis = op('/project1/s2l_audio/fixutres/audio_analysis')
-        audio_params = op('/project1/src/s2l_manager/audio_params_table')
 
-        if not audio_analysis or not audio_params:
+        if not audio_analysis or _router is None:
             # Only log once, not every frame
             if frame % 60 == 0:  # Log every 60 frames (~1 second at 60fps)
                 print("[audio_eos_exec] ERROR: Cannot find required operators")
             return
 
-        # STEP 3: Process audio → submasters with S2L parameters
-        mapper.process_audio_to_subs(
-            audio_analysis,
-            audio_params,
-            SUBMASTER_MAPPING
-        )
+        # STEP 3: Process audio → each instance's submaster with its S2L parameters
+        _router.process(audio_analysis)
+
+        # STEP 4: Beat clock → cue GOs for beat/bar modes
+        _update_beat_clock(audio_analysis)
 
     except Exception as e:
         # Only log errors occasionally to avoid spam
@@ -170,6 +159,43 @@ def onFrameStart(frame):
             print(f"[audio_eos_exec] ERROR in onFrameStart: {e}")
 
 
+def _process_pcm(frame):
+    """Feed this frame's samples of the audio input CHOP through the analyzer."""
+    global _analyzer
+    audio_in = op(AUDIO_IN_CHOP_PATH)
+    if not audio_in or _router is None:
+        if frame % 60 == 0:
+            print(f"[audio_eos_exec] ERROR: Cannot find {AUDIO_IN_CHOP_PATH}")
+        return
+    if _analyzer is None or _analyzer.sample_rate != float(audio_in.rate):
+        _analyzer = BandAnalyzer(audio_in.rate, on_frame=_on_analysis_frame)
+    _analyzer.feed(audio_in.numpyArray())
+    _router.process_analysis(_analyzer)
+
+
+def _on_analysis_frame(analyzer):
+    """BandAnalyzer callback: one beat clock step per analysis hop."""
+    global _beat_clock
+    if _cue_scheduler is None:
+        return
+    frame_rate = 1.0 / analyzer.frame_time
+    if _beat_clock is None or _beat_clock.frame_rate != frame_rate:
+        _beat_clock = BeatClock(frame_rate, on_beat=_cue_scheduler.on_beat)
+    _beat_clock.update(float(analyzer.onset_strength.sum()), bool(analyzer.onsets.any()))
+
+
+def _update_beat_clock(audio_analysis):
+    """One beat clock step per TD frame from the audio_analysis CHOP."""
+    global _beat_clock
+    if _cue_scheduler is None:
+        return
+    if _beat_clock is None or _beat_clock.frame_rate != CHOP_FRAME_RATE:
+        _beat_clock = BeatClock(CHOP_FRAME_RATE, on_beat=_cue_scheduler.on_beat)
+    value = mapper._get_audio_value(audio_analysis, BEAT_CHANNEL)
+    if value is not None:
+        _beat_clock.update(value)
+
+
 # Alternative: Process on cook (DAT changes)
 def onTableChange(dat):
     """Called when audio_params_table changes - can trigger immediate update."""
@@ -234,15 +260,29 @@ def test_all_mappings():
             return
 
     audio_analysis = op('/project1/s2l_audio/fixutres/audio_analysis')
-    audio_params = op('/project1/src/s2l_manager/audio_params_table')
+    _ensure_param_subscription()
 
-    if not audio_analysis or not audio_params:
+    if not audio_analysis or _router is None:
         print("[test] ERROR: Cannot find operators")
         return
 
-    mapper.process_audio_to_subs(
-        audio_analysis,
-        audio_params,
-        SUBMASTER_MAPPING
-    )
-    print(f"[test] Processed {len(SUBMASTER_MAPPING)} mappings")
+    _router.process(audio_analysis)
+    for route in _router.routes:
+        print(f"[test] {route.instance}: {route.band} → Sub {route.submaster}")
+    print(f"[test] Processed {len(_router.routes)} routes")
+
+
+def print_output_stats(reset=False):
+    """
+    Print the shared Eos output cache counters (sent / suppressed / rate)
+    and the per-console output pool counters.
+
+    Usage from textport:
+        import audio_eos_exec
+        audio_eos_exec.print_output_stats()
+    """
+    cache = mapper.get_cache()
+    print(f"[audio_eos_exec] Eos output: {cache.report()}")
+    print(f"[audio_eos_exec] Consoles: {mapper.get_pool().report()}")
+    if reset:
+        cache.reset_stats()
@@ -4,95 +4,67 @@ Maps audio analysis values to Eos Submaster commands using S2L parameters.
 
 Flow:
     audio_analysis CHOP → apply S2L parameters → generate OSC commands → Eos
+
+All mapped channels are processed together: one CHOP read into a float
+array, gain/threshold/clamp as array operations, one level vector out.
 """
 
 from __future__ import annotations
-from typing import Dict, Optional
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
 import time
 
+import numpy as np
+
+from audio_smoothing import SmoothingBank
+
 _LOG_PREFIX = "[audio_eos_mapper]"
-print(f"{_LOG_PREFIX} module loaded")
 
-# Import TouchDesigner's 'op' function
 try:
-    import __main__
-    op = __main__.op
-except:
-    try:
-        op = globals()['op']
-    except:
-        op = None
+    from eos_osc import cache_key, get_cache, get_pool
+except ImportError:  # src/ not on sys.path (bootstrap not run)
+    cache_key = get_cache = get_pool = None
+    print(f"{_LOG_PREFIX} WARNING: eos_osc not importable, OSC output disabled")
 
-# OSC output operator
-_OSCOUT = None  # Will be set to op('/project1/io/oscout1')
+print(f"{_LOG_PREFIX} module loaded")
 
-# State tracking for level changes
-_last_levels: Dict[str, float] = {}
-_last_send_time: Dict[str, float] = {}
+# OSC goes out through eos_osc's output pool: one OSC Out DAT per console
+# (oscout1 for the main console), queues flushed once per frame in tick_exec.
 
 # Performance settings
+# Levels that moved less than this since the last offer are not even handed
+# to the shared output cache (eos_osc), which applies deadband and send
+# interval per OSC address for every module that talks to Eos.
 MIN_LEVEL_CHANGE = 0.01  # Minimum change to trigger OSC send (1%)
-MIN_SEND_INTERVAL = 0.05  # Minimum time between sends per sub (50ms)
-
-
-def _get_osc_operator():
-    """Lazy load OSC output operator."""
-    global _OSCOUT, op
-
-    # Ensure op is available
-    if op is None:
-        try:
-            import __main__
-            op = __main__.op
-        except Exception as e:
-            print(f"{_LOG_PREFIX} ERROR: Cannot access 'op': {e}")
-            return None
-
-    if _OSCOUT is None:
-        try:
-            _OSCOUT = op('/project1/io/oscout1')
-        except Exception as e:
-            print(f"{_LOG_PREFIX} ERROR: Cannot find OSC output: {e}")
-    return _OSCOUT
-
-
-def _send_osc(address: str, *args) -> bool:
-    """Send OSC message to Eos."""
-    osc_op = _get_osc_operator()
-    if not osc_op:
-        return False
 
-    try:
-        # TouchDesigner's sendOSC expects a list of values
-        values = list(args) if args else []
-        osc_op.sendOSC(address, values)
-        # Uncomment for debugging:
-        # print(f"{_LOG_PREFIX} OSC → {address} {values}")
-        return True
-    except Exception as e:
-        print(f"{_LOG_PREFIX} ERROR sending OSC {address}: {e}")
-        return False
+# Instance whose parameters apply when a mapping entry names none
+DEFAULT_INSTANCE = 'S2L_UNIT_1'
 
+# Columns of audio_params_table (after the instance column)
+PARAM_COLUMNS = ('Sensitivity', 'Threshold', 'LowCut_Hz', 'HighCut_Hz', 'Lag_ms', 'MinHold_s')
+# Used when an instance has no row (or an empty cell) in audio_params_table
+PARAM_FALLBACKS = {
+    'Sensitivity': 100.0,
+    'Threshold': 0.0,
+    'LowCut_Hz': 20.0,
+    'HighCut_Hz': 8000.0,
+    'Lag_ms': 0.0,
+    'MinHold_s': 0.0,
+}
 
-def _should_send(sub_key: str, new_level: float) -> bool:
-    """
-    Check if we should send an OSC update based on:
-    - Significant level change (>1%)
-    - Minimum time interval between sends
-    """
-    now = time.time()
 
-    # Check level change
-    last_level = _last_levels.get(sub_key, -999)
-    if abs(new_level - last_level) < MIN_LEVEL_CHANGE:
-        return False
+def _send_osc(address: str, *args, eos_ip: Optional[str] = None) -> bool:
+    """Queue an OSC message for the console(s) in ``eos_ip`` (None = main output).
 
-    # Check time interval
-    last_time = _last_send_time.get(sub_key, 0)
-    if (now - last_time) < MIN_SEND_INTERVAL:
+    The per-console queues of the output pool are flushed once per frame
+    (tick_exec).
+    """
+    if get_pool is None:
+        return False
+    try:
+        return get_pool().send(eos_ip, address, list(args))
+    except Exception as e:
+        print(f"{_LOG_PREFIX} ERROR sending OSC {address}: {e}")
         return False
-
-    return True
 
 
 def _apply_s2l_params(
@@ -109,8 +81,8 @@ def _apply_s2l_params(
         raw_value: Audio analysis value (0.0-1.0)
         sensitivity: Gain multiplier (0-100%)
         threshold: Minimum trigger level (0-100%)
-        lag_ms: Smoothing time (0-500ms) - NOT IMPLEMENTED YET
-        min_hold_s: Minimum hold time (0-8s) - NOT IMPLEMENTED YET
+        lag_ms: Smoothing time (0-500ms) - stateful, applied by SmoothingBank
+        min_hold_s: Minimum hold time (0-8s) - stateful, applied by SmoothingBank
 
     Returns:
         Processed value (0.0-1.0)
@@ -129,8 +101,8 @@ def _apply_s2l_params(
     # Clamp to 0-1
     value = max(0.0, min(1.0, value))
 
-    # TODO: Implement lag (smoothing)
-    # TODO: Implement min_hold
+    # Lag and min-hold need state across frames; process_audio_to_subs runs
+    # them through AudioSubProcessor's SmoothingBank.
 
     return value
 
@@ -150,37 +122,43 @@ def _get_instance_params(params_table, instance_name: str) -> Optional[Dict[str,
     """
     Get S2L parameters for a specific instance from audio_params_table.
 
+    Served from the shared parameter cache; the table is only re-read after
+    invalidate_params() or when its row count changes.
+
     Returns dict with keys: Sensitivity, Threshold, LowCut_Hz, HighCut_Hz, Lag_ms, MinHold_s
     """
     try:
-        # Find row for this instance
-        for row in range(1, params_table.numRows):
-            if params_table[row, 0].val == instance_name:
-                return {
-                    'Sensitivity': float(params_table[row, 1].val or 100),
-                    'Threshold': float(params_table[row, 2].val or 0),
-                    'LowCut_Hz': float(params_table[row, 3].val or 20),
-                    'HighCut_Hz': float(params_table[row, 4].val or 8000),
-                    'Lag_ms': float(params_table[row, 5].val or 0),
-                    'MinHold_s': float(params_table[row, 6].val or 0),
-                }
+        _params_cache.refresh(params_table)
     except Exception as e:
         print(f"{_LOG_PREFIX} ERROR getting params for {instance_name}: {e}")
-
-    return None
+        return None
+    params = _params_cache.get(instance_name)
+    return None if params is PARAM_FALLBACKS else params
 
 
-def send_submaster_level(sub_number: int, level: float) -> bool:
+def send_submaster_level(
+    sub_number: int,
+    level: float,
+    now: Optional[float] = None,
+    eos_ip: Optional[str] = None,
+) -> bool:
     """
-    Send 'Sub <n> At <level>' to Eos.
+    Send 'Sub <n> At <level>' to Eos through the shared output cache.
 
     Args:
         sub_number: Submaster number (1-999)
         level: Level as float (0.0-1.0) for Eos
+        now: Optional timestamp (one per frame when sending many subs)
+        eos_ip: Target console(s) from instances.csv (None = main output)
+
+    Returns True when the level went out now; redundant levels are dropped
+    and rate-limited ones are sent by the cache's per-frame flush.
     """
     if not 1 <= sub_number <= 999:
         print(f"{_LOG_PREFIX} ERROR: Invalid submaster number {sub_number}")
         return False
+    if get_cache is None:
+        return False
 
     # Clamp to 0.0-1.0 (Eos expects this range)
     if not 0.0 <= level <= 1.0:
@@ -189,16 +167,20 @@ def send_submaster_level(sub_number: int, level: float) -> bool:
     # Eos OSC format: /eos/sub/<n> <level>
     # Level must be 0.0-1.0 (not percentage!)
     address = f"/eos/sub/{sub_number}"
-    return _send_osc(address, level)
+    # Main console: same cache entry as menu_engine's fader values
+    return get_cache().offer(
+        address, [level], now=now, send=get_pool().sender(eos_ip), key=cache_key(eos_ip, address)
+    )
 
 
-def send_cue_go(cuelist: int, cue: Optional[float] = None) -> bool:
+def send_cue_go(cuelist: int, cue: Optional[float] = None, eos_ip: Optional[str] = None) -> bool:
     """
     Send 'Cue <cuelist> <cue> Go' to Eos.
 
     Args:
         cuelist: Cuelist number
         cue: Optional specific cue number (if None, advances current cue)
+        eos_ip: Target console(s) from instances.csv (None = main output)
     """
     # Eos OSC format: /eos/cue/<cuelist>/fire or /eos/cue/<cuelist>/<cue>/fire
     if cue is not None:
@@ -206,14 +188,217 @@ def send_cue_go(cuelist: int, cue: Optional[float] = None) -> bool:
     else:
         address = f"/eos/cue/{cuelist}/fire"
 
-    return _send_osc(address)
+    return _send_osc(address, eos_ip=eos_ip)
+
+
+def apply_s2l_params_array(
+    raw: np.ndarray,
+    sensitivity: np.ndarray,
+    threshold: np.ndarray,
+) -> np.ndarray:
+    """Vectorized ``_apply_s2l_params`` (gain, threshold rescale, clamp).
+
+    NaN inputs (missing channels) stay NaN so callers can skip them.
+    """
+    value = raw * (sensitivity / 100.0)
+    threshold_norm = threshold / 100.0
+    span = np.maximum(1.0 - threshold_norm, 1e-6)
+    value = np.where(value < threshold_norm, 0.0, (value - threshold_norm) / span)
+    return np.clip(value, 0.0, 1.0)
+
+
+def send_level_changes(
+    subs: np.ndarray,
+    levels: np.ndarray,
+    last_levels: np.ndarray,
+    now: Optional[float] = None,
+    eos_ips: Optional[Sequence[Optional[str]]] = None,
+) -> int:
+    """Offer the submasters whose level moved by MIN_LEVEL_CHANGE to the output cache.
+
+    Levels that reached 0.0 or 1.0 are offered on any change, so a fade
+    always ends exactly there. ``last_levels`` (last offered level per
+    entry) is updated in place.
+    ``eos_ips`` gives the target console per entry (default: main output).
+    Returns the number of levels sent immediately.
+    """
+    moved = np.abs(levels - last_levels)
+    at_end = (levels == 0.0) | (levels == 1.0)
+    due = np.flatnonzero(~np.isnan(levels) & ((moved >= MIN_LEVEL_CHANGE) | (at_end & (moved > 0.0))))
+    if not len(due) or get_cache is None:
+        return 0
+    if now is None:
+        now = get_cache().now()
+    sent = 0
+    for i in due:
+        level = float(levels[i])
+        last_levels[i] = level
+        eos_ip = eos_ips[i] if eos_ips is not None else None
+        if send_submaster_level(int(subs[i]), level, now=now, eos_ip=eos_ip):
+            sent += 1
+    return sent
+
+
+class _ChannelReader:
+    """Read a fixed list of CHOP channels into one array per frame."""
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self.names = tuple(names)
+        self._chop_id = None
+        self._num_chans = -1
+        self._indices = np.zeros(len(self.names), dtype=np.intp)
+        self._present = np.zeros(len(self.names), dtype=bool)
+        self._values = np.full(len(self.names), np.nan, dtype=np.float64)
+
+    def _resolve(self, chop_op) -> None:
+        """Cache channel indices; redone only when the CHOP layout changes."""
+        for i, name in enumerate(self.names):
+            chan = chop_op[name]
+            if chan is None:
+                self._present[i] = False
+                self._indices[i] = 0
+            else:
+                self._present[i] = True
+                self._indices[i] = chan.index
+        missing = [n for n, ok in zip(self.names, self._present) if not ok]
+        if missing:
+            print(f"{_LOG_PREFIX} WARNING channels missing in {chop_op.path}: {missing}")
+        self._chop_id = chop_op.id
+        self._num_chans = chop_op.numChans
+
+    def read(self, chop_op) -> np.ndarray:
+        if chop_op.id != self._chop_id or chop_op.numChans != self._num_chans:
+            self._resolve(chop_op)
+        data = chop_op.numpyArray()
+        if data.size == 0:
+            self._values.fill(np.nan)
+            return self._values
+        # Last sample of every mapped channel in one gather
+        np.copyto(self._values, data[self._indices, -1], casting='unsafe')
+        self._values[~self._present] = np.nan
+        return self._values
+
+
+class _ParamsCache:
+    """Per-instance S2L parameters from audio_params_table, re-read only on change."""
+
+    def __init__(self) -> None:
+        self._params: Dict[str, Dict[str, float]] = {}
+        self._dirty = True
+        self._num_rows = -1
+        self.version = 0
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    def refresh(self, params_table) -> bool:
+        """Reload when invalidated or the row count changed; True if reloaded."""
+        if not self._dirty and params_table.numRows == self._num_rows:
+            return False
+        cols = {params_table[0, c].val: c for c in range(params_table.numCols)} if params_table.numRows else {}
+        params: Dict[str, Dict[str, float]] = {}
+        for row in range(1, params_table.numRows):
+            entry = {}
+            for name in PARAM_COLUMNS:
+                col = cols.get(name)
+                text = params_table[row, col].val if col is not None else ''
+                try:
+                    entry[name] = float(text) if text != '' else PARAM_FALLBACKS[name]
+                except ValueError:
+                    entry[name] = PARAM_FALLBACKS[name]
+            params[params_table[row, 0].val] = entry
+        self._params = params
+        self._num_rows = params_table.numRows
+        self._dirty = False
+        self.version += 1
+        return True
+
+    def get(self, instance_name: str) -> Dict[str, float]:
+        return self._params.get(instance_name, PARAM_FALLBACKS)
+
+
+MappingEntry = Union[int, Tuple[int, str]]
+
+
+class AudioSubProcessor:
+    """Process many (channel, instance) → submaster routes in one pass.
+
+    ``routes`` is a sequence of ``(audio_channel, instance_name, sub_number)``.
+    """
+
+    def __init__(self, routes: Sequence[Tuple[str, str, int]]) -> None:
+        self.routes = tuple(routes)
+        channels = sorted({channel for channel, _, _ in self.routes})
+        self._reader = _ChannelReader(channels)
+        channel_pos = {name: i for i, name in enumerate(channels)}
+        self._route_channel = np.array([channel_pos[c] for c, _, _ in self.routes], dtype=np.intp)
+        self.subs = np.array([sub for _, _, sub in self.routes], dtype=np.int32)
+        n = len(self.routes)
+        self._sensitivity = np.full(n, 100.0)
+        self._threshold = np.zeros(n)
+        self._lag_ms = np.zeros(n)
+        self._min_hold_s = np.zeros(n)
+        self._smoothing = SmoothingBank(n)
+        self._last_step: Optional[float] = None
+        self._params_version = -1
+        self._last_levels = np.full(n, -999.0)
+
+    def _update_params(self, cache: _ParamsCache) -> None:
+        if cache.version == self._params_version:
+            return
+        for i, (_, instance, _) in enumerate(self.routes):
+            params = cache.get(instance)
+            self._sensitivity[i] = params['Sensitivity']
+            self._threshold[i] = params['Threshold']
+            self._lag_ms[i] = params['Lag_ms']
+            self._min_hold_s[i] = params['MinHold_s']
+        self._smoothing.set_params(self._lag_ms, self._min_hold_s)
+        self._params_version = cache.version
+
+    def levels(self, audio_analysis_op, cache: _ParamsCache, now: Optional[float] = None) -> np.ndarray:
+        """Return one smoothed level per route (NaN where the channel is missing)."""
+        self._update_params(cache)
+        raw = self._reader.read(audio_analysis_op)[self._route_channel]
+        target = apply_s2l_params_array(raw, self._sensitivity, self._threshold)
+
+        # Advance Lag_ms / MinHold_s once per frame with the real frame delta
+        now = time.perf_counter() if now is None else now
+        dt = 0.0 if self._last_step is None else now - self._last_step
+        self._last_step = now
+        smoothed = self._smoothing.step(target, dt)
+        return np.where(np.isnan(target), np.nan, smoothed)
+
+    def send_changes(self, levels: np.ndarray, now: Optional[float] = None) -> int:
+        """Offer only routes that moved enough; the output cache rate-limits."""
+        return send_level_changes(self.subs, levels, self._last_levels, now)
+
+
+_params_cache = _ParamsCache()
+_processor: Optional[AudioSubProcessor] = None
+_processor_key: Optional[Tuple] = None
+
+
+def invalidate_params() -> None:
+    """Mark cached instance parameters stale (call on audio_params changes)."""
+    _params_cache.invalidate()
+
+
+def _routes_from_mapping(submaster_mapping: Mapping[str, MappingEntry]) -> List[Tuple[str, str, int]]:
+    routes = []
+    for channel, target in submaster_mapping.items():
+        if isinstance(target, tuple):
+            sub_number, instance = target
+        else:
+            sub_number, instance = target, DEFAULT_INSTANCE
+        routes.append((channel, instance, int(sub_number)))
+    return routes
 
 
 def process_audio_to_subs(
     audio_analysis_op,
     audio_params_table_op,
-    submaster_mapping: Dict[str, int]
-) -> None:
+    submaster_mapping: Mapping[str, MappingEntry]
+) -> Optional[np.ndarray]:
     """
     Main processing function: reads audio analysis, applies S2L params, sends to Eos.
 
@@ -222,6 +407,10 @@ def process_audio_to_subs(
         audio_params_table_op: The audio_params_table DAT operator
         submaster_mapping: Dict mapping audio channels to submaster numbers
                           e.g. {'low': 1, 'mid': 2, 'high': 3, 'kick': 4}
+                          or to (submaster, instance) tuples
+
+    Returns:
+        Level vector (0.0-1.0) in mapping order, NaN for missing channels.
 
     Example:
         process_audio_to_subs(
@@ -230,47 +419,19 @@ def process_audio_to_subs(
             {'low': 1, 'mid': 2, 'high': 3, 'kick': 4, 'snare': 5}
         )
     """
+    global _processor, _processor_key
     if not audio_analysis_op or not audio_params_table_op:
-        return
+        return None
 
-    now = time.time()
-
-    for audio_channel, sub_number in submaster_mapping.items():
-        # Read raw audio value
-        raw_value = _get_audio_value(audio_analysis_op, audio_channel)
-        if raw_value is None:
-            continue
-
-        # Get S2L parameters (use first instance for now - TODO: per-instance mapping)
-        # For now, we'll use S2L_UNIT_1 params for all channels
-        params = _get_instance_params(audio_params_table_op, 'S2L_UNIT_1')
-        if params is None:
-            # Use defaults if no params found
-            params = {
-                'Sensitivity': 100.0,
-                'Threshold': 0.0,
-                'Lag_ms': 0.0,
-                'MinHold_s': 0.0
-            }
-
-        # Apply S2L parameters
-        processed_value = _apply_s2l_params(
-            raw_value,
-            sensitivity=params['Sensitivity'],
-            threshold=params['Threshold'],
-            lag_ms=params['Lag_ms'],
-            min_hold_s=params['MinHold_s']
-        )
-
-        # Clamp to 0.0-1.0 (Eos range)
-        level = max(0.0, min(1.0, processed_value))
+    key = tuple(submaster_mapping.items())
+    if _processor is None or key != _processor_key:
+        _processor = AudioSubProcessor(_routes_from_mapping(submaster_mapping))
+        _processor_key = key
 
-        # Check if we should send
-        sub_key = f"sub_{sub_number}"
-        if _should_send(sub_key, level):
-            if send_submaster_level(sub_number, level):
-                _last_levels[sub_key] = level
-                _last_send_time[sub_key] = now
+    _params_cache.refresh(audio_params_table_op)
+    levels = _processor.levels(audio_analysis_op, _params_cache)
+    _processor.send_changes(levels)
+    return levels
 
 
 # Convenience function for single channel mapping
@@ -304,9 +465,4 @@ def map_audio_channel_to_sub(
     )
 
     level = max(0.0, min(1.0, processed_value))
-    sub_key = f"sub_{sub_number}"
-
-    if _should_send(sub_key, level):
-        if send_submaster_level(sub_number, level):
-            _last_levels[sub_key] = level
-            _last_send_time[sub_key] = time.time()
+    send_submaster_level(sub_number, level)
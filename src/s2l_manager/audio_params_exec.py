@@ -8,45 +8,89 @@ except:
 # Absolute paths
 VALUES_TABLE_PATH = '/project1/src/s2l_manager/values'
 AUDIO_PARAMS_TABLE_PATH = '/project1/src/s2l_manager/audio_params_table'
+DISPATCHER_DAT_PATH = '/project1/src/s2l_manager/dispatcher'
 
 target_cols = ['Sensitivity','Threshold','LowCut_Hz','HighCut_Hz','Lag_ms','MinHold_s']
+_col_index = {name: idx + 1 for idx, name in enumerate(target_cols)}
+
+# instance -> row in audio_params_table (row 0 is the header)
+_rows = {}
+_attached = False
+
 
 def build_table():
+    """Full rebuild from the values grid (startup / recovery only)."""
     src = op(VALUES_TABLE_PATH)
     dest = op(AUDIO_PARAMS_TABLE_PATH)
     dest.clear()
     dest.appendRow(['instance'] + target_cols)
+    _rows.clear()
 
-    rows = {}
+    if src.numRows == 0:
+        return
+
+    # values is a dense grid: one row per instance, one column per parameter
+    cols = {src[0, c].val: c for c in range(src.numCols)}
     for r in range(1, src.numRows):
-        # Handle both multi-column tables and single-column TSV
-        if src.numCols >= 3:
-            # Multi-column table (proper format)
-            inst = src[r, 0].val
-            param = src[r, 1].val
-            value = src[r, 2].val
-        else:
-            # Single column - parse TAB-separated values
-            # Note: TD stores literal \t as two characters, not a tab character
-            line = src[r, 0].val
-            # Try escaped \t first (most common in TD)
-            parts = line.split('\\t')
-            if len(parts) < 3:
-                # Fallback: try real tab character
-                parts = line.split('\t')
-            if len(parts) < 3:
-                continue
-            inst = parts[0].strip()
-            param = parts[1].strip()
-            value = parts[2].strip()
-
-        if param not in target_cols:
+        inst = src[r, 0].val
+        dest.appendRow([inst] + [src[r, cols[col]].val if col in cols else '' for col in target_cols])
+        _rows[inst] = dest.numRows - 1
+
+
+def _add_row(dest, inst):
+    dest.appendRow([inst] + [''] * len(target_cols))
+    row = dest.numRows - 1
+    _rows[inst] = row
+    return row
+
+
+def _remove_row(dest, inst):
+    row = _rows.pop(inst, None)
+    if row is None:
+        return
+    dest.deleteRow(row)
+    for other, other_row in _rows.items():
+        if other_row > row:
+            _rows[other] = other_row - 1
+
+
+def on_changes(events):
+    """Dispatcher subscriber: touch only the cells of changed parameters."""
+    dest = op(AUDIO_PARAMS_TABLE_PATH)
+    if dest is None:
+        return
+    if dest.numRows != len(_rows) + 1:
+        # Table was edited/cleared behind our back
+        build_table()
+        return
+    for event in events:
+        if event.new is None:
+            _remove_row(dest, event.instance)
             continue
-        rows.setdefault(inst, {})[param] = value
+        col = _col_index.get(event.parameter)
+        if col is None:
+            continue
+        row = _rows.get(event.instance)
+        if row is None:
+            row = _add_row(dest, event.instance)
+        dest[row, col] = event.new
 
-    for inst, data in rows.items():
-        dest.appendRow([inst] + [data.get(col, '') for col in target_cols])
 
-def onTableChange(dat):
+def attach():
+    """Subscribe to dispatcher change events and seed the table once."""
+    global _attached
+    if _attached:
+        return True
+    dispatcher = op(DISPATCHER_DAT_PATH)
+    if dispatcher is None:
+        return False
+    dispatcher.module.subscribe(on_changes)
     build_table()
+    _attached = True
+    return True
+
+
+def onTableChange(dat):
+    # Incremental updates arrive via on_changes(); only the first change attaches
+    attach()
     return
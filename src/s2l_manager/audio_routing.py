@@ -0,0 +1,273 @@
+"""
+Per-instance audio routing for the S2L audio mapper.
+
+Every S2L instance drives its own Eos submaster:
+
+    band (instances.csv) → Sensitivity/Threshold → Lag_ms/MinHold_s → Submaster (DMX)
+
+The routing table (instance → band, submaster, parameters) is precomputed
+from the dispatcher's decoded values and rebuilt only when a routing value
+changes (dispatcher change events) or instances.csv was reloaded. Per frame
+all instances are processed as arrays in one pass; instances that share a
+submaster on the same console (eos_ip) are combined with max(). Levels go to
+each instance's own console through the eos_osc output pool.
+
+Levels come either from the audio_analysis CHOP (``process``) or from a
+BandAnalyzer fed with PCM (``process_analysis``). With the analyzer, the
+low/mid/high band of each instance is limited to its LowCut_Hz..HighCut_Hz.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+import time
+
+import numpy as np
+
+import audio_eos_mapper as mapper
+import s2l_unit as s2l
+from audio_analysis import BAND_LIMITS_HZ, CHANNELS, BandAnalyzer
+from audio_smoothing import SmoothingBank
+
+_LOG_PREFIX = "[audio_routing]"
+
+# Decoded parameters that change the routing table
+ROUTING_PARAMETERS = frozenset(('Submaster',) + mapper.PARAM_COLUMNS)
+
+# Used for instances without a band column in instances.csv
+DEFAULT_BAND = 'low'
+DEFAULT_EOS_IP = '127.0.0.1'
+
+# Valid Eos submaster numbers (0 = instance not routed)
+MIN_SUBMASTER = 1
+MAX_SUBMASTER = 999
+
+# The dispatcher keeps raw DMX (decoded without scaling); the audio
+# parameters are single 8-bit slots
+DMX_MAX = 255
+
+# Raw DMX → unit (dmx_map value_range, linear over 0..255):
+#
+#   Sensitivity   0..100      Lag_ms     0..500
+#   Threshold     0..100      MinHold_s  0..8
+#   LowCut_Hz     20..300     HighCut_Hz 2000..8000
+#
+# Exception: LowCut_Hz/HighCut_Hz at raw 0 (or unset) mean "no cut", the
+# band limits alone apply. A HighCut fader at 0 therefore opens the band
+# instead of cutting at 2000 Hz; raw 1 is the lowest cut (~2024 Hz).
+NO_CUT = {'LowCut_Hz': 0.0, 'HighCut_Hz': float('inf')}
+
+
+class Route(NamedTuple):
+    """One routed instance: audio band → submaster with its S2L parameters."""
+
+    instance: str
+    band: str
+    submaster: int
+    eos_ip: str
+    params: Mapping[str, float]
+
+
+def scale_param(name: str, raw: float) -> float:
+    """Raw DMX byte of parameter ``name`` → its unit (dmx_map value_range)."""
+    low, high = s2l.parameter_by_name(name).value_range
+    return low + min(max(float(raw), 0.0), DMX_MAX) / DMX_MAX * (high - low)
+
+
+def _route_param(name: str, values: Mapping[str, int]) -> float:
+    raw = values.get(name)
+    if name in NO_CUT and not raw:
+        return NO_CUT[name]
+    if raw is None:
+        return mapper.PARAM_FALLBACKS[name]
+    return scale_param(name, raw)
+
+
+def build_routes(source) -> List[Route]:
+    """Build the routing table from a dispatcher-like ``source``.
+
+    ``source`` provides ``instances()``, ``current_values(instance)`` and
+    ``definition(instance)`` (see s2l_manager.dispatcher). Instances without a
+    valid decoded Submaster are skipped. Parameters are converted from raw DMX
+    to their units; unset ones use ``PARAM_FALLBACKS`` (cuts: ``NO_CUT``).
+    """
+    routes: List[Route] = []
+    for instance in source.instances():
+        values = source.current_values(instance)
+        sub = values.get('Submaster')
+        if sub is None or not MIN_SUBMASTER <= sub <= MAX_SUBMASTER:
+            continue
+        definition = source.definition(instance)
+        band = (definition.band if definition else None) or DEFAULT_BAND
+        eos_ip = definition.eos_ip if definition else DEFAULT_EOS_IP
+        params = {name: _route_param(name, values) for name in mapper.PARAM_COLUMNS}
+        routes.append(Route(instance, band, int(sub), eos_ip, params))
+    return routes
+
+
+class AudioRouter:
+    """Route every instance's band to its own submaster in one array pass."""
+
+    def __init__(self, source) -> None:
+        self._source = source
+        self._dirty = True
+        self._layout_version: Optional[int] = None
+        self.routes: Tuple[Route, ...] = ()
+        self.version = 0
+        self._reader: Optional[mapper._ChannelReader] = None
+        self._route_band = np.zeros(0, dtype=np.intp)
+        # BandAnalyzer inputs: spectral routes read their own cut range,
+        # the others a fixed analyzer channel (-1 = not provided)
+        self._route_spectral = np.zeros(0, dtype=bool)
+        self._route_channel = np.zeros(0, dtype=np.intp)
+        self._analysis_key: Optional[Tuple[int, int]] = None
+        self._sensitivity = np.zeros(0)
+        self._threshold = np.zeros(0)
+        self._smoothing = SmoothingBank(0)
+        self._last_step: Optional[float] = None
+        # Unique (console, submaster) slots and route → slot
+        self.subs = np.zeros(0, dtype=np.int32)
+        self.sub_ips: Tuple[str, ...] = ()
+        self._route_slot = np.zeros(0, dtype=np.intp)
+        self._sub_levels = np.zeros(0)
+        self._last_levels = np.zeros(0)
+
+    # ------------------------------------------------------------------
+    # Routing table
+    # ------------------------------------------------------------------
+    def on_changes(self, events: Iterable) -> None:
+        """Dispatcher subscriber: mark the table stale on routing changes only."""
+        for event in events:
+            if event.new is None or event.parameter in ROUTING_PARAMETERS:
+                self._dirty = True
+                return
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    def refresh(self) -> bool:
+        """Rebuild the routing table if it is stale; True if rebuilt."""
+        layout = self._source.layout_version()
+        if not self._dirty and layout == self._layout_version:
+            return False
+        self._build(build_routes(self._source))
+        self._layout_version = layout
+        self._dirty = False
+        print(
+            f"{_LOG_PREFIX} routing table rebuilt: {len(self.routes)} instances → "
+            f"{len(self.subs)} submasters on {len(set(self.sub_ips))} console(s)"
+        )
+        return True
+
+    def _build(self, routes: Sequence[Route]) -> None:
+        previous = self.routes
+        self.routes = tuple(routes)
+        self.version += 1
+
+        bands = tuple(sorted({route.band for route in self.routes}))
+        if self._reader is None or self._reader.names != bands:
+            self._reader = mapper._ChannelReader(bands)
+        band_pos = {band: i for i, band in enumerate(bands)}
+        self._route_band = np.array([band_pos[r.band] for r in self.routes], dtype=np.intp)
+        self._route_spectral = np.array([r.band in BAND_LIMITS_HZ for r in self.routes], dtype=bool)
+        self._route_channel = np.array(
+            [CHANNELS.index(r.band) if r.band in CHANNELS else -1 for r in self.routes], dtype=np.intp
+        )
+
+        n = len(self.routes)
+        self._sensitivity = np.array([r.params['Sensitivity'] for r in self.routes], dtype=np.float64)
+        self._threshold = np.array([r.params['Threshold'] for r in self.routes], dtype=np.float64)
+        # Keep filter state while the same instances are routed
+        if [r.instance for r in previous] != [r.instance for r in self.routes]:
+            self._smoothing = SmoothingBank(n)
+        self._smoothing.set_params(
+            np.array([r.params['Lag_ms'] for r in self.routes], dtype=np.float64),
+            np.array([r.params['MinHold_s'] for r in self.routes], dtype=np.float64),
+        )
+
+        # Carry the last offered level over for submasters that stay routed
+        old_last: Dict[Tuple[str, int], float] = {
+            (ip, int(sub)): float(level)
+            for ip, sub, level in zip(self.sub_ips, self.subs, self._last_levels)
+        }
+        ips = tuple(sorted({r.eos_ip for r in self.routes}))
+        ip_pos = {ip: i for i, ip in enumerate(ips)}
+        stride = MAX_SUBMASTER + 1
+        keys, slots = np.unique(
+            np.array([ip_pos[r.eos_ip] * stride + r.submaster for r in self.routes], dtype=np.int64),
+            return_inverse=True,
+        )
+        self.subs = (keys % stride).astype(np.int32)
+        self.sub_ips = tuple(ips[k // stride] for k in keys.tolist())
+        self._route_slot = slots.astype(np.intp).reshape(-1)
+        self._sub_levels = np.full(len(keys), np.nan)
+        self._last_levels = np.array([
+            old_last.get((ip, int(sub)), -999.0) for ip, sub in zip(self.sub_ips, self.subs)
+        ])
+
+    # ------------------------------------------------------------------
+    # Per-frame processing
+    # ------------------------------------------------------------------
+    def cut_ranges(self) -> List[Tuple[float, float]]:
+        """(low_hz, high_hz) per route: its band limited to LowCut_Hz..HighCut_Hz.
+
+        Cuts are in Hz (scaled in ``build_routes``); ``NO_CUT`` keeps the band.
+        """
+        ranges = []
+        for route in self.routes:
+            band_lo, band_hi = BAND_LIMITS_HZ.get(route.band, (0.0, 0.0))
+            ranges.append((
+                max(band_lo, route.params['LowCut_Hz']),
+                min(band_hi, route.params['HighCut_Hz']),
+            ))
+        return ranges
+
+    def levels(self, audio_analysis_op, now: Optional[float] = None) -> np.ndarray:
+        """Return one smoothed level per route (NaN where the band is missing)."""
+        self.refresh()
+        if not self.routes:
+            return np.zeros(0)
+        return self._smooth(self._reader.read(audio_analysis_op)[self._route_band], now)
+
+    def analysis_levels(self, analyzer: BandAnalyzer, now: Optional[float] = None) -> np.ndarray:
+        """Like ``levels`` but read from a BandAnalyzer instead of a CHOP."""
+        self.refresh()
+        if not self.routes:
+            return np.zeros(0)
+        key = (id(analyzer), self.version)
+        if key != self._analysis_key:
+            # Takes effect with the analyzer's next frame
+            analyzer.set_ranges(self.cut_ranges())
+            self._analysis_key = key
+        channel = self._route_channel
+        raw = np.where(channel >= 0, analyzer.channels[channel], np.nan)
+        if len(analyzer.range_levels) == len(self.routes):
+            raw = np.where(self._route_spectral, analyzer.range_levels, raw)
+        return self._smooth(raw, now)
+
+    def _smooth(self, raw: np.ndarray, now: Optional[float]) -> np.ndarray:
+        target = mapper.apply_s2l_params_array(raw, self._sensitivity, self._threshold)
+
+        now = time.perf_counter() if now is None else now
+        dt = 0.0 if self._last_step is None else now - self._last_step
+        self._last_step = now
+        smoothed = self._smoothing.step(target, dt)
+        return np.where(np.isnan(target), np.nan, smoothed)
+
+    def submaster_levels(self, levels: np.ndarray) -> np.ndarray:
+        """Combine route levels per submaster (max, NaN routes ignored)."""
+        out = self._sub_levels
+        out.fill(np.nan)
+        np.fmax.at(out, self._route_slot, levels)
+        return out
+
+    def process(self, audio_analysis_op, now: Optional[float] = None) -> np.ndarray:
+        """Compute all routes, send changed submasters and return levels per sub."""
+        return self._send(self.submaster_levels(self.levels(audio_analysis_op, now)))
+
+    def process_analysis(self, analyzer: BandAnalyzer, now: Optional[float] = None) -> np.ndarray:
+        """``process`` with levels from a BandAnalyzer (PCM input)."""
+        return self._send(self.submaster_levels(self.analysis_levels(analyzer, now)))
+
+    def _send(self, sub_levels: np.ndarray) -> np.ndarray:
+        mapper.send_level_changes(self.subs, sub_levels, self._last_levels, eos_ips=self.sub_ips)
+        return sub_levels
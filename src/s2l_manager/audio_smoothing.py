@@ -0,0 +1,71 @@
+"""
+Per-submaster smoothing for the audio mapper (S2L Lag_ms and MinHold_s).
+
+Each route gets a one-pole lag filter with time constant ``Lag_ms`` followed
+by a peak-hold stage: a new peak is held for ``MinHold_s`` seconds, then the
+held value itself runs through the same one-pole filter towards the input
+(first order, same ``Lag_ms``) until it meets the filtered level. All state lives
+in numpy arrays and is advanced once per frame with the real frame delta.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+# Frame deltas above this are treated as a hiccup (e.g. TD paused)
+MAX_FRAME_DELTA = 0.5
+
+
+class SmoothingBank:
+    """Stateful lag + peak-hold filter for ``size`` parallel channels."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._tau = np.zeros(size)
+        self._hold = np.zeros(size)
+        self._filtered = np.zeros(size)
+        self._held = np.zeros(size)
+        self._hold_left = np.zeros(size)
+        self._scratch = np.zeros(size)
+
+    def set_params(self, lag_ms: np.ndarray, min_hold_s: np.ndarray) -> None:
+        """Update per-channel time constants (S2L units: ms and s)."""
+        np.multiply(np.maximum(lag_ms, 0.0), 0.001, out=self._tau)
+        np.maximum(min_hold_s, 0.0, out=self._hold)
+        np.minimum(self._hold_left, self._hold, out=self._hold_left)
+
+    def reset(self) -> None:
+        for arr in (self._filtered, self._held, self._hold_left):
+            arr.fill(0.0)
+
+    def step(self, target: np.ndarray, dt: float) -> np.ndarray:
+        """Advance all channels by ``dt`` seconds and return the output levels.
+
+        NaN targets (missing inputs) keep their previous state. The returned
+        array is the bank's own state; read it, do not modify it.
+        """
+        dt = min(max(float(dt), 0.0), MAX_FRAME_DELTA)
+        # alpha = 1 - exp(-dt / tau); tau == 0 means no smoothing
+        with np.errstate(divide="ignore", invalid="ignore"):
+            alpha = np.where(self._tau > 0.0, -np.expm1(-dt / self._tau), 1.0)
+
+        valid = ~np.isnan(target)
+        diff = self._scratch
+        np.subtract(target, self._filtered, out=diff)
+        diff[~valid] = 0.0
+        self._filtered += alpha * diff
+
+        # Peak-hold: a new peak restarts the hold timer
+        rising = self._filtered >= self._held
+        self._held[rising] = self._filtered[rising]
+        self._hold_left[rising] = self._hold[rising]
+
+        # Hold running: count down. Hold expired: filter the held value towards
+        # the input (not the already filtered level, which would be second order)
+        self._hold_left[~rising] -= dt
+        releasing = ~rising & (self._hold_left <= 0.0) & valid
+        self._hold_left[releasing] = 0.0
+        self._held[releasing] += alpha[releasing] * (
+            target[releasing] - self._held[releasing]
+        )
+        return self._held
@@ -0,0 +1,265 @@
+"""
+Streaming tempo/beat tracking and beat-synced cue stepping for S2L.
+
+``BeatClock`` takes one onset-strength value per analysis frame (BandAnalyzer
+hop or TD frame) and keeps an exponentially decaying onset autocorrelation
+over a fixed lag range (MIN_BPM..MAX_BPM). Each update touches only that lag
+range, so the per-frame cost does not grow with the history length. The
+strongest lag gives the tempo; a phase-locked beat counter provides beat
+phase, beat count and bar count.
+
+``BeatCueScheduler`` turns beats into Eos cue GOs per S2L instance:
+
+- ``FX_Auto == 1``: one step every beat
+- ``Mode >= 1001``: one step every ``Mode - 1000`` bars (on the downbeat)
+
+Each step fires the next cue from StartCue to EndCue (wrapping); with
+StartCue/EndCue = 0 (no restriction) the cuelist is simply advanced.
+"""
+
+from __future__ import annotations
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+import math
+
+import numpy as np
+
+import audio_eos_mapper as mapper
+
+_LOG_PREFIX = "[beat_clock]"
+
+MIN_BPM = 60.0
+MAX_BPM = 180.0
+DEFAULT_BPM = 120.0
+BEATS_PER_BAR = 4
+
+# Autocorrelation memory (time constant of the exponential decay)
+AUTOCORR_MEMORY_S = 8.0
+# Prefer tempi near DEFAULT_BPM (log-gaussian width in octaves) against octave errors
+TEMPO_PRIOR_OCTAVES = 1.0
+# Phase correction towards onsets near a beat
+PHASE_GAIN = 0.2
+PHASE_WINDOW = 0.25
+# Onset detection when the caller passes no onset flag: strength above ratio x mean
+ONSET_MEAN_RATIO = 2.0
+
+BeatCallback = Callable[['BeatClock'], None]
+
+
+class BeatClock:
+    """Incremental onset autocorrelation tempo tracker with beat/bar counter."""
+
+    def __init__(
+        self,
+        frame_rate: float,
+        min_bpm: float = MIN_BPM,
+        max_bpm: float = MAX_BPM,
+        beats_per_bar: int = BEATS_PER_BAR,
+        on_beat: Optional[BeatCallback] = None,
+    ) -> None:
+        self.frame_rate = float(frame_rate)
+        self.beats_per_bar = beats_per_bar
+        self.on_beat = on_beat
+        self.min_lag = max(1, int(math.floor(self.frame_rate * 60.0 / max_bpm)))
+        self.max_lag = int(math.ceil(self.frame_rate * 60.0 / min_bpm))
+
+        self._lags = np.arange(self.min_lag, self.max_lag + 1)
+        self._size = self.max_lag + 1
+        self._history = np.zeros(self._size)
+        self._offsets = self._size - self._lags  # (pos - lag) mod size == (pos + offset) mod size
+        self._index = np.zeros(len(self._lags), dtype=np.intp)
+        self._past = np.zeros(len(self._lags))
+        self._acf = np.zeros(len(self._lags))
+        self._score = np.zeros(len(self._lags))
+        bpm = 60.0 * self.frame_rate / self._lags
+        self._prior = np.exp(-0.5 * (np.log2(bpm / DEFAULT_BPM) / TEMPO_PRIOR_OCTAVES) ** 2)
+        self._decay = math.exp(-1.0 / (self.frame_rate * AUTOCORR_MEMORY_S))
+        self._pos = 0
+        self._mean = 0.0
+        self._prev = 0.0
+
+        self.period = self.frame_rate * 60.0 / DEFAULT_BPM  # frames per beat
+        self.phase = 0.0
+        self.beats = 0
+        self.beat = False
+        self.frames = 0
+
+    # ------------------------------------------------------------------
+    @property
+    def bpm(self) -> float:
+        return 60.0 * self.frame_rate / self.period
+
+    @property
+    def bars(self) -> int:
+        """Number of bars started so far."""
+        return (self.beats + self.beats_per_bar - 1) // self.beats_per_bar
+
+    @property
+    def beat_in_bar(self) -> int:
+        """0-based position of the last beat within its bar."""
+        return (self.beats - 1) % self.beats_per_bar if self.beats else 0
+
+    @property
+    def downbeat(self) -> bool:
+        return self.beat and self.beat_in_bar == 0
+
+    def reset(self) -> None:
+        for arr in (self._history, self._acf):
+            arr.fill(0.0)
+        self._pos = 0
+        self._mean = self._prev = 0.0
+        self.period = self.frame_rate * 60.0 / DEFAULT_BPM
+        self.phase = 0.0
+        self.beats = 0
+        self.beat = False
+
+    # ------------------------------------------------------------------
+    def update(self, strength: float, onset: Optional[bool] = None) -> bool:
+        """Advance one frame with an onset strength; returns True on a beat."""
+        x = max(float(strength), 0.0)
+        if onset is None:
+            onset = x > self._prev and x > ONSET_MEAN_RATIO * self._mean and x > 0.0
+        self._prev = x
+        self._mean += (1.0 - self._decay) * (x - self._mean)
+        centered = x - self._mean
+
+        # Autocorrelation: decay the old sums and add x[t] * x[t - lag] for all lags
+        self._history[self._pos] = centered
+        np.add(self._offsets, self._pos, out=self._index)
+        np.remainder(self._index, self._size, out=self._index)
+        np.take(self._history, self._index, out=self._past)
+        self._acf *= self._decay
+        self._past *= centered
+        self._acf += self._past
+        self._pos = (self._pos + 1) % self._size
+        self.frames += 1
+        self._update_period()
+
+        # Phase-locked beat counter
+        self.phase += 1.0 / self.period
+        if onset:
+            error = self.phase - round(self.phase)
+            if abs(error) < PHASE_WINDOW:
+                self.phase -= PHASE_GAIN * error
+        self.beat = self.phase >= 1.0
+        if self.beat:
+            self.phase -= math.floor(self.phase)
+            self.beats += 1
+            if self.on_beat is not None:
+                self.on_beat(self)
+        return self.beat
+
+    def _update_period(self) -> None:
+        # 3-tap sum: a tempo between two integer lags splits its energy over both
+        score = self._score
+        score[:] = self._acf
+        score[1:] += self._acf[:-1]
+        score[:-1] += self._acf[1:]
+        score *= self._prior
+        k = int(np.argmax(score))
+        peak = score[k]
+        if peak <= 0.0:
+            return  # no periodicity yet
+        lag = float(self._lags[k])
+        if 0 < k < len(score) - 1:
+            # parabolic interpolation between neighbouring lags
+            left, right = score[k - 1], score[k + 1]
+            denom = left - 2.0 * peak + right
+            if denom < 0.0:
+                lag += 0.5 * (left - right) / denom
+        self.period = lag
+
+
+# ----------------------------------------------------------------------
+# Beat-synced cue stepping
+# ----------------------------------------------------------------------
+PLAYBACK_PARAMETERS = frozenset(('Cuelist', 'StartCue', 'EndCue', 'Mode', 'FX_Auto'))
+
+# Mode values from here on mean "step every (Mode - BAR_MODE_BASE) bars"
+BAR_MODE_BASE = 1000
+FX_AUTO_BEAT = 1
+
+
+class CueProgram(NamedTuple):
+    """Beat-synced cue stepping of one instance."""
+
+    instance: str
+    cuelist: int
+    start_cue: int
+    end_cue: int
+    beats_per_step: int
+    eos_ip: Optional[str] = None
+
+
+def build_programs(source, beats_per_bar: int = BEATS_PER_BAR) -> List[CueProgram]:
+    """Collect beat-driven instances from a dispatcher-like ``source``."""
+    programs: List[CueProgram] = []
+    for instance in source.instances():
+        values = source.current_values(instance)
+        cuelist = values.get('Cuelist', 0)
+        if cuelist <= 0:
+            continue
+        mode = values.get('Mode', 0)
+        if values.get('FX_Auto', 0) == FX_AUTO_BEAT:
+            beats = 1
+        elif mode > BAR_MODE_BASE:
+            beats = (mode - BAR_MODE_BASE) * beats_per_bar
+        else:
+            continue
+        definition = source.definition(instance)
+        programs.append(CueProgram(
+            instance, cuelist, values.get('StartCue', 0), values.get('EndCue', 0), beats,
+            definition.eos_ip if definition else None,
+        ))
+    return programs
+
+
+class BeatCueScheduler:
+    """Fire the next cue of every beat-driven instance when it is due."""
+
+    def __init__(self, source, beats_per_bar: int = BEATS_PER_BAR) -> None:
+        self._source = source
+        self.beats_per_bar = beats_per_bar
+        self.programs: List[CueProgram] = []
+        self._dirty = True
+        self._layout_version: Optional[int] = None
+        self._position: Dict[str, int] = {}
+
+    def on_changes(self, events: Iterable) -> None:
+        """Dispatcher subscriber: rebuild programs on playback changes only."""
+        for event in events:
+            if event.new is None or event.parameter in PLAYBACK_PARAMETERS:
+                self._dirty = True
+                return
+
+    def refresh(self) -> bool:
+        layout = self._source.layout_version()
+        if not self._dirty and layout == self._layout_version:
+            return False
+        self.programs = build_programs(self._source, self.beats_per_bar)
+        self._layout_version = layout
+        self._dirty = False
+        print(f"{_LOG_PREFIX} {len(self.programs)} beat-synced cue programs")
+        return True
+
+    def next_cue(self, program: CueProgram) -> Optional[int]:
+        """Next cue in StartCue..EndCue (wrapping); None = plain Go on the list."""
+        if program.start_cue <= 0 or program.end_cue < program.start_cue:
+            return None
+        current = self._position.get(program.instance)
+        if current is None or current < program.start_cue or current >= program.end_cue:
+            return program.start_cue
+        return current + 1
+
+    def on_beat(self, clock: BeatClock) -> int:
+        """BeatClock callback: step every program whose beat count is due."""
+        self.refresh()
+        fired = 0
+        for program in self.programs:
+            if (clock.beats - 1) % program.beats_per_step:
+                continue
+            cue = self.next_cue(program)
+            if mapper.send_cue_go(program.cuelist, cue, eos_ip=program.eos_ip):
+                if cue is not None:
+                    self._position[program.instance] = cue
+                fired += 1
+        return fired
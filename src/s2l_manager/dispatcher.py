@@ -1,8 +1,22 @@
-"""TouchDesigner-facing dispatcher for decoded S2L DMX data."""
+"""TouchDesigner-facing dispatcher for decoded S2L DMX data.
+
+The values table is a dense grid: one row per instance, one column per
+parameter in ``dmx_map`` order::
+
+    instance    Submaster  Cuelist  ...  FX_Auto
+    S2L_UNIT_1  11         1        ...  0
+
+Row and column indices are computed from lookup dicts, never searched.
+
+Every changed value is also published as a typed ``ChangeEvent`` to the
+subscribers registered with ``subscribe()``, so downstream tables can update
+incrementally instead of rescanning the grid.
+"""
 
 from __future__ import annotations
 
-from typing import Dict
+from array import array
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
 
 import s2l_unit as s2l
 
@@ -19,63 +33,253 @@ _LOG_PREFIX = "[s2l_manager]"
 # Absolute path to the values table
 VALUES_TABLE_PATH = "/project1/src/s2l_manager/values"
 
+# Print every changed value (very noisy while faders move)
+DEBUG = False
+
+# Fixed column order derived from dmx_map
+PARAMETER_NAMES: Tuple[str, ...] = tuple(param.name for param in s2l.parameters())
+TABLE_HEADER: Tuple[str, ...] = ("instance",) + PARAMETER_NAMES
+_COLUMN_INDEX: Dict[str, int] = {name: col for col, name in enumerate(TABLE_HEADER)}
+
+# Marks "no value yet" in the per-instance value arrays (DMX values are >= 0)
+_UNSET = -1
+
 print(f"{_LOG_PREFIX} dispatcher module reloaded")
 
 
-_last_values: Dict[str, Dict[str, int]] = {}
-# Performance: Cache table row indices to avoid O(n) linear search
-_table_row_cache: Dict[tuple, int] = {}
+class ChangeEvent(NamedTuple):
+    """One parameter change; ``new`` is None when the instance was removed."""
+
+    instance: str
+    parameter: str
+    old: Optional[int]
+    new: Optional[int]
+    frame: int
+
+
+ChangeSubscriber = Callable[[Sequence[ChangeEvent]], None]
+
+_subscribers: List[ChangeSubscriber] = []
+
+# Instance -> grid row (1-based, row 0 is the header)
+_instance_rows: Dict[str, int] = {}
+# Instance -> last values in PARAMETER_NAMES order (compact signed int array)
+_grid: Dict[str, array] = {}
+# Instance -> instances.csv row (band, eos_ip, ...); absent for ad-hoc instances
+_definitions: Dict[str, s2l.InstanceDefinition] = {}
+# Frame counter used when the caller does not pass a frame number
+_frame = 0
+# Bumped whenever the instance layout is re-read from instances.csv
+_layout_version = 0
+
+
+def _callback_key(callback: ChangeSubscriber) -> Tuple[object, object]:
+    return (getattr(callback, "__module__", None), getattr(callback, "__qualname__", callback))
+
+
+def subscribe(callback: ChangeSubscriber) -> None:
+    """Receive a list of ChangeEvents after every update that changed values.
+
+    A callback with the same module and name replaces the old one, so a
+    recompiled DAT does not end up subscribed twice.
+    """
+    key = _callback_key(callback)
+    _subscribers[:] = [cb for cb in _subscribers if _callback_key(cb) != key]
+    _subscribers.append(callback)
+
+
+def unsubscribe(callback: ChangeSubscriber) -> None:
+    if callback in _subscribers:
+        _subscribers.remove(callback)
+
+
+def _publish(events: Sequence[ChangeEvent]) -> None:
+    if not events:
+        return
+    for callback in tuple(_subscribers):
+        try:
+            callback(events)
+        except Exception as exc:
+            print(f"{_LOG_PREFIX} change subscriber {getattr(callback, '__name__', callback)} failed: {exc}")
+
+
+def _value_or_none(value: int) -> Optional[int]:
+    return None if value == _UNSET else value
+
+
+def current_values(instance: str) -> Dict[str, int]:
+    """Return the last known parameter values of an instance."""
+    values = _grid.get(instance)
+    if values is None:
+        return {}
+    return {
+        name: value for name, value in zip(PARAMETER_NAMES, values) if value != _UNSET
+    }
+
+
+def instances() -> Tuple[str, ...]:
+    """Instances in grid row order."""
+    return tuple(_instance_rows)
+
+
+def layout_version() -> int:
+    """Counter that changes whenever the instance layout was rebuilt."""
+    return _layout_version
+
+
+def definition(instance: str) -> Optional[s2l.InstanceDefinition]:
+    """Return the instances.csv entry of an instance, if it has one."""
+    if not _instance_rows:
+        _init_rows()
+    return _definitions.get(instance)
+
+
+def _init_rows() -> None:
+    """Assign grid rows in instances.csv order (enabled instances only)."""
+    global _layout_version
+    _layout_version += 1
+    _instance_rows.clear()
+    _grid.clear()
+    _definitions.clear()
+    for inst in s2l.load_instances():
+        if inst.enabled:
+            _add_instance(inst.instance)
+            _definitions[inst.instance] = inst
+
+
+def _add_instance(instance: str) -> int:
+    row = len(_instance_rows) + 1
+    _instance_rows[instance] = row
+    _grid[instance] = array("l", [_UNSET]) * len(PARAMETER_NAMES)
+    return row
+
+
+def _row_for(instance: str) -> int:
+    if not _instance_rows:
+        _init_rows()
+    row = _instance_rows.get(instance)
+    if row is None:
+        row = _add_instance(instance)
+    return row
+
+
+def column_for(parameter: str) -> int:
+    """Return the values table column of a parameter."""
+    return _COLUMN_INDEX[parameter]
+
+
+def row_for(instance: str) -> int:
+    """Return the values table row of an instance."""
+    return _row_for(instance)
+
+
+def _layout_matches(table) -> bool:
+    return (
+        table.numRows == len(_instance_rows) + 1
+        and table.numCols == len(TABLE_HEADER)
+        and table[0, 0].val == TABLE_HEADER[0]
+    )
+
+
+def _write_layout(table) -> None:
+    """Resize the table once and write header, instance names and known values."""
+    table.clear()
+    table.setSize(len(_instance_rows) + 1, len(TABLE_HEADER))
+    table.replaceRow(0, list(TABLE_HEADER))
+    for instance, row in _instance_rows.items():
+        table.replaceRow(row, _row_cells(instance))
+
+
+def _row_cells(instance: str) -> List[object]:
+    return [instance] + ["" if v == _UNSET else v for v in _grid[instance]]
 
 
 def _ensure_table():
     table = op(VALUES_TABLE_PATH)  # type: ignore[name-defined]
-    if table and table.numRows == 0:
-        table.appendRow(["instance", "parameter", "value"])
+    if table is None:
+        return None
+    if not _instance_rows:
+        _init_rows()
+    if not _layout_matches(table):
+        _write_layout(table)
     return table
 
 
-def _set_table_value(table, instance: str, key: str, value: int) -> None:
-    cache_key = (instance, key)
+def reset_table() -> None:
+    """Rebuild the grid layout from instances.csv and rewrite the table."""
+    _init_rows()
+    table = op(VALUES_TABLE_PATH)  # type: ignore[name-defined]
+    if table is not None:
+        _write_layout(table)
+
+
+def reload_instances(frame: Optional[int] = None) -> None:
+    """Re-read instances.csv, keep known values and drop removed instances.
 
-    # Try cache first (fast path)
-    if cache_key in _table_row_cache:
-        row = _table_row_cache[cache_key]
-        if row < table.numRows and table[row, 0].val == instance and table[row, 1].val == key:
-            table[row, 2].val = value
-            return
-        else:
-            # Cache invalid, remove it
-            del _table_row_cache[cache_key]
+    Removed instances are published as ChangeEvents with ``new=None``.
+    """
+    previous = dict(_grid)
+    _init_rows()
+    stamp = _frame if frame is None else frame
+    events: List[ChangeEvent] = []
+    for instance, values in previous.items():
+        if instance in _grid:
+            _grid[instance] = values
+            continue
+        for name, value in zip(PARAMETER_NAMES, values):
+            if value != _UNSET:
+                events.append(ChangeEvent(instance, name, value, None, stamp))
+    table = op(VALUES_TABLE_PATH) if op else None  # type: ignore[misc]
+    if table is not None:
+        _write_layout(table)
+    _publish(events)
 
-    # Cache miss: linear search and update cache
-    for row in range(1, table.numRows):
-        if table[row, 0].val == instance and table[row, 1].val == key:
-            table[row, 2].val = value
-            _table_row_cache[cache_key] = row
-            return
 
-    # Not found: append new row
-    table.appendRow([instance, key, value])
-    _table_row_cache[cache_key] = table.numRows - 1
+def _flush(table, changed: Sequence[str]) -> None:
+    """Write all changed rows in one pass (one DAT call per changed row)."""
+    if table is None or not changed:
+        return
+    if not _layout_matches(table):
+        # New instances appeared this frame: resize once and rewrite everything
+        _write_layout(table)
+        return
+    for instance in changed:
+        table.replaceRow(_instance_rows[instance], _row_cells(instance))
 
 
 def update_from_dmx(
     universe: int,
-    values: Dict[str, Dict[str, int]],
+    values: Mapping[str, Mapping[str, int]],
     defaults: Dict[str, Dict[str, int]],
-) -> None:
-    global _last_values
+    frame: Optional[int] = None,
+) -> List[ChangeEvent]:
+    """Diff decoded values against the grid, write changes and publish events."""
+    global _frame
+    _frame = _frame + 1 if frame is None else frame
     table = _ensure_table()
+    changed: List[str] = []
+    events: List[ChangeEvent] = []
 
     for instance, params in values.items():
-        prev = _last_values.get(instance, {})
+        _row_for(instance)
+        current = _grid[instance]
+        dirty = False
         for key, val in params.items():
+            col = _COLUMN_INDEX.get(key)
+            if col is None:
+                continue
             # Only update when value actually changes (change detection)
-            if prev.get(key) == val:
+            old = current[col - 1]
+            if old == val:
                 continue
-            print(f"{_LOG_PREFIX} {instance}:{key} -> {val}")
-            if table:
-                _set_table_value(table, instance, key, val)
-        _last_values[instance] = params.copy()
+            if DEBUG:
+                print(f"{_LOG_PREFIX} {instance}:{key} -> {val}")
+            current[col - 1] = val
+            events.append(ChangeEvent(instance, key, _value_or_none(old), val, _frame))
+            dirty = True
+        if dirty:
+            changed.append(instance)
 
-    # TODO: integrate with audio logic / OSC outs.
+    _flush(table, changed)
+    _publish(events)
+    return events
@@ -19,15 +19,10 @@ if not dispatcher:
 else:
     print(f"✅ Found dispatcher: {dispatcher.path}")
 
-    # Clear the last values cache to force updates
-    if hasattr(dispatcher.module, '_last_values'):
-        dispatcher.module._last_values.clear()
-        print("✅ Cleared _last_values cache")
-
-    # Clear the table row cache
-    if hasattr(dispatcher.module, '_table_row_cache'):
-        dispatcher.module._table_row_cache.clear()
-        print("✅ Cleared _table_row_cache")
+    # Rebuild the grid layout so every value is written again
+    if hasattr(dispatcher.module, 'reset_table'):
+        dispatcher.module.reset_table()
+        print("✅ Reset values grid")
 
     print()
     print("Now triggering a frame update...")
@@ -35,7 +35,7 @@ print()
 # 2. Clear cache and sync current DMX values
 print("Step 2: Syncing current DMX values...")
 
-sacn_dispatch._instances_cache.clear()
+sacn_dispatch.rebuild_index(force_reload=True)
 
 uni16 = op('/project1/io/EOS_Universe_016')
 if uni16:
@@ -33,12 +33,11 @@ else:
     print(f"   Ch13 (LowCut_Hz):   {uni16[12].eval()}")
     print()
 
-    # Clear values table
-    values = op('/project1/src/s2l_manager/values')
+    # Reset the values grid (one row per instance, one column per parameter)
+    values = op(dispatcher.VALUES_TABLE_PATH)
     if values:
-        values.clear()
-        values.appendRow(['instance', 'parameter', 'value'])
-        print("✅ Cleared values table")
+        dispatcher.reset_table()
+        print("✅ Reset values table")
 
     # Manually trigger frame_tick to update from current DMX
     print("✅ Triggering frame_tick...")
@@ -61,12 +60,11 @@ else:
     # Check values table
     if values:
         print(f"values table rows: {values.numRows}")
-        for r in range(1, min(10, values.numRows)):
-            inst = values[r, 0].val
-            param = values[r, 1].val
-            value = values[r, 2].val
-            if inst == 'S2L_UNIT_1' and param in ['Sensitivity', 'Threshold', 'LowCut_Hz']:
-                print(f"  {inst}:{param} = {value}")
+        inst = 'S2L_UNIT_1'
+        if inst in dispatcher.instances():
+            row = dispatcher.row_for(inst)
+            for param in ['Sensitivity', 'Threshold', 'LowCut_Hz']:
+                print(f"  {inst}:{param} = {values[row, dispatcher.column_for(param)].val}")
 
     print()
 
@@ -43,7 +43,7 @@ else:
     print()
 
     # Clear cache to force fresh load
-    sacn_dispatch._instances_cache.clear()
+    sacn_dispatch.rebuild_index(force_reload=True)
     print("✅ Cleared instances cache")
     print()
 
@@ -1,12 +1,11 @@
-"""Test script to clear values table and check if dispatcher is working."""
+"""Test script to reset the values table and check if dispatcher is working."""
 
-# Clear the values table
+# Reset the values grid (one row per instance, one column per parameter)
 values = op('/project1/src/s2l_manager/values')
-values.clear()
-values.appendRow(['instance', 'parameter', 'value'])
+op('/project1/src/s2l_manager/dispatcher').module.reset_table()
 
 print("=" * 60)
-print("VALUES TABLE CLEARED")
+print("VALUES TABLE RESET")
 print("=" * 60)
 print(f"Rows: {values.numRows}, Cols: {values.numCols}")
 print()
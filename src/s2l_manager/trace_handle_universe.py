@@ -40,7 +40,7 @@ else:
     print()
 
     # Clear cache
-    sacn_dispatch._instances_cache.clear()
+    sacn_dispatch.rebuild_index(force_reload=True)
     print("✅ Cache cleared")
     print()
 
@@ -53,7 +53,8 @@ else:
 
     print()
     print("Step 2: Get instances for universe 16...")
-    instances = sacn_dispatch._instances_for_universe(16)
+    plan = sacn_dispatch.plan_for_universe(16)
+    instances = plan.instances if plan else ()
     print(f"  Found {len(instances)} instances")
 
     if not instances:
@@ -138,7 +139,7 @@ print("=" * 60)
 print("Now calling sacn_dispatch.handle_universe() directly...")
 print("=" * 60)
 
-sacn_dispatch._instances_cache.clear()
+sacn_dispatch.rebuild_index(force_reload=True)
 sacn_dispatch.handle_universe(payload, 16)
 
 print()
@@ -17,7 +17,14 @@ from .dmx_parser import (  # noqa: F401
     decode_parameter,
     decode_universe,
 )
+from .e131_receiver import E131PacketError, E131Receiver  # noqa: F401
 from .models import InstanceDefinition, ParameterDefinition  # noqa: F401
+from .snapshot import DMXSnapshot, DMXSnapshotService  # noqa: F401
+from .universe_index import (  # noqa: F401
+    DecodePlan,
+    MultiUniverseDecoder,
+    build_universe_index,
+)
 
 __all__ = [
     "CONFIG_DIR",
@@ -27,7 +34,14 @@ __all__ = [
     "InstanceDefinition",
     "ParameterDefinition",
     "DMXBufferError",
+    "DMXSnapshot",
+    "DMXSnapshotService",
+    "E131PacketError",
+    "E131Receiver",
+    "DecodePlan",
+    "MultiUniverseDecoder",
     "apply_defaults",
+    "build_universe_index",
     "decode_instance",
     "decode_parameter",
     "decode_universe",
@@ -29,8 +29,9 @@ def _parse_instance(row: Dict[str, str]) -> InstanceDefinition:
         enabled=_to_bool(row.get("enabled", "true")),
         universe=int(row.get("universe", "1")),
         start_address=int(row.get("start_address", "1")),
-        eos_ip=row.get("eos_ip", "127.0.0.1"),
+        eos_ip=(row.get("eos_ip") or "").strip() or "127.0.0.1",
         description=row.get("description") or None,
+        band=(row.get("band") or "").strip() or None,
     )
 
 
@@ -72,7 +72,7 @@ _PARAMETERS: tuple[ParameterDefinition, ...] = (
         dmx_slot_count=1,
         value_range=(20, 300),
         home_value=120,
-        description="Audio low-cut in Hz",
+        description="Audio low-cut in Hz (raw 0 = no cut)",
     ),
     ParameterDefinition(
         name="HighCut_Hz",
@@ -80,7 +80,7 @@ _PARAMETERS: tuple[ParameterDefinition, ...] = (
         dmx_slot_count=1,
         value_range=(2000, 8000),
         home_value=3500,
-        description="Audio high-cut in Hz",
+        description="Audio high-cut in Hz (raw 0 = no cut)",
     ),
     ParameterDefinition(
         name="Lag_ms",
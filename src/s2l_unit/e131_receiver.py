@@ -0,0 +1,298 @@
+"""Standalone E1.31 (sACN) receiver that bypasses the TouchDesigner CHOP path.
+
+The receiver listens on a UDP socket in a background thread, validates the
+root, framing and DMP layers and copies the DMX slots into a preallocated
+double buffer per universe. Consumers get a ``memoryview`` into the current
+front buffer, so handing the payload to ``decode_universe`` or
+``MultiUniverseDecoder`` does not copy it again.
+"""
+
+from __future__ import annotations
+
+import socket
+import struct
+import threading
+import uuid
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+E131_PORT = 5568
+DMX_SLOTS = 512
+MAX_PACKET_SIZE = 638  # 126 header bytes + 512 slots
+
+ACN_PACKET_IDENTIFIER = b"ASC-E1.17\x00\x00\x00"
+VECTOR_ROOT_E131_DATA = 0x00000004
+VECTOR_E131_DATA_PACKET = 0x00000002
+VECTOR_DMP_SET_PROPERTY = 0x02
+DMP_ADDRESS_DATA_TYPE = 0xA1
+
+OPTION_PREVIEW_DATA = 0x80
+OPTION_STREAM_TERMINATED = 0x40
+
+# Packets whose sequence number lies within this window behind the last one
+# are out of order and get dropped (E1.31 section 6.7.2).
+SEQUENCE_WINDOW = 20
+
+_HEADER_SIZE = 126
+_ROOT = struct.Struct("!HH12sHI16s")  # preamble, postamble, ACN id, flags/len, vector, CID
+_FRAMING = struct.Struct("!HI64sBHBBH")  # flags/len, vector, source, priority, sync, seq, options, universe
+_DMP = struct.Struct("!HBBHHHB")  # flags/len, vector, addr/data type, first addr, increment, count, start code
+
+FrameCallback = Callable[[int, memoryview], None]
+
+
+class E131PacketError(ValueError):
+    """Raised when a datagram is not a valid E1.31 data packet."""
+
+
+def multicast_group(universe: int) -> str:
+    """Return the multicast address for a universe (239.255.hi.lo)."""
+    if not 1 <= universe <= 63999:
+        raise ValueError(f"Invalid sACN universe {universe}")
+    return f"239.255.{universe >> 8}.{universe & 0xFF}"
+
+
+def parse_packet(packet: memoryview) -> Tuple[bytes, int, int, int, memoryview]:
+    """Validate an E1.31 data packet.
+
+    Returns ``(cid, universe, sequence, options, slots)`` where ``slots`` is a
+    view into ``packet`` (no copy).
+    """
+    size = len(packet)
+    if size < _HEADER_SIZE:
+        raise E131PacketError(f"packet too short ({size} bytes)")
+
+    preamble, postamble, acn_id, _, root_vector, cid = _ROOT.unpack_from(packet, 0)
+    if preamble != 0x0010 or postamble != 0x0000 or acn_id != ACN_PACKET_IDENTIFIER:
+        raise E131PacketError("invalid root layer preamble")
+    if root_vector != VECTOR_ROOT_E131_DATA:
+        raise E131PacketError(f"unsupported root vector {root_vector:#x}")
+
+    _, framing_vector, _, _, _, sequence, options, universe = _FRAMING.unpack_from(packet, 38)
+    if framing_vector != VECTOR_E131_DATA_PACKET:
+        raise E131PacketError(f"unsupported framing vector {framing_vector:#x}")
+    if not 1 <= universe <= 63999:
+        raise E131PacketError(f"invalid universe {universe}")
+
+    _, dmp_vector, addr_type, first_addr, increment, count, start_code = _DMP.unpack_from(packet, 115)
+    if dmp_vector != VECTOR_DMP_SET_PROPERTY or addr_type != DMP_ADDRESS_DATA_TYPE:
+        raise E131PacketError("invalid DMP layer")
+    if first_addr != 0x0000 or increment != 0x0001:
+        raise E131PacketError("invalid DMP addressing")
+    if start_code != 0x00:
+        raise E131PacketError(f"unsupported start code {start_code:#x}")
+
+    slot_count = count - 1
+    if slot_count < 0 or slot_count > DMX_SLOTS or _HEADER_SIZE + slot_count > size:
+        raise E131PacketError(f"invalid property count {count}")
+
+    return cid, universe, sequence, options, packet[_HEADER_SIZE:_HEADER_SIZE + slot_count]
+
+
+def is_out_of_order(last_sequence: Optional[int], sequence: int) -> bool:
+    """Apply the E1.31 sequence rule (drop when -20 < diff <= 0)."""
+    if last_sequence is None:
+        return False
+    diff = ((sequence - last_sequence + 128) & 0xFF) - 128
+    return -SEQUENCE_WINDOW < diff <= 0
+
+
+def build_packet(
+    universe: int,
+    slots: bytes,
+    *,
+    sequence: int = 0,
+    priority: int = 100,
+    options: int = 0,
+    source_name: str = "s2l_unit",
+    cid: bytes | None = None,
+) -> bytes:
+    """Build an E1.31 data packet (used by local packet generators and tests)."""
+    slots = bytes(slots[:DMX_SLOTS])
+    count = len(slots)
+    cid = cid or uuid.uuid4().bytes
+    name = source_name.encode("utf-8")[:63].ljust(64, b"\x00")
+    root = _ROOT.pack(
+        0x0010, 0x0000, ACN_PACKET_IDENTIFIER,
+        0x7000 | (_HEADER_SIZE + count - 16), VECTOR_ROOT_E131_DATA, cid,
+    )
+    framing = _FRAMING.pack(
+        0x7000 | (_HEADER_SIZE + count - 38), VECTOR_E131_DATA_PACKET, name,
+        priority, 0, sequence & 0xFF, options, universe,
+    )
+    dmp = _DMP.pack(
+        0x7000 | (_HEADER_SIZE + count - 115), VECTOR_DMP_SET_PROPERTY,
+        DMP_ADDRESS_DATA_TYPE, 0x0000, 0x0001, count + 1, 0x00,
+    )
+    return root + framing + dmp + slots
+
+
+class _UniverseBuffer:
+    """Double buffer for one universe; the receiver thread writes the back half."""
+
+    __slots__ = ("buffers", "views", "front", "generation")
+
+    def __init__(self) -> None:
+        self.buffers = (bytearray(DMX_SLOTS), bytearray(DMX_SLOTS))
+        self.views = (memoryview(self.buffers[0]), memoryview(self.buffers[1]))
+        self.front = 0
+        self.generation = 0
+
+    def write(self, slots: memoryview) -> memoryview:
+        back = 1 - self.front
+        view = self.views[back]
+        count = len(slots)
+        view[:count] = slots
+        if count < DMX_SLOTS:
+            view[count:] = bytes(DMX_SLOTS - count)
+        self.front = back
+        self.generation += 1
+        return view
+
+
+class E131Receiver:
+    """Receive E1.31 data in a background thread.
+
+    Only the universes passed to the constructor are buffered. ``poll()`` is
+    meant to be called once per frame from the main thread and returns a
+    ``memoryview`` for each universe that received new data since the last
+    poll. The view stays valid until the second packet after it arrives, which
+    is plenty for decoding within the same frame.
+    """
+
+    def __init__(
+        self,
+        universes: Iterable[int],
+        *,
+        bind_address: str = "",
+        port: int = E131_PORT,
+        multicast: bool = True,
+        interface: str = "0.0.0.0",
+        on_frame: FrameCallback | None = None,
+    ) -> None:
+        self._buffers: Dict[int, _UniverseBuffer] = {
+            int(universe): _UniverseBuffer() for universe in universes
+        }
+        if not self._buffers:
+            raise ValueError("E131Receiver needs at least one universe")
+        self._bind_address = bind_address
+        self._port = port
+        self._multicast = multicast
+        self._interface = interface
+        self._on_frame = on_frame
+        self._sequences: Dict[Tuple[bytes, int], int] = {}
+        self._polled: Dict[int, int] = {universe: 0 for universe in self._buffers}
+        self._recv_buffer = bytearray(MAX_PACKET_SIZE)
+        self._recv_view = memoryview(self._recv_buffer)
+        self._sock: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.packets = 0
+        self.dropped_out_of_order = 0
+        self.invalid = 0
+
+    # Public API ---------------------------------------------------------
+
+    @property
+    def universes(self) -> Tuple[int, ...]:
+        return tuple(self._buffers)
+
+    @property
+    def address(self) -> Tuple[str, int] | None:
+        """Bound socket address (useful when binding to port 0)."""
+        return self._sock.getsockname() if self._sock else None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._sock = self._open_socket()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="e131-receiver", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def view(self, universe: int) -> memoryview | None:
+        """Return the latest slots of a universe without copying."""
+        buf = self._buffers.get(universe)
+        return buf.views[buf.front] if buf else None
+
+    def poll(self) -> Dict[int, memoryview]:
+        """Return views for universes that received data since the last poll."""
+        fresh: Dict[int, memoryview] = {}
+        for universe, buf in self._buffers.items():
+            generation = buf.generation
+            if generation != self._polled[universe]:
+                self._polled[universe] = generation
+                fresh[universe] = buf.views[buf.front]
+        return fresh
+
+    def feed(self, packet: memoryview | bytes) -> bool:
+        """Process one datagram; returns True when it updated a buffer."""
+        try:
+            cid, universe, sequence, options, slots = parse_packet(memoryview(packet))
+        except E131PacketError:
+            self.invalid += 1
+            return False
+        buf = self._buffers.get(universe)
+        if buf is None:
+            return False
+        key = (cid, universe)
+        if is_out_of_order(self._sequences.get(key), sequence):
+            self.dropped_out_of_order += 1
+            return False
+        self._sequences[key] = sequence
+        if options & (OPTION_PREVIEW_DATA | OPTION_STREAM_TERMINATED):
+            return False
+        self.packets += 1
+        view = buf.write(slots)
+        if self._on_frame is not None:
+            self._on_frame(universe, view)
+        return True
+
+    # Internal helpers ---------------------------------------------------
+
+    def _open_socket(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self._bind_address, self._port))
+        if self._multicast:
+            iface = socket.inet_aton(self._interface)
+            for universe in self._buffers:
+                group = socket.inet_aton(multicast_group(universe))
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, group + iface)
+        sock.settimeout(0.25)
+        return sock
+
+    def _run(self) -> None:
+        sock = self._sock
+        view = self._recv_view
+        while not self._stop.is_set() and sock is not None:
+            try:
+                size = sock.recv_into(self._recv_buffer)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.feed(view[:size])
+
+
+__all__ = [
+    "E131PacketError",
+    "E131Receiver",
+    "E131_PORT",
+    "build_packet",
+    "is_out_of_order",
+    "multicast_group",
+    "parse_packet",
+]
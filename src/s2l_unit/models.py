@@ -28,6 +28,7 @@ class InstanceDefinition:
     start_address: int
     eos_ip: str
     description: str | None = None
+    band: str | None = None  # audio_analysis channel that drives this instance
 
     def dmx_range(self, slots_per_instance: int) -> Tuple[int, int]:
         """Return (start, end) DMX slot numbers for this instance."""
@@ -0,0 +1,113 @@
+"""Shared per-frame DMX snapshot service for all S2L consumers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from .universe_index import MultiUniverseDecoder, Payload
+
+
+@dataclass(frozen=True)
+class DMXSnapshot:
+    """Immutable decoded state of one universe at a given frame."""
+
+    universe: int
+    frame: int
+    sequence: int
+    values: Mapping[str, Mapping[str, int]]
+
+
+SnapshotConsumer = Callable[[DMXSnapshot], None]
+
+
+def _freeze(values: Dict[str, Dict[str, int]]) -> Mapping[str, Mapping[str, int]]:
+    return MappingProxyType(
+        {instance: MappingProxyType(params) for instance, params in values.items()}
+    )
+
+
+class DMXSnapshotService:
+    """Decode each universe at most once per frame and fan out the result.
+
+    Every registered consumer receives the same ``DMXSnapshot`` object, so
+    adding consumers does not add decoding work. Only universes whose payload
+    changed produce a new snapshot (and a new sequence id).
+    """
+
+    def __init__(self, decoder: MultiUniverseDecoder) -> None:
+        self._decoder = decoder
+        self._consumers: List[SnapshotConsumer] = []
+        self._latest: Dict[int, DMXSnapshot] = {}
+        self._sequences: Dict[int, int] = {}
+        self._frame: Optional[int] = None
+        self.consumer_errors: List[Tuple[SnapshotConsumer, Exception]] = []
+
+    @property
+    def decoder(self) -> MultiUniverseDecoder:
+        return self._decoder
+
+    @property
+    def frame(self) -> Optional[int]:
+        """Frame number of the last publish, ``None`` before the first one."""
+        return self._frame
+
+    def has_frame(self, frame: int) -> bool:
+        return self._frame == frame
+
+    def register(self, consumer: SnapshotConsumer) -> None:
+        if consumer not in self._consumers:
+            self._consumers.append(consumer)
+
+    def unregister(self, consumer: SnapshotConsumer) -> None:
+        if consumer in self._consumers:
+            self._consumers.remove(consumer)
+
+    def latest(self, universe: int) -> Optional[DMXSnapshot]:
+        return self._latest.get(universe)
+
+    def reset(self) -> None:
+        """Forget published snapshots so the next publish decodes everything."""
+        self._decoder.reset()
+        self._latest.clear()
+        self._frame = None
+
+    def publish(self, frame: Optional[int], payloads: Mapping[int, Payload]) -> List[DMXSnapshot]:
+        """Decode changed universes for ``frame`` and notify consumers.
+
+        A second call for the same frame is a no-op. ``frame=None`` forces a
+        decode (manual/debug calls) and stamps the last known frame.
+        """
+        if frame is not None:
+            if frame == self._frame:
+                return []
+            self._frame = frame
+        stamp = self._frame if self._frame is not None else 0
+
+        decoded = self._decoder.decode_changed(payloads)
+        snapshots: List[DMXSnapshot] = []
+        for universe, values in decoded.items():
+            sequence = self._sequences.get(universe, 0) + 1
+            self._sequences[universe] = sequence
+            snapshot = DMXSnapshot(
+                universe=universe, frame=stamp, sequence=sequence, values=_freeze(values)
+            )
+            self._latest[universe] = snapshot
+            snapshots.append(snapshot)
+
+        self.consumer_errors.clear()
+        for snapshot in snapshots:
+            for consumer in tuple(self._consumers):
+                try:
+                    consumer(snapshot)
+                except Exception as exc:  # keep one faulty consumer from starving the rest
+                    self.consumer_errors.append((consumer, exc))
+        return snapshots
+
+
+__all__ = [
+    "DMXSnapshot",
+    "DMXSnapshotService",
+    "SnapshotConsumer",
+]
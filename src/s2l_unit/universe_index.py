@@ -0,0 +1,111 @@
+"""Universe → decode-plan index for multi-universe S2L ingest."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Mapping, Tuple, Union
+
+from .config_loader import DMX_SLOTS_PER_INSTANCE
+from .dmx_parser import DMXBufferError, decode_instance
+from .models import InstanceDefinition
+
+Payload = Union[bytes, bytearray, memoryview]
+
+
+@dataclass(frozen=True)
+class DecodePlan:
+    """All enabled instances that live in one sACN universe."""
+
+    universe: int
+    instances: Tuple[InstanceDefinition, ...]
+    required_slots: int
+
+    def decode(self, buffer: Payload, *, scaling: bool = True) -> Dict[str, Dict[str, int]]:
+        """Decode every instance of this plan from one universe payload."""
+        if len(buffer) < self.required_slots:
+            raise DMXBufferError(
+                f"Universe {self.universe}: need {self.required_slots} slots, "
+                f"buffer has {len(buffer)}"
+            )
+        return {
+            inst.instance: decode_instance(
+                buffer, inst, slots_per_instance=DMX_SLOTS_PER_INSTANCE, scaling=scaling
+            )
+            for inst in self.instances
+        }
+
+
+def build_universe_index(
+    instances: Iterable[InstanceDefinition],
+    *,
+    enabled_only: bool = True,
+) -> Dict[int, DecodePlan]:
+    """Group instances by universe into prebuilt decode plans."""
+    grouped: Dict[int, list[InstanceDefinition]] = {}
+    for inst in instances:
+        if enabled_only and not inst.enabled:
+            continue
+        grouped.setdefault(inst.universe, []).append(inst)
+
+    index: Dict[int, DecodePlan] = {}
+    for universe in sorted(grouped):
+        members = tuple(sorted(grouped[universe], key=lambda inst: inst.start_address))
+        required = max(inst.dmx_range(DMX_SLOTS_PER_INSTANCE)[1] for inst in members)
+        index[universe] = DecodePlan(universe=universe, instances=members, required_slots=required)
+    return index
+
+
+class MultiUniverseDecoder:
+    """Decode several universes per frame, skipping payloads that did not change."""
+
+    def __init__(self, index: Mapping[int, DecodePlan], *, scaling: bool = True) -> None:
+        self._index = dict(index)
+        self._scaling = scaling
+        self._last_payloads: Dict[int, bytes] = {}
+        self.errors: Dict[int, DMXBufferError] = {}
+
+    @property
+    def universes(self) -> Tuple[int, ...]:
+        return tuple(self._index)
+
+    def plan_for(self, universe: int) -> DecodePlan | None:
+        return self._index.get(universe)
+
+    def reset(self, index: Mapping[int, DecodePlan] | None = None) -> None:
+        """Forget cached payloads, optionally swapping in a new index."""
+        if index is not None:
+            self._index = dict(index)
+        self._last_payloads.clear()
+
+    def decode_changed(
+        self, payloads: Mapping[int, Payload]
+    ) -> Dict[int, Dict[str, Dict[str, int]]]:
+        """Return decoded values for every universe whose payload changed.
+
+        Universes without a plan or with an identical payload to the previous
+        call are skipped. Short buffers are skipped as well and reported in
+        ``errors`` so one bad universe does not block the others.
+        """
+        decoded: Dict[int, Dict[str, Dict[str, int]]] = {}
+        self.errors.clear()
+        for universe, payload in payloads.items():
+            plan = self._index.get(universe)
+            if plan is None or not payload:
+                continue
+            last = self._last_payloads.get(universe)
+            if last is not None and last == payload:
+                continue
+            try:
+                decoded[universe] = plan.decode(payload, scaling=self._scaling)
+            except DMXBufferError as exc:
+                self.errors[universe] = exc
+                continue
+            self._last_payloads[universe] = bytes(payload)
+        return decoded
+
+
+__all__ = [
+    "DecodePlan",
+    "MultiUniverseDecoder",
+    "build_universe_index",
+]
@@ -28,8 +28,8 @@ print(f"\nCounts: {dict(st.counts)}")
 print("\nQueues:")
 for ptype in state_mod.ORDER:
     queue = list(st.queues[ptype])
-    active = st.active[ptype]
-    print(f"  {ptype}: active={active}, queue={queue[:10]}{'...' if len(queue) > 10 else ''} ({len(queue)} total)")
+    in_flight = sorted(st.windows[ptype].in_flight)
+    print(f"  {ptype}: in_flight={in_flight}, queue={queue[:10]}{'...' if len(queue) > 10 else ''} ({len(queue)} total)")
 
 # Check tables
 print("\nTables:")
@@ -50,10 +50,12 @@ print(f"\nLast activity: {now - st.last_activity:.1f}s ago")
 print(f"Last subscribe: {now - st.last_subscribe:.1f}s ago")
 print(f"Last count request: {now - st.last_count_request:.1f}s ago")
 
-# Show sent timestamps
-print("\nLast request sent:")
+# Show fetch windows
+print("\nFetch windows:")
 for ptype in state_mod.ORDER:
-    if st.sent_at[ptype] > 0:
-        print(f"  {ptype}: {now - st.sent_at[ptype]:.1f}s ago (attempts: {st.attempts[ptype]})")
+    window = st.windows[ptype]
+    rtt = f"{window.srtt * 1000:.0f}ms" if window.srtt is not None else "n/a"
+    print(f"  {ptype}: window={window.window}, rtt={rtt}, timeout={window.timeout:.2f}s, "
+          f"done={window.completed}, failed={window.failed}")
 
 print("\n=== END DEBUG ===\n")
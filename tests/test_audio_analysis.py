@@ -0,0 +1,112 @@
+"""Tests for the PCM band-energy / onset analysis on synthetic WAV files."""
+
+import sys
+import wave
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+MANAGER_PATH = BASE_PATH / "src" / "s2l_manager"
+if str(MANAGER_PATH) not in sys.path:
+    sys.path.insert(0, str(MANAGER_PATH))
+
+import numpy as np  # noqa: E402
+
+import audio_analysis as analysis  # noqa: E402
+
+RATE = 44100
+KICKS = (0.5, 1.0, 1.5)
+SNARES = (0.75, 1.25)
+
+
+def _burst(signal, start, make):
+    i = int(start * RATE)
+    t = np.arange(int(0.1 * RATE)) / RATE
+    signal[i:i + len(t)] += make(t) * np.exp(-t / 0.03)
+
+
+def _write_wav(path, samples, width=2):
+    scale = float(1 << (8 * width - 1)) - 1
+    ints = np.round(np.clip(samples, -1.0, 1.0) * scale).astype("<i4")
+    raw = ints.astype("<i2").tobytes() if width == 2 else ints.view(np.uint8).reshape(-1, 4)[:, :width].tobytes()
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(width)
+        wav.setframerate(RATE)
+        wav.writeframes(raw)
+
+
+def _test_signal():
+    t = np.arange(2 * RATE) / RATE
+    signal = 0.5 * np.sin(2 * np.pi * 100 * t)
+    rng = np.random.default_rng(0)
+    for start in KICKS:
+        _burst(signal, start, lambda t: 0.8 * np.sin(2 * np.pi * 60 * t))
+    for start in SNARES:
+        _burst(signal, start, lambda t: 0.4 * rng.standard_normal(len(t)))
+    return signal
+
+
+def test_wav_reader_roundtrip(tmp_path):
+    signal = _test_signal()
+    for width in (2, 3):
+        path = tmp_path / f"test_{width}.wav"
+        _write_wav(path, signal, width)
+        samples, rate = analysis.read_wav(path)
+        assert rate == RATE
+        np.testing.assert_allclose(samples, np.clip(signal, -1, 1), atol=1e-4)
+        blocks = [block for block, _ in analysis.iter_wav_blocks(path, 1000)]
+        np.testing.assert_allclose(np.concatenate(blocks), samples)
+
+
+def test_band_levels_follow_spectrum():
+    analyzer = analysis.BandAnalyzer(RATE)
+    analyzer.set_ranges([(20.0, 250.0), (120.0, 250.0), (2000.0, 8000.0)])
+    t = np.arange(RATE // 2) / RATE
+    analyzer.feed(0.5 * np.sin(2 * np.pi * 100 * t))
+
+    # half-scale sine = -6 dB → 1 - 6/60
+    assert abs(analyzer.channel("low") - 0.9) < 0.01
+    assert analyzer.channel("high") < 0.05
+    low, cut, high = analyzer.range_levels
+    assert abs(low - analyzer.channel("low")) < 1e-9
+    assert cut < low - 0.2  # LowCut above the tone removes most of it
+    assert high < 0.05
+
+
+def test_onsets_detected_in_streamed_wav(tmp_path):
+    path = tmp_path / "beat.wav"
+    _write_wav(path, _test_signal())
+    events = []
+
+    def on_frame(a):
+        now = a.frames * a.frame_time
+        events.extend((name, now) for name, hit in zip(("kick", "snare"), a.onsets) if hit)
+
+    analyzer = analysis.BandAnalyzer(RATE, on_frame=on_frame)
+    for block, _ in analysis.iter_wav_blocks(path, 777):
+        analyzer.feed(block)
+
+    kicks = [when for name, when in events if name == "kick"]
+    snares = [when for name, when in events if name == "snare"]
+    assert len(kicks) == len(KICKS) and len(snares) == len(SNARES)
+    assert all(abs(got - want) < 0.05 for got, want in zip(kicks, KICKS))
+    assert all(abs(got - want) < 0.05 for got, want in zip(snares, SNARES))
+
+
+def test_block_size_does_not_change_results():
+    signal = _test_signal()[:RATE]
+    a = analysis.BandAnalyzer(RATE)
+    b = analysis.BandAnalyzer(RATE)
+    a.feed(signal)
+    for start in range(0, len(signal), 333):
+        b.feed(signal[start:start + 333])
+    assert a.frames == b.frames
+    np.testing.assert_allclose(a.channels, b.channels)
+
+
+def test_spectrum_is_computed_into_the_preallocated_buffer():
+    analyzer = analysis.BandAnalyzer(RATE)
+    spectrum = analyzer._spectrum
+    analyzer.feed(_test_signal()[:analyzer.fft_size])
+    assert analyzer._spectrum is spectrum
+    np.testing.assert_allclose(spectrum, np.fft.rfft(analyzer._buffer * np.hanning(analyzer.fft_size)))
@@ -0,0 +1,148 @@
+"""Tests for the vectorized audio → submaster processing (no TouchDesigner needed)."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+SRC_PATH = BASE_PATH / "src"
+MANAGER_PATH = SRC_PATH / "s2l_manager"
+for path in (SRC_PATH, MANAGER_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import numpy as np  # noqa: E402
+
+import audio_eos_mapper as mapper  # noqa: E402
+from eos_osc import OutputCache, OutputPool  # noqa: E402
+
+
+def test_vectorized_params_match_scalar_version():
+    raw = np.array([0.0, 0.2, 0.5, 0.9, 0.45])
+    sensitivity = np.array([100.0, 50.0, 100.0, 80.0, 100.0])
+    threshold = np.array([0.0, 20.0, 40.0, 10.0, 45.0])
+
+    levels = mapper.apply_s2l_params_array(raw, sensitivity, threshold)
+    expected = [
+        mapper._apply_s2l_params(float(r), sensitivity=float(s), threshold=float(t))
+        for r, s, t in zip(raw, sensitivity, threshold)
+    ]
+    np.testing.assert_allclose(levels, expected)
+
+
+def test_full_threshold_does_not_divide_by_zero():
+    levels = mapper.apply_s2l_params_array(np.array([1.0]), np.array([100.0]), np.array([100.0]))
+    assert 0.0 <= levels[0] <= 1.0
+
+
+def test_missing_channels_stay_nan():
+    levels = mapper.apply_s2l_params_array(
+        np.array([np.nan, 0.5]), np.array([100.0, 100.0]), np.array([0.0, 0.0])
+    )
+    assert np.isnan(levels[0])
+    assert levels[1] == 0.5
+
+
+def test_lag_filter_follows_time_constant():
+    from audio_smoothing import SmoothingBank
+
+    bank = SmoothingBank(2)
+    bank.set_params(np.array([100.0, 0.0]), np.array([0.0, 0.0]))
+    target = np.array([1.0, 1.0])
+    for _ in range(10):  # 10 frames of 10 ms = one time constant
+        out = bank.step(target, 0.01)
+    assert np.isclose(out[0], 1.0 - np.exp(-1.0), atol=1e-6)
+    assert out[1] == 1.0  # Lag_ms = 0 passes through
+
+
+def test_min_hold_keeps_peak_then_releases():
+    from audio_smoothing import SmoothingBank
+
+    bank = SmoothingBank(1)
+    bank.set_params(np.array([0.0]), np.array([0.5]))
+    bank.step(np.array([0.8]), 0.02)
+    for _ in range(20):  # 0.4 s < MinHold
+        out = bank.step(np.array([0.1]), 0.02)
+    assert out[0] == 0.8
+    for _ in range(10):  # hold expires after 0.5 s
+        out = bank.step(np.array([0.1]), 0.02)
+    assert np.isclose(out[0], 0.1)
+
+
+def test_release_after_hold_is_first_order_with_lag():
+    from audio_smoothing import SmoothingBank
+
+    bank = SmoothingBank(1)
+    bank.set_params(np.array([0.0]), np.array([0.0]))
+    bank.step(np.array([1.0]), 0.01)
+    bank.set_params(np.array([100.0]), np.array([0.0]))
+    for _ in range(10):  # one time constant of release
+        out = bank.step(np.array([0.0]), 0.01)
+    assert np.isclose(out[0], np.exp(-1.0), atol=1e-6)
+
+
+def test_missing_input_keeps_state():
+    from audio_smoothing import SmoothingBank
+
+    bank = SmoothingBank(1)
+    bank.set_params(np.array([0.0]), np.array([0.0]))
+    bank.step(np.array([0.6]), 0.02)
+    out = bank.step(np.array([np.nan]), 0.02)
+    assert out[0] == 0.6
+
+
+def test_level_reaching_zero_is_offered_below_min_change(monkeypatch):
+    sent = []
+    monkeypatch.setattr(
+        mapper, "send_submaster_level",
+        lambda sub, level, now=None, eos_ip=None: sent.append((sub, level)) or True,
+    )
+    last = np.array([0.008, 0.5])
+    mapper.send_level_changes(np.array([1, 2]), np.array([0.0, 0.505]), last, now=0.0)
+    assert sent == [(1, 0.0)]
+    assert last[0] == 0.0 and last[1] == 0.5
+
+
+class _OscOut:
+    def __init__(self, sent):
+        self.sent = sent
+
+    def sendOSC(self, address, values):
+        self.sent.append((address, list(values)))
+
+
+def _menu_engine(osc_out):
+    spec = importlib.util.spec_from_file_location("menu_engine_under_test", BASE_PATH / "menus" / "menu_engine.py")
+    module = importlib.util.module_from_spec(spec)
+    module.op = lambda path: osc_out if path == "/project1/io/oscout1" else None
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_mapper_and_menu_share_the_cache_entry_of_a_main_console_sub(monkeypatch):
+    sent = []
+    oscout1 = _OscOut(sent)
+    pool = OutputPool(lambda ip: oscout1.sendOSC if ip == "" else None)
+    cache = OutputCache(clock=lambda: 0.0)
+    monkeypatch.setattr(mapper, "get_pool", lambda: pool)
+    monkeypatch.setattr(mapper, "get_cache", lambda: cache)
+    menu = _menu_engine(oscout1)
+    monkeypatch.setattr(menu, "_output_cache", lambda: cache)
+
+    mapper.send_submaster_level(5, 0.5, now=0.0, eos_ip="127.0.0.1")  # routes
+    menu._send_osc_value("/eos/sub/5", [0.5])                         # fader
+    mapper.send_submaster_level(5, 0.5, now=0.0)                      # channel mapping
+    pool.flush()
+    assert sent == [("/eos/sub/5", [0.5])]
+
+
+def test_secondary_console_sub_has_its_own_cache_entry(monkeypatch):
+    sent = []
+    pool = OutputPool(lambda ip: (lambda address, values: sent.append((ip, address))))
+    cache = OutputCache(clock=lambda: 0.0)
+    monkeypatch.setattr(mapper, "get_pool", lambda: pool)
+    monkeypatch.setattr(mapper, "get_cache", lambda: cache)
+    mapper.send_submaster_level(5, 0.5, now=0.0)
+    mapper.send_submaster_level(5, 0.5, now=0.0, eos_ip="10.0.0.2")
+    pool.flush()
+    assert sent == [("", "/eos/sub/5"), ("10.0.0.2", "/eos/sub/5")]
@@ -0,0 +1,190 @@
+"""Tests for per-instance audio routing (no TouchDesigner needed)."""
+
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+SRC_PATH = BASE_PATH / "src"
+MANAGER_PATH = SRC_PATH / "s2l_manager"
+for path in (SRC_PATH, MANAGER_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import numpy as np  # noqa: E402
+
+import audio_eos_mapper as mapper  # noqa: E402
+from audio_routing import AudioRouter, build_routes  # noqa: E402
+from s2l_manager.dispatcher import ChangeEvent  # noqa: E402
+from s2l_unit.models import InstanceDefinition  # noqa: E402
+
+
+class _Source:
+    """Dispatcher stand-in: decoded values plus instances.csv rows."""
+
+    def __init__(self, values, bands):
+        self.values = values
+        self.bands = bands
+        self.version = 1
+
+    def instances(self):
+        return tuple(self.values)
+
+    def current_values(self, instance):
+        return self.values[instance]
+
+    def definition(self, instance):
+        return InstanceDefinition(
+            instance=instance, enabled=True, universe=16, start_address=1,
+            eos_ip="127.0.0.1", band=self.bands.get(instance),
+        )
+
+    def layout_version(self):
+        return self.version
+
+
+class _Chan:
+    def __init__(self, index):
+        self.index = index
+
+
+class _Chop:
+    id = 1
+    path = "/audio_analysis"
+
+    def __init__(self, levels):
+        self.names = list(levels)
+        self.data = np.array([[v] for v in levels.values()], dtype=np.float32)
+        self.numChans = len(self.names)
+
+    def __getitem__(self, name):
+        return _Chan(self.names.index(name)) if name in self.names else None
+
+    def numpyArray(self):
+        return self.data
+
+
+def _unit(sub, sensitivity=255, threshold=0):
+    """Raw DMX values as the dispatcher stores them (255 = 100 % sensitivity)."""
+    return {"Submaster": sub, "Sensitivity": sensitivity, "Threshold": threshold,
+            "Lag_ms": 0, "MinHold_s": 0}
+
+
+def test_routes_use_decoded_submaster_and_band():
+    source = _Source(
+        {"S2L_UNIT_1": _unit(21), "S2L_UNIT_2": _unit(0), "S2L_UNIT_3": _unit(23, 51)},
+        {"S2L_UNIT_1": "kick", "S2L_UNIT_3": "high"},
+    )
+    routes = build_routes(source)
+    assert [(r.instance, r.band, r.submaster) for r in routes] == [
+        ("S2L_UNIT_1", "kick", 21),
+        ("S2L_UNIT_3", "high", 23),
+    ]
+    assert routes[1].params["Sensitivity"] == 20.0
+    assert routes[1].params["Lag_ms"] == 0.0
+    assert routes[1].params["HighCut_Hz"] == float("inf")  # unset = no cut
+
+
+def test_raw_dmx_parameters_are_scaled_to_their_units():
+    raw = {"Submaster": 5, "Sensitivity": 255, "Threshold": 51, "Lag_ms": 102, "MinHold_s": 255}
+    (route,) = build_routes(_Source({"A": raw}, {}))
+    assert route.submaster == 5
+    assert route.params["Sensitivity"] == 100.0
+    assert route.params["Threshold"] == 20.0
+    assert route.params["Lag_ms"] == 200.0
+    assert route.params["MinHold_s"] == 8.0
+
+
+def test_high_cut_raw_one_is_the_lowest_cut_and_raw_zero_none():
+    low = dict(_unit(1), HighCut_Hz=1)
+    off = dict(_unit(2), HighCut_Hz=0)
+    routes = build_routes(_Source({"A": low, "B": off}, {}))
+    assert round(routes[0].params["HighCut_Hz"]) == 2024
+    assert routes[1].params["HighCut_Hz"] == float("inf")
+
+
+def test_cut_ranges_scale_raw_dmx_and_treat_zero_as_no_cut():
+    source = _Source(
+        {
+            "A": dict(_unit(1), LowCut_Hz=255, HighCut_Hz=0),   # 300 Hz .. no cut
+            "B": dict(_unit(2), LowCut_Hz=0, HighCut_Hz=255),   # no cut .. 8000 Hz
+            "C": dict(_unit(3), LowCut_Hz=0, HighCut_Hz=0),
+        },
+        {"A": "mid", "B": "high", "C": "low"},
+    )
+    router = AudioRouter(source)
+    router.refresh()
+    assert router.cut_ranges() == [(300.0, 4000.0), (4000.0, 8000.0), (20.0, 250.0)]
+
+
+def test_each_instance_drives_its_own_submaster(monkeypatch):
+    sent = {}
+    monkeypatch.setattr(
+        mapper, "send_submaster_level", lambda sub, level, now=None, eos_ip=None: sent.__setitem__(sub, level) or True
+    )
+    source = _Source(
+        {"A": _unit(11), "B": _unit(12, sensitivity=102), "C": _unit(11)},
+        {"A": "low", "B": "low", "C": "kick"},
+    )
+    router = AudioRouter(source)
+    levels = router.process(_Chop({"low": 0.6, "kick": 0.9}), now=0.0)
+
+    assert list(router.subs) == [11, 12]
+    np.testing.assert_allclose(levels, [0.9, 0.24], rtol=1e-6)  # sub 11 = max(A, C)
+    assert sent.keys() == {11, 12}
+
+
+def test_routing_rebuilds_only_on_routing_changes():
+    source = _Source({"A": _unit(11)}, {"A": "low"})
+    router = AudioRouter(source)
+    assert router.refresh()
+    assert not router.refresh()
+
+    router.on_changes([ChangeEvent("A", "FX_Select", 1, 2, 5)])
+    assert not router.refresh()
+
+    source.values["A"]["Submaster"] = 40
+    router.on_changes([ChangeEvent("A", "Submaster", 11, 40, 6)])
+    assert router.refresh()
+    assert list(router.subs) == [40]
+
+    source.version += 1  # instances.csv reloaded
+    assert router.refresh()
+
+
+def test_analysis_levels_honour_low_and_high_cut():
+    from audio_analysis import BandAnalyzer
+
+    cut = dict(_unit(12), LowCut_Hz=119, HighCut_Hz=255)  # ~150 Hz .. 8000 Hz
+    source = _Source({"A": _unit(11), "B": cut, "C": _unit(13)}, {"A": "low", "B": "low", "C": "kick"})
+    router = AudioRouter(source)
+    analyzer = BandAnalyzer(44100)
+    router.analysis_levels(analyzer, now=0.0)  # first call hands the cut ranges to the analyzer
+
+    t = np.arange(22050) / 44100
+    analyzer.feed(0.5 * np.sin(2 * np.pi * 100 * t))
+    a, b, c = router.analysis_levels(analyzer, now=0.01)
+    assert a > 0.8
+    assert b < a - 0.2
+    assert c == 0.0  # no onsets in a steady tone
+
+
+def test_same_submaster_on_two_consoles_stays_separate(monkeypatch):
+    from eos_osc import OutputCache, OutputPool
+
+    wires = {}
+    pool = OutputPool(lambda ip: lambda address, values: wires.setdefault(ip, []).append((address, values)))
+    monkeypatch.setattr(mapper, "get_pool", lambda: pool)
+    monkeypatch.setattr(mapper, "get_cache", lambda cache=OutputCache(): cache)
+
+    source = _Source({"A": _unit(11), "B": _unit(11, sensitivity=102)}, {"A": "low", "B": "low"})
+    source.definition = lambda instance: InstanceDefinition(
+        instance=instance, enabled=True, universe=16, start_address=1,
+        eos_ip={"A": "127.0.0.1", "B": "10.0.0.2"}[instance], band="low",
+    )
+    router = AudioRouter(source)
+    router.process(_Chop({"low": 0.6}), now=0.0)
+    pool.flush()
+
+    assert list(router.subs) == [11, 11]
+    assert [(a, round(v[0], 3)) for a, v in wires[""]] == [("/eos/sub/11", 0.6)]
+    assert [(a, round(v[0], 3)) for a, v in wires["10.0.0.2"]] == [("/eos/sub/11", 0.24)]
@@ -0,0 +1,99 @@
+"""Tests for the streaming beat clock and beat-synced cue stepping."""
+
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+SRC_PATH = BASE_PATH / "src"
+MANAGER_PATH = SRC_PATH / "s2l_manager"
+for path in (SRC_PATH, MANAGER_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import audio_eos_mapper as mapper  # noqa: E402
+from beat_clock import BeatClock, BeatCueScheduler  # noqa: E402
+
+FRAME_RATE = 86.0
+
+
+def _click_track(clock, bpm, seconds):
+    period = FRAME_RATE * 60.0 / bpm
+    beats = []
+    next_click = 10.0
+    for frame in range(int(FRAME_RATE * seconds)):
+        strength = 0.0
+        if frame >= next_click:
+            strength = 1.0
+            next_click += period
+        if clock.update(strength):
+            beats.append(frame)
+    return beats
+
+
+def test_tempo_converges_on_click_track():
+    for bpm in (95.0, 128.0, 150.0):
+        clock = BeatClock(FRAME_RATE)
+        beats = _click_track(clock, bpm, 20)
+        assert abs(clock.bpm - bpm) < 2.0
+        recent = beats[-9:]
+        measured = 60.0 * FRAME_RATE * (len(recent) - 1) / (recent[-1] - recent[0])
+        assert abs(measured - bpm) < 2.0
+
+
+def test_update_cost_is_bounded_by_lag_range():
+    clock = BeatClock(FRAME_RATE)
+    _click_track(clock, 120.0, 30)
+    assert len(clock._history) == clock.max_lag + 1
+    assert clock.frames == int(FRAME_RATE * 30)
+
+
+def test_bars_and_downbeats():
+    clock = BeatClock(FRAME_RATE)
+    downbeats = []
+    clock.on_beat = lambda c: downbeats.append(c.downbeat)
+    _click_track(clock, 120.0, 10)
+    assert clock.bars == (clock.beats + 3) // 4
+    assert downbeats[:8] == [True, False, False, False] * 2
+
+
+class _Source:
+    def __init__(self, values):
+        self.values = values
+
+    def instances(self):
+        return tuple(self.values)
+
+    def current_values(self, instance):
+        return self.values[instance]
+
+    def definition(self, instance):
+        return None
+
+    def layout_version(self):
+        return 1
+
+
+class _Beats:
+    beats = 0
+
+
+def _run(scheduler, beats):
+    clock = _Beats()
+    for beat in range(1, beats + 1):
+        clock.beats = beat
+        scheduler.on_beat(clock)
+
+
+def test_bar_mode_and_beat_mode_step_cues(monkeypatch):
+    fired = []
+    monkeypatch.setattr(mapper, "send_cue_go", lambda cuelist, cue=None, eos_ip=None: fired.append((cuelist, cue)) or True)
+    scheduler = BeatCueScheduler(_Source({
+        "BAR": {"Cuelist": 5, "StartCue": 1, "EndCue": 3, "Mode": 1001, "FX_Auto": 0},
+        "BEAT": {"Cuelist": 7, "StartCue": 0, "EndCue": 0, "Mode": 0, "FX_Auto": 1},
+        "OFF": {"Cuelist": 9, "StartCue": 1, "EndCue": 2, "Mode": 3, "FX_Auto": 0},
+    }))
+    _run(scheduler, 16)
+
+    assert [cue for cuelist, cue in fired if cuelist == 5] == [1, 2, 3, 1]
+    assert [cue for cuelist, cue in fired if cuelist == 7] == [None] * 16
+    assert not [f for f in fired if f[0] == 9]
@@ -0,0 +1,100 @@
+"""Tests for the standalone E1.31 receiver using a local packet generator."""
+
+import socket
+import sys
+import time
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+SRC_PATH = BASE_PATH / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+import pytest  # noqa: E402
+
+from s2l_unit import e131_receiver as e131  # noqa: E402
+
+CID = bytes(range(16))
+
+
+def test_parse_packet_roundtrip():
+    packet = e131.build_packet(16, bytes([1, 2, 3]), sequence=7, cid=CID)
+    cid, universe, sequence, options, slots = e131.parse_packet(memoryview(packet))
+    assert (cid, universe, sequence, options) == (CID, 16, 7, 0)
+    assert bytes(slots) == b"\x01\x02\x03"
+
+
+@pytest.mark.parametrize(
+    "offset, value",
+    [(4, 0x00), (21, 0x08), (43, 0x03), (117, 0x01), (125, 0xDD)],
+)
+def test_parse_packet_rejects_invalid_layers(offset, value):
+    packet = bytearray(e131.build_packet(16, bytes(512), cid=CID))
+    packet[offset] = value
+    with pytest.raises(e131.E131PacketError):
+        e131.parse_packet(memoryview(packet))
+
+
+def test_sequence_rule():
+    assert not e131.is_out_of_order(None, 5)
+    assert not e131.is_out_of_order(5, 6)
+    assert e131.is_out_of_order(5, 5)
+    assert e131.is_out_of_order(5, 250)  # 11 behind, wrapped
+    assert not e131.is_out_of_order(250, 5)  # wrap forward
+    assert not e131.is_out_of_order(100, 50)  # large jump back = source restart
+
+
+def test_feed_drops_out_of_order_and_foreign_universes():
+    receiver = e131.E131Receiver([16])
+    assert receiver.feed(e131.build_packet(16, b"\x0a", sequence=10, cid=CID))
+    assert not receiver.feed(e131.build_packet(16, b"\x09", sequence=9, cid=CID))
+    assert not receiver.feed(e131.build_packet(17, b"\x01", sequence=11, cid=CID))
+    assert not receiver.feed(b"garbage")
+    assert receiver.dropped_out_of_order == 1
+    assert receiver.invalid == 1
+
+    fresh = receiver.poll()
+    assert list(fresh) == [16]
+    assert isinstance(fresh[16], memoryview)
+    assert len(fresh[16]) == 512 and fresh[16][0] == 10
+    assert receiver.poll() == {}
+
+
+def test_receiver_thread_with_local_generator():
+    receiver = e131.E131Receiver([16], bind_address="127.0.0.1", port=0, multicast=False)
+    receiver.start()
+    try:
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        slots = bytes([0, 11] + [0] * 510)
+        for seq in range(3):
+            sender.sendto(e131.build_packet(16, slots, sequence=seq, cid=CID), receiver.address)
+        sender.close()
+
+        deadline = time.monotonic() + 2.0
+        while receiver.packets < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert receiver.packets == 3
+        view = receiver.view(16)
+        assert bytes(view[:2]) == b"\x00\x0b"
+    finally:
+        receiver.stop()
+    assert not receiver.running
+
+
+def test_reloading_sacn_dispatch_stops_the_previous_receiver():
+    import importlib
+
+    io_path = str(BASE_PATH / "io")
+    if io_path not in sys.path:
+        sys.path.insert(0, io_path)
+    import sacn_dispatch
+
+    receiver = e131.E131Receiver([16], port=0, bind_address="127.0.0.1", multicast=False)
+    receiver.start()
+    sacn_dispatch._receiver = receiver
+    try:
+        importlib.reload(sacn_dispatch)
+        assert not receiver.running
+        assert sacn_dispatch._receiver is None
+    finally:
+        receiver.stop()
@@ -0,0 +1,70 @@
+"""Tests for the pure-Python OSC codec."""
+
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+SRC_PATH = BASE_PATH / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from eos_osc import codec  # noqa: E402
+
+
+def test_message_bytes_match_osc_spec():
+    data = codec.encode_message("/eos/sub/1", [0.5])
+    assert data == b"/eos/sub/1\x00\x00,f\x00\x00" + struct.pack(">f", 0.5)
+    assert codec.encode_message("/eos/key/go_0", []) == b"/eos/key/go_0\x00\x00\x00,\x00\x00\x00"
+
+
+def test_all_types_roundtrip():
+    args = [7, 2.5, "Palette 1", b"\x01\x02\x03", 2 ** 40, True, False, None]
+    data = codec.encode_message("/eos/out/get/cp/1/list/0/1", args)
+    assert len(data) % 4 == 0
+    message = codec.decode_message(data)
+    assert message.address == "/eos/out/get/cp/1/list/0/1"
+    blob = message.args[3]
+    assert isinstance(blob, memoryview) and bytes(blob) == b"\x01\x02\x03"
+    assert message.args[:3] + message.args[4:] == args[:3] + args[4:]
+
+
+def test_numpy_scalars_are_encoded_as_numbers():
+    np = pytest.importorskip("numpy")
+    data = codec.encode_message("/eos/sub/1", [np.float32(0.5), np.int64(3), np.float64(0.25)])
+    assert data == codec.encode_message("/eos/sub/1", [0.5, 3, 0.25])
+    assert codec.decode_message(data).args == [0.5, 3, 0.25]
+
+
+def test_unsupported_argument_types_raise():
+    with pytest.raises(TypeError):
+        codec.encode_message("/eos/sub/1", [object()])
+
+
+def test_decoding_a_slice_does_not_copy_the_packet():
+    packet = bytearray(b"junk" + codec.encode_message("/b", [b"abcd"]))
+    message = codec.decode_message(memoryview(packet)[4:])
+    packet[-4:] = b"wxyz"  # blob view still points into the packet
+    assert bytes(message.args[0]) == b"wxyz"
+
+
+def test_nested_bundles_flatten_in_order():
+    data = codec.encode_bundle([
+        codec.Message("/eos/sub/1", [1.0]),
+        codec.Bundle(5, [codec.Message("/eos/sub/2", [0.0])]),
+        codec.encode_message("/eos/ping", []),
+    ])
+    bundle = codec.decode_packet(data)
+    assert isinstance(bundle, codec.Bundle) and bundle.timetag == codec.IMMEDIATE
+    assert bundle.elements[1].timetag == 5
+    assert [m.address for m in codec.iter_messages(data)] == ["/eos/sub/1", "/eos/sub/2", "/eos/ping"]
+
+
+def test_malformed_packets_raise():
+    good = codec.encode_message("/eos/sub/1", [0.5, "x"])
+    with pytest.raises(codec.OscDecodeError):
+        codec.decode_message(good[:-6])
+    with pytest.raises(codec.OscDecodeError):
+        codec.decode_message(b"/a\x00\x00,Z\x00\x00")
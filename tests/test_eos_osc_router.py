@@ -0,0 +1,81 @@
+"""Tests for the segment-trie OSC router."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+SRC_PATH = BASE_PATH / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from eos_osc.router import OscRouter  # noqa: E402
+
+TYPES = "ip|fp|cp|bp"
+LIST = f"/eos/out/get/{{typ:{TYPES}}}/{{num:int}}/list/{{idx:int}}/{{:int}}"
+CHANNELS = f"/eos/out/get/{{typ:{TYPES}}}/{{num:int}}/channels/list/{{idx:int}}/{{:int}}"
+COUNT = f"/eos/out/get/{{typ:{TYPES}}}/count"
+
+
+def _router(calls):
+    router = OscRouter()
+    router.add(COUNT, lambda args, typ: calls.append(("count", typ, args)), "count")
+    router.add(LIST, lambda args, *caps: calls.append(("list",) + caps), "list")
+    router.add(CHANNELS, lambda args, *caps: calls.append(("channels",) + caps), "channels")
+    return router
+
+
+def test_dispatch_passes_typed_captures_in_pattern_order():
+    calls = []
+    router = _router(calls)
+    assert router.dispatch("/eos/out/get/fp/12/list/3/5", [3, "uid"])
+    assert router.dispatch("/eos/out/get/fp/12/channels/list/0/2", [])
+    assert router.dispatch("/eos/out/get/bp/count", [7])
+    assert calls == [
+        ("list", "fp", 12, 3),
+        ("channels", "fp", 12, 0),
+        ("count", "bp", [7]),
+    ]
+
+
+def test_rejects_wrong_types_and_lengths_and_counts_them():
+    router = _router([])
+    for address in (
+        "/eos/out/get/xx/count",
+        "/eos/out/get/ip/abc/list/0/1",
+        "/eos/out/get/ip/1/list/0",
+        "/eos/out/get/ip/1/list/0/1/extra",
+        "eos/out/get/ip/count",
+    ):
+        assert not router.dispatch(address, [])
+    assert router.unmatched == 5
+    assert router.last_unmatched == "eos/out/get/ip/count"
+
+
+def test_literal_wins_over_capture_and_falls_back_when_it_dead_ends():
+    router = OscRouter()
+    router.add("/a/{x}/end", lambda args, x: None, "capture")
+    router.add("/a/b", lambda args: None, "literal")
+    route, captures = router.match("/a/b")
+    assert route.name == "literal"
+    route, captures = router.match("/a/b/end")
+    assert route.name == "capture" and captures == ["b"]
+
+
+def test_report_counts_hits_per_route():
+    router = _router([])
+    for _ in range(3):
+        router.dispatch("/eos/out/get/ip/1/list/0/1", [])
+    router.dispatch("/eos/out/get/ip/count", [1])
+    router.dispatch("/eos/out/ping", [])
+    assert router.report() == {"count": 1, "list": 3, "channels": 0, "<unmatched>": 1}
+    router.reset_stats()
+    assert sum(router.report().values()) == 0
+
+
+def test_duplicate_pattern_is_rejected():
+    router = OscRouter()
+    router.add("/eos/out/show/name", lambda args: None)
+    with pytest.raises(ValueError):
+        router.add("/eos/out/show/name", lambda args: None)
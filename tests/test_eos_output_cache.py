@@ -0,0 +1,105 @@
+"""Tests for the shared Eos output value cache / rate limiter."""
+
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+SRC_PATH = BASE_PATH / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from eos_osc import OutputCache  # noqa: E402
+
+
+class _Wire:
+    def __init__(self):
+        self.messages = []
+
+    def __call__(self, address, values):
+        self.messages.append((address, values))
+        return True
+
+
+def test_redundant_values_are_never_sent_twice():
+    wire = _Wire()
+    cache = OutputCache(wire)
+    assert cache.offer("/eos/sub/1", [0.5], now=0.0)
+    assert not cache.offer("/eos/sub/1", [0.5], now=1.0)
+    assert not cache.offer("/eos/sub/1", [0.505], now=2.0)  # within deadband
+    assert cache.offer("/eos/sub/1", [0.6], now=3.0)
+    assert wire.messages == [("/eos/sub/1", [0.5]), ("/eos/sub/1", [0.6])]
+    assert cache.stats.redundant == 2
+
+
+def test_two_modules_share_one_address():
+    cache = OutputCache()
+    menu, audio = _Wire(), _Wire()
+    cache.offer("/eos/sub/11", [0.8], now=0.0, send=menu)
+    cache.offer("/eos/sub/11", [0.8], now=1.0, send=audio)
+    assert len(menu.messages) == 1 and not audio.messages
+
+
+def test_rate_limited_value_is_flushed_later():
+    wire = _Wire()
+    cache = OutputCache(wire, min_interval=0.05)
+    cache.offer("/eos/sub/2", [0.1], now=0.0)
+    assert not cache.offer("/eos/sub/2", [0.3], now=0.01)
+    assert not cache.offer("/eos/sub/2", [0.4], now=0.02)  # replaces 0.3
+    assert cache.flush(now=0.03) == 0
+    assert cache.flush(now=0.06) == 1
+    assert wire.messages[-1] == ("/eos/sub/2", [0.4])
+    assert cache.stats.coalesced == 1
+    assert cache.pending == 0
+
+
+def test_moving_back_cancels_pending_value():
+    wire = _Wire()
+    cache = OutputCache(wire)
+    cache.offer("/eos/sub/3", [0.5], now=0.0)
+    cache.offer("/eos/sub/3", [0.9], now=0.01)
+    cache.offer("/eos/sub/3", [0.5], now=0.02)
+    cache.flush(now=1.0)
+    assert wire.messages == [("/eos/sub/3", [0.5])]
+
+
+def test_final_value_inside_deadband_is_sent_once_motion_stops():
+    wire = _Wire()
+    cache = OutputCache(wire, min_interval=0.05)
+    cache.offer("/eos/sub/4", [0.008], now=0.0)
+    assert not cache.offer("/eos/sub/4", [0.0], now=0.1)  # within deadband
+    assert not cache.offer("/eos/sub/4", [0.0], now=0.12)
+    assert cache.flush(now=0.14) == 0  # not settled for one interval yet
+    assert cache.flush(now=0.16) == 1
+    assert wire.messages[-1] == ("/eos/sub/4", [0.0])
+    assert cache.flush(now=1.0) == 0
+
+
+def test_jitter_inside_deadband_is_not_sent():
+    wire = _Wire()
+    cache = OutputCache(wire, min_interval=0.05)
+    cache.offer("/eos/sub/5", [0.5], now=0.0)
+    for frame in range(1, 60):
+        now = frame / 60.0
+        cache.offer("/eos/sub/5", [0.5 + (frame % 2) * 0.004 + 0.001], now=now)
+        cache.flush(now=now)
+    assert wire.messages == [("/eos/sub/5", [0.5])]
+
+
+def test_interval_adapts_to_send_volume():
+    wire = _Wire()
+    cache = OutputCache(wire, min_interval=0.05, max_interval=0.25, target_rate=100.0)
+    now = 0.0
+    for frame in range(240):  # 4 s at 60 fps, 20 addresses moving every frame
+        now = frame / 60.0
+        for sub in range(20):
+            cache.offer(f"/eos/sub/{sub}", [frame % 2 * 0.5 + sub * 0.01], now=now)
+        cache.flush(now=now)
+    assert cache.interval > 0.05
+    busy_rate = cache.rate
+    assert busy_rate <= 20 / 0.05 + 1
+
+    for frame in range(240, 600):  # quiet again
+        cache.flush(now=frame / 60.0)
+    assert cache.interval == 0.05
+    assert cache.stats.suppression_ratio > 0.5
+    assert cache.report()["sent"] == cache.stats.sent
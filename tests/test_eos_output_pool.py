@@ -0,0 +1,59 @@
+"""Tests for the per-console OSC output pool."""
+
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+SRC_PATH = BASE_PATH / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from eos_osc import OutputPool, split_ips  # noqa: E402
+
+
+class _Outputs:
+    """Factory that records every message per destination."""
+
+    def __init__(self):
+        self.messages = {}
+
+    def __call__(self, ip):
+        wire = self.messages.setdefault(ip, [])
+        return lambda address, values: wire.append((address, values))
+
+
+def test_split_ips_maps_default_to_main_output():
+    assert split_ips(None) == ("",)
+    assert split_ips("127.0.0.1") == ("",)
+    assert split_ips("10.0.0.1; 10.0.0.2, 10.0.0.1") == ("10.0.0.1", "10.0.0.2")
+
+
+def test_messages_are_queued_per_console_until_flush():
+    outputs = _Outputs()
+    pool = OutputPool(outputs)
+    pool.send("10.0.0.1", "/eos/sub/1", [0.5])
+    pool.send(None, "/eos/sub/1", [0.2])
+    pool.send("10.0.0.1", "/eos/sub/2", [1.0])
+    assert pool.queued == 3
+    assert not any(outputs.messages.values())
+
+    assert pool.flush() == 3
+    assert outputs.messages["10.0.0.1"] == [("/eos/sub/1", [0.5]), ("/eos/sub/2", [1.0])]
+    assert outputs.messages[""] == [("/eos/sub/1", [0.2])]
+    assert pool.flush() == 0
+
+
+def test_primary_and_backup_receive_the_same_messages():
+    outputs = _Outputs()
+    pool = OutputPool(outputs)
+    send = pool.sender("10.0.0.1;10.0.0.2")
+    assert send is pool.sender("10.0.0.1;10.0.0.2")  # cached per spec
+    send("/eos/cue/1/fire", [])
+    pool.flush()
+    assert outputs.messages["10.0.0.1"] == outputs.messages["10.0.0.2"] == [("/eos/cue/1/fire", [])]
+
+
+def test_missing_output_counts_as_failure():
+    pool = OutputPool(lambda ip: None)
+    assert not pool.send("10.0.0.9", "/eos/sub/1", [0.5])
+    assert pool.report() == {"10.0.0.9": {"sent": 0, "failed": 1, "queued": 0}}
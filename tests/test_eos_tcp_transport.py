@@ -0,0 +1,143 @@
+"""Tests for SLIP framing and the OSC-over-TCP transport (local TCP stand-in)."""
+
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+SRC_PATH = BASE_PATH / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from eos_osc import OutputPool, TcpTransport, slip  # noqa: E402
+from eos_osc.codec import decode_message, encode_message  # noqa: E402
+
+
+class _Console:
+    """Accepts one connection and records everything it receives."""
+
+    def __init__(self):
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        self.conn = None
+        self.received = b""
+        self._accepted = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        self.conn, _ = self.server.accept()
+        self._accepted.set()
+        while True:
+            try:
+                data = self.conn.recv(65536)
+            except OSError:
+                return
+            if not data:
+                return
+            self.received += data
+
+    def messages(self, count, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            packets = slip.SlipDecoder().feed(self.received)
+            if len(packets) >= count:
+                return [decode_message(p) for p in packets]
+            time.sleep(0.01)
+        raise AssertionError(f"expected {count} messages, got {self.received!r}")
+
+    def close(self):
+        for sock in (self.conn, self.server):
+            if sock is not None:
+                sock.close()
+
+
+def _wait(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_slip_roundtrip_with_escapes_and_split_reads():
+    packets = [b"\xc0abc\xdb", b"plain", b"\xdb\xdc\xdd"]
+    stream = slip.encode_many(packets)
+    decoder = slip.SlipDecoder()
+    out = []
+    for i in range(0, len(stream), 3):
+        out.extend(decoder.feed(stream[i:i + 3]))
+    assert out == packets
+    assert decoder.buffered == 0
+
+
+def test_frame_is_written_in_one_call_and_replies_are_parsed():
+    console = _Console()
+    transport = TcpTransport("127.0.0.1", console.port, reconnect_interval=0.05).start()
+    try:
+        assert transport.wait_connected(2.0)
+        _wait(console._accepted.is_set)
+        for sub in range(1, 4):
+            transport.send(f"/eos/sub/{sub}", [sub / 10])
+        assert transport.flush() == 3
+        assert transport.stats.writes == 1
+
+        got = console.messages(3)
+        assert [a for a, _ in got] == ["/eos/sub/1", "/eos/sub/2", "/eos/sub/3"]
+
+        reply = slip.encode(encode_message("/eos/out/get/cue/1/count", [12]))
+        console.conn.sendall(reply[:5])
+        time.sleep(0.05)
+        console.conn.sendall(reply[5:])
+        _wait(lambda: transport.stats.received == 1)
+        assert transport.poll() == [("/eos/out/get/cue/1/count", [12])]
+    finally:
+        transport.close()
+        console.close()
+
+
+def test_pool_sends_a_tcp_destination_once_per_flush():
+    console = _Console()
+    pool = OutputPool()
+    spec = f"tcp://127.0.0.1:{console.port}"
+    try:
+        transport = pool.destination(spec).output
+        assert transport.wait_connected(2.0)
+        pool.send(spec, "/eos/sub/1", [0.25])
+        pool.send(spec, "/eos/sub/2", [0.75])
+        assert pool.flush() == 2
+        assert transport.stats.writes == 1
+        assert [a for a, _ in console.messages(2)] == ["/eos/sub/1", "/eos/sub/2"]
+    finally:
+        pool.reset()
+        console.close()
+
+
+def test_messages_are_dropped_while_disconnected():
+    transport = TcpTransport("127.0.0.1", 1)
+    transport.send("/eos/sub/1", [0.5])
+    assert transport.flush() == 0
+    assert transport.stats.dropped == 1
+
+
+def test_pool_polls_tcp_replies_and_the_inbox_is_bounded(monkeypatch):
+    import eos_osc.tcp_transport as tcp_transport
+
+    monkeypatch.setattr(tcp_transport, "INBOX_LIMIT", 2)
+    console = _Console()
+    pool = OutputPool()
+    spec = f"tcp://127.0.0.1:{console.port}"
+    try:
+        transport = pool.destination(spec).output
+        assert transport.wait_connected(2.0)
+        _wait(console._accepted.is_set)
+        console.conn.sendall(slip.encode_many(
+            encode_message("/eos/out/get/ip/count", [n]) for n in range(3)
+        ))
+        _wait(lambda: transport.stats.received == 3)
+        assert transport.stats.inbox_dropped == 1
+        assert pool.poll() == [(spec, "/eos/out/get/ip/count", [1]), (spec, "/eos/out/get/ip/count", [2])]
+        assert pool.poll() == []
+    finally:
+        pool.reset()
+        console.close()
@@ -0,0 +1,82 @@
+"""Tests for the on-disk palette cache and resync planning."""
+
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+if str(BASE_PATH) not in sys.path:
+    sys.path.insert(0, str(BASE_PATH))
+
+from palette_logic.palette_cache import PaletteCache, UidCheck, plan_notified, plan_resync  # noqa: E402
+
+
+def _rows(count, missing_uid=()):
+    return [
+        [str(i + 1), str(i + 1), "" if i in missing_uid else f"uid-{i}", f"Palette {i + 1}", "", ""]
+        for i in range(count)
+    ]
+
+
+def test_plan_resync_rules():
+    assert plan_resync(None, 3) == (False, [0, 1, 2], None)
+    assert plan_resync(_rows(3), 3)[:2] == (True, [])       # unchanged count: verify only
+    assert plan_resync(_rows(3), 5)[:2] == (True, [3, 4])   # new indices, verify the rest
+    assert plan_resync(_rows(3), 2) == (False, [0, 1], None)  # deleted palettes: full refetch
+    assert plan_resync(_rows(3, missing_uid={1}), 4)[:2] == (True, [1, 3])
+    assert plan_resync(_rows(2), 2).check.uids == ["uid-0", "uid-1"]
+    assert plan_resync(_rows(2, missing_uid={0, 1}), 2).check is None
+
+
+def test_plan_notified_refetches_from_the_notified_position():
+    rows = [[str(i), str(n), f"uid-{n}", "", "", ""] for i, n in enumerate([1, 2, 4, 5])]
+    assert plan_notified(rows, 5, {3}) == (True, [2, 3, 4], None)      # 3 inserted at index 2
+    assert plan_notified(rows, 3, {2}) == (True, [1, 2], None)         # 2 deleted
+    assert plan_notified(rows, 5, {9}) == (True, [4], None)            # appended
+    assert plan_notified(rows, 5, set())[2] is not None                # unknown: uid check
+
+
+def _run_check(cached, current):
+    check = UidCheck(cached)
+    probes = []
+    while not check.done:
+        probes.append(check.probe)
+        assert check.answer(check.probe, current[check.probe] if check.probe < len(current) else None)
+    return check.first_shifted, probes
+
+
+def test_uid_check_finds_the_first_shifted_index():
+    cached = [f"uid-{i}" for i in range(8)]
+    assert _run_check(cached, cached + ["new"]) == (8, [4, 6, 7])       # appended
+    inserted = cached[:3] + ["new"] + cached[3:]
+    assert _run_check(cached, inserted)[0] == 3                          # inserted before index 3
+    deleted = cached[:5] + cached[6:] + ["new"]
+    assert _run_check(cached, deleted)[0] == 5                           # deleted + appended
+    assert _run_check(cached, ["x"] * 8)[0] == 0
+
+
+def test_uid_check_ignores_replies_for_other_indices():
+    check = UidCheck(["a", "b", "c"])
+    assert not check.answer(0, "a")
+    assert check.answer(1, "b") and check.probe == 2
+
+
+def test_cache_roundtrip_and_show_check(tmp_path):
+    path = tmp_path / "cache" / "palette_cache.json"
+    cache = PaletteCache(str(path))
+    assert cache.rows("ip") is None
+    assert cache.update("ip", _rows(2), show="Concert")
+    assert not cache.update("ip", _rows(2), show="Concert")
+    assert cache.save()
+
+    loaded = PaletteCache(str(path))
+    assert loaded.rows("ip", show="Concert") == _rows(2)
+    assert loaded.rows("ip", show="Other Show") is None
+    assert loaded.rows("fp") is None
+
+
+def test_broken_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "palette_cache.json"
+    path.write_text("{not json", encoding="utf-8")
+    cache = PaletteCache(str(path))
+    assert not cache.load()
+    assert cache.rows("ip") is None
@@ -0,0 +1,54 @@
+"""Tests for the in-memory EOS status (palette_logic.subscribe_manager.EosStatus)."""
+
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+if str(BASE_PATH) not in sys.path:
+    sys.path.insert(0, str(BASE_PATH))
+
+from palette_logic.subscribe_manager import EosStatus  # noqa: E402
+
+
+class _Cell:
+    def __init__(self, val):
+        self.val = val
+
+
+class FakeStatusTable:
+    def __init__(self, rows):
+        self._rows = {key: [_Cell(key), _Cell(value)] for key, value in rows}
+
+    def row(self, key):
+        return self._rows.get(key)
+
+
+def test_status_is_seeded_from_the_dat_once():
+    status = EosStatus()
+    status.load(FakeStatusTable([
+        ("last_seen", "12.5"), ("is_subscribed", "1"), ("last_subscribe", "bad"),
+    ]))
+    assert status.loaded
+    assert status.last_seen == 12.5
+    assert status.is_subscribed is True
+    assert status.last_subscribe == 0.0
+
+
+def test_rows_render_the_display_values():
+    status = EosStatus()
+    status.last_seen = 3.0
+    assert status.rows() == {"last_seen": "3.0", "is_subscribed": "0", "last_subscribe": "0.0"}
+
+
+def test_missing_dat_leaves_defaults():
+    status = EosStatus()
+    status.load(None)
+    assert status.loaded and status.last_seen == 0.0 and not status.is_subscribed
+
+
+def test_load_never_replaces_newer_values():
+    status = EosStatus()
+    status.last_seen = 40.0  # set before the first load
+    status.load(FakeStatusTable([("last_seen", "12.5"), ("last_subscribe", "7.0")]))
+    assert status.last_seen == 40.0
+    assert status.last_subscribe == 7.0
@@ -0,0 +1,52 @@
+"""Tests for the channel/bytype palette index (palette_logic.palette_index)."""
+
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+if str(BASE_PATH) not in sys.path:
+    sys.path.insert(0, str(BASE_PATH))
+
+from palette_logic.palette_index import PaletteIndex, parse_channels  # noqa: E402
+from palette_logic.state import TABLE_HEADER  # noqa: E402
+
+
+def test_parse_channels_understands_eos_notation():
+    assert list(parse_channels("1-3 7 10 Thru 12")) == [1, 2, 3, 7, 10, 11, 12]
+    assert list(parse_channels(["5-4,101.2", "x", "0", "3 - 3"])) == [3, 4, 5, 101]
+    assert list(parse_channels("")) == []
+
+
+def test_channel_lookup_is_updated_incrementally():
+    index = PaletteIndex()
+    index.set_channels("ip", 1, "1-3")
+    index.set_channels("ip", 2, "3 4")
+    assert index.palettes_for_channel("ip", 3) == {1, 2}
+    index.set_channels("ip", 1, "10")  # palette edited
+    assert index.palettes_for_channel("ip", 3) == {2}
+    assert index.palettes_for_channel("ip", 10) == {1}
+    assert index.palettes_for_channels("ip", [3, 10]) == {1, 2}
+    assert index.palettes_for_channels("ip", [3, 4], match_all=True) == {2}
+    index.remove("ip", 2)
+    assert index.palettes_for_channel("ip", 4) == set()
+    assert index.palettes_for_channel("fp", 10) == set()
+
+
+def test_bytype_lookup_is_case_insensitive():
+    index = PaletteIndex()
+    index.set_bytype("cp", 5, "Color Intensity")
+    index.set_bytype("cp", 6, "Color")
+    assert index.palettes_for_bytype("cp", "color") == {5, 6}
+    index.set_bytype("cp", 5, "Focus")
+    assert index.palettes_for_bytype("cp", "Intensity") == set()
+
+
+def test_load_rows_rebuilds_a_type():
+    index = PaletteIndex()
+    index.set_channels("ip", 9, "99")
+    rows = [["0", "1", "u1", "Warm", "1-2", "Intensity"], ["1", "", "", "", "", ""]]
+    index.load_rows("ip", rows, TABLE_HEADER)
+    assert index.palettes_for_channel("ip", 99) == set()
+    assert index.palettes_for_channel("ip", 2) == {1}
+    assert list(index.channels_of("ip", 1)) == [1, 2]
+    assert index.palettes_for_bytype("ip", "intensity") == {1}
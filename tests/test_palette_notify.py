@@ -0,0 +1,54 @@
+"""Tests for EOS palette notifications (palette_logic.notify, FetchWindow.extend)."""
+
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+if str(BASE_PATH) not in sys.path:
+    sys.path.insert(0, str(BASE_PATH))
+
+if str(BASE_PATH / "src") not in sys.path:
+    sys.path.insert(0, str(BASE_PATH / "src"))
+
+from eos_osc.router import OscRouter  # noqa: E402
+from palette_logic.notify import NOTIFY_ROUTE, parse_numbers  # noqa: E402
+from palette_logic.state import FetchWindow  # noqa: E402
+
+
+def test_notify_address_matches_palette_types_only():
+    router = OscRouter()
+    router.add(NOTIFY_ROUTE, lambda args, typ: None)
+    route, captures = router.match("/eos/out/notify/ip/list/0/3")
+    assert captures == ["ip"]
+    assert router.match("/eos/out/notify/cue/list/0/3") is None
+    assert router.match("/eos/out/get/ip/count") is None
+
+
+def test_parse_numbers_accepts_ints_floats_strings_and_ranges():
+    assert parse_numbers([3, 4.0, "7", "10-12", " 4 "]) == [3, 4, 7, 10, 11, 12]
+
+
+def test_parse_numbers_skips_invalid_tokens_and_huge_ranges():
+    assert parse_numbers(["x", "", 1.5, "9-5", "1-100000", 0, 2]) == [2]
+
+
+def test_extend_skips_queued_and_in_flight_numbers():
+    window = FetchWindow()
+    assert window.extend([5, 6, 7]) == 3
+    taken = window.take(0.0)
+    assert taken
+    assert window.extend([5, 6, 7, 8]) == 1
+    assert list(window.queue).count(8) == 1
+
+
+def test_extend_after_done_starts_a_new_round():
+    window = FetchWindow()
+    window.extend([1])
+    for key in window.take(0.0):
+        window.ack(key, 0.01)
+    assert window.done and window.completed == 1
+    window.extend([2], now=5.0)
+    assert window.completed == 0 and window.started_at == 5.0
+    for key in window.take(5.0):
+        window.ack(key, 5.01)
+    assert window.done and window.completed == 1
@@ -0,0 +1,320 @@
+"""Tests for the palette sync engine (pump) and the reply handler together.
+
+The palette_logic DATs are loaded the way TouchDesigner does it: ``mod()``
+returns the module of a DAT and ``op('/project1')`` the project base. Both
+are provided by a fake project with table DATs and an OSC out that records
+every request.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+SRC_PATH = BASE_PATH / "src"
+PALETTE_PATH = BASE_PATH / "palette_logic"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+TYPES = ("ip", "fp", "cp", "bp")
+
+
+class _Cell:
+    def __init__(self, val):
+        self.val = val
+
+
+class FakeTable:
+    def __init__(self):
+        self.cells = []
+
+    @property
+    def numRows(self):
+        return len(self.cells)
+
+    @property
+    def numCols(self):
+        return max((len(r) for r in self.cells), default=0)
+
+    def __getitem__(self, key):
+        row, col = key
+        return _Cell(self.cells[row][col])
+
+    def setSize(self, rows, cols):
+        self.cells = [(r + [""] * cols)[:cols] for r in self.cells[:rows]]
+        self.cells += [[""] * cols for _ in range(rows - len(self.cells))]
+
+    def replaceRow(self, row, values):
+        self.cells[row] = [str(v) for v in values]
+
+
+class FakeOscOut:
+    def __init__(self):
+        self.sent = []
+
+    def sendOSC(self, address, args):
+        self.sent.append(address)
+
+    def take(self):
+        sent, self.sent = self.sent, []
+        return sent
+
+
+class FakeProject:
+    def __init__(self, cache_path):
+        self.tables = {f"palette_logic/pal_{t}": FakeTable() for t in TYPES}
+        self.osc = FakeOscOut()
+        self.storage = {"PALETTE_CACHE_PATH": str(cache_path)}
+
+    def op(self, path):
+        return self.osc if path == "io/oscout1" else self.tables.get(path)
+
+    def fetch(self, key, default=None):
+        return self.storage.get(key, default)
+
+
+class Eos:
+    """Console stand-in: answers index requests from its palette list."""
+
+    def __init__(self, td, palettes):
+        self.td = td
+        self.palettes = {"ip": list(palettes)}  # (number, uid, label) in index order
+
+    def reply(self, address):
+        parts = address.strip("/").split("/")  # eos get ip index 3 / eos get ip count
+        palette_type = parts[2]
+        palettes = self.palettes[palette_type]
+        handler = self.td.handler
+        if parts[3] == "count":
+            handler.on_osc_receive(f"/eos/out/get/{palette_type}/count", [len(palettes)])
+            return
+        if parts[3] == "index":
+            index = int(parts[4])
+        else:
+            numbers = [p[0] for p in palettes]
+            if int(parts[3]) not in numbers:
+                return  # deleted palette: no reply
+            index = numbers.index(int(parts[3]))
+        num, uid, label = palettes[index]
+        prefix = f"/eos/out/get/{palette_type}/{num}"
+        handler.on_osc_receive(f"{prefix}/list/{index}/{len(palettes)}", [index, uid, label])
+        handler.on_osc_receive(f"{prefix}/channels/list/{index}/{len(palettes)}", [index, str(num)])
+        handler.on_osc_receive(f"{prefix}/bytype/list/{index}/{len(palettes)}", [index, "Intensity"])
+
+    def notify(self, palette_type, *numbers):
+        self.td.handler.on_osc_receive(f"/eos/out/notify/{palette_type}/list/0/1", [0, *numbers])
+
+    def answer_all(self):
+        """Answer requests until the engine stops asking; returns the requests."""
+        answered = []
+        while True:
+            sent = self.td.project.osc.take()
+            if not sent:
+                return answered
+            for address in sent:
+                answered.append(address)
+                self.reply(address)
+
+
+class TD:
+    """palette_logic modules loaded against a fake project."""
+
+    def __init__(self, cache_path, missing=()):
+        self.project = FakeProject(cache_path)
+        self.modules = {}
+        self.missing = set(missing)  # DATs absent from the project file
+        self.handler = self.mod("/project1/palette_logic/eos_notify_handler")
+        self.pump = self.mod("/project1/palette_logic/pump")
+        self.state = self.mod("/project1/palette_logic/state")
+        self.state.attach_base(self.project)
+
+    def op(self, path):
+        return self.project if path == "/project1" else None
+
+    def mod(self, path):
+        name = path.rsplit("/", 1)[-1]
+        if name in self.missing:
+            raise Exception(f"Invalid path: {path}")
+        module = self.modules.get(name)
+        if module is None:
+            spec = importlib.util.spec_from_file_location(f"td_palette_{name}", PALETTE_PATH / f"{name}.py")
+            module = self.modules[name] = importlib.util.module_from_spec(spec)
+            module.op, module.mod = self.op, self.mod
+            spec.loader.exec_module(module)
+        return module
+
+    def table_rows(self, palette_type="ip"):
+        self.state.flush_tables()
+        return self.project.tables[f"palette_logic/pal_{palette_type}"].cells[1:]
+
+
+def _palettes(numbers):
+    return [(n, f"uid-{n}", f"Palette {n}") for n in numbers]
+
+
+@pytest.fixture
+def td(tmp_path):
+    return TD(tmp_path / "palette_cache.json")
+
+
+def test_reply_rows_and_cache_rows_use_the_same_index_mapping(td, tmp_path):
+    eos = Eos(td, _palettes([1, 2, 5]))
+    td.pump.queue_counts(td.project, {"ip": 3})
+    eos.answer_all()
+    td.pump.tick(td.project)  # finished tables are cached on the next tick
+    rows = td.table_rows()
+    # request index k -> table row k + 1 (index 0 is not lost)
+    assert [(r[0], r[1], r[2]) for r in rows] == [("0", "1", "uid-1"), ("1", "2", "uid-2"), ("2", "5", "uid-5")]
+    assert rows[2][5] == "Intensity"  # bytype lands in the row of its index, not of its number
+    assert td.pump.get_cache().rows("ip") == rows
+
+    # Next session: cached rows are shown in the same rows and verified
+    later = TD(tmp_path / "palette_cache.json")
+    later.pump.queue_counts(later.project, {"ip": 3})
+    assert later.table_rows() == rows
+
+
+def _synced(td, eos):
+    return [r[0:3] for r in td.table_rows()] == [
+        [str(i), str(n), uid] for i, (n, uid, _) in enumerate(eos.palettes["ip"])
+    ]
+
+
+def test_growth_with_a_mid_insert_refetches_the_shifted_rows(td):
+    eos = Eos(td, _palettes([1, 2, 3, 4, 6, 7, 8, 9]))
+    td.pump.queue_counts(td.project, {"ip": 8})
+    eos.answer_all()
+
+    eos.palettes["ip"] = _palettes(range(1, 10))  # 5 inserted, no notify seen
+    td.pump.queue_counts(td.project, {"ip": 9})
+    requests = eos.answer_all()
+    assert _synced(td, eos)
+    assert "/eos/get/ip/index/0" not in requests  # rows before the insert are kept
+
+
+def test_notified_insert_refetches_from_its_index_without_probing(td):
+    eos = Eos(td, _palettes([1, 2, 3, 4, 6, 7, 8, 9]))
+    td.pump.queue_counts(td.project, {"ip": 8})
+    eos.answer_all()
+
+    eos.palettes["ip"] = _palettes(range(1, 10))
+    eos.notify("ip", 5)
+    requests = eos.answer_all()
+    assert _synced(td, eos)
+    assert sorted(requests[:2]) == ["/eos/get/ip/5", "/eos/get/ip/count"]
+    assert sorted(requests[2:]) == sorted(f"/eos/get/ip/index/{i}" for i in range(4, 9))
+
+
+def test_notified_delete_refetches_from_its_index_and_shrinks(td):
+    eos = Eos(td, _palettes(range(1, 7)))
+    td.pump.queue_counts(td.project, {"ip": 6})
+    eos.answer_all()
+
+    eos.palettes["ip"] = _palettes([1, 2, 4, 5, 6])
+    eos.notify("ip", 3)
+    requests = eos.answer_all()
+    assert _synced(td, eos)
+    assert sorted(requests[2:]) == sorted(f"/eos/get/ip/index/{i}" for i in range(2, 5))
+
+
+def test_tables_are_filled_without_the_optional_dats(tmp_path):
+    td = TD(tmp_path / "palette_cache.json", missing={"palette_index", "notify"})
+    eos = Eos(td, _palettes([1, 2, 5]))
+    td.pump.queue_counts(td.project, {"ip": 3})
+    eos.answer_all()
+    assert _synced(td, eos)
+    eos.notify("ip", 2)  # no notify route: counted as unmatched
+    assert td.handler.report()["<unmatched>"] == 1
+
+
+def test_number_requests_in_flight_are_not_sent_again(td):
+    assert td.pump.queue_numbers(td.project, "ip", [2, 3], check_count=False) == 2
+    assert td.pump.queue_numbers(td.project, "ip", [3, 4], check_count=False) == 1
+    assert td.project.osc.take() == ["/eos/get/ip/2", "/eos/get/ip/3", "/eos/get/ip/4"]
+    assert td.pump.report()["deduped"] == 1
+
+
+def test_count_requests_are_deduplicated_until_answered(td):
+    assert td.pump.request_count("ip")
+    assert not td.pump.request_count("ip")
+    assert td.pump.request_count("ip", force=True)
+    assert td.project.osc.take() == ["/eos/get/ip/count", "/eos/get/ip/count"]
+    td.pump.queue_counts(td.project, {"ip": 0})  # the reply clears count_pending
+    assert td.pump.request_count("ip")
+    report = td.pump.report()
+    assert (report["count_requests"], report["counts_deduped"]) == (3, 1)
+
+
+def test_index_reply_acks_the_number_request_of_its_palette(td):
+    eos = Eos(td, _palettes([1, 2, 5]))
+    td.pump.queue_counts(td.project, {"ip": 3})
+    eos.answer_all()
+    td.pump.queue_numbers(td.project, "ip", [5], check_count=False)
+    assert td.project.osc.take() == ["/eos/get/ip/5"]
+    before = td.pump.report()
+    eos.reply("/eos/get/ip/index/2")  # same palette, answered by index
+    after = td.pump.report()
+    assert td.state.state.number_windows["ip"].done
+    assert after["replies"] - before["replies"] == 1
+    assert after["unrequested"] - before["unrequested"] == 1  # its bytype reply
+
+
+def test_numbers_queued_by_index_are_not_requested_by_number(td):
+    eos = Eos(td, _palettes([1, 2, 5, 6]))
+    td.pump.queue_counts(td.project, {"ip": 4})
+    eos.answer_all()
+
+    eos.palettes["ip"] = _palettes([2, 5, 6])  # 1 deleted, no notify seen
+    td.project.storage["PALETTE_FETCH_WINDOW"] = 1
+    td.pump.queue_counts(td.project, {"ip": 3})  # fewer palettes: rows refetched by index
+    # index 0 is in flight (its reply may predate the change), 1 and 2 are queued
+    assert td.pump.queue_numbers(td.project, "ip", [1, 2, 5], check_count=False) == 1
+    requests = eos.answer_all()
+    assert "/eos/get/ip/1" in requests  # deleted: no reply, given up later
+    assert "/eos/get/ip/2" not in requests and "/eos/get/ip/5" not in requests
+    assert _synced(td, eos)
+
+
+def test_report_counts_requests_and_replies_per_type(td):
+    eos = Eos(td, _palettes([1, 2, 5]))
+    td.pump.queue_counts(td.project, {"ip": 3})
+    report = td.pump.report()
+    assert report["types"]["ip"]["count"] == 3
+    assert report["types"]["ip"]["queued"] + report["types"]["ip"]["in_flight"] == 3
+    eos.answer_all()
+    report = td.pump.report()
+    assert (report["requests"], report["replies"], report["resends"]) == (3, 3, 0)
+    assert report["unrequested"] == 3  # the bytype reply acks its index again
+    assert report["types"]["ip"]["in_flight"] == 0
+
+
+def test_cache_hit_with_the_same_uids_sends_only_the_probes(td, tmp_path):
+    eos = Eos(td, _palettes(range(1, 33)))
+    td.pump.queue_counts(td.project, {"ip": 32})
+    eos.answer_all()
+    td.pump.tick(td.project)
+
+    later = TD(tmp_path / "palette_cache.json")
+    later.pump.queue_counts(later.project, {"ip": 32})
+    requests = Eos(later, eos.palettes["ip"]).answer_all()
+    assert len(requests) <= 6  # binary search over 32 uids
+    assert all(r.startswith("/eos/get/ip/index/") for r in requests)
+    assert later.state.state.uid_checks["ip"] is None and later.state.state.windows["ip"].done
+    assert _synced(later, eos)
+
+
+def test_cache_with_an_offline_insert_refetches_from_the_shifted_index(td, tmp_path):
+    numbers = [n for n in range(1, 18) if n != 12]
+    eos = Eos(td, _palettes(numbers))
+    td.pump.queue_counts(td.project, {"ip": 16})
+    eos.answer_all()
+    td.pump.tick(td.project)
+
+    later = TD(tmp_path / "palette_cache.json")
+    console = Eos(later, _palettes(range(1, 18)))  # 12 inserted while offline
+    later.pump.queue_counts(later.project, {"ip": 17})
+    requests = console.answer_all()
+    assert _synced(later, console)
+    assert not {f"/eos/get/ip/index/{i}" for i in range(5)} & set(requests)
@@ -0,0 +1,105 @@
+"""Tests for the staged pal_* table writes (palette_logic.state row store)."""
+
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+if str(BASE_PATH) not in sys.path:
+    sys.path.insert(0, str(BASE_PATH))
+
+from palette_logic.state import TABLE_HEADER, PaletteState  # noqa: E402
+
+
+class _Cell:
+    def __init__(self, val):
+        self.val = val
+
+
+class FakeTable:
+    """Minimal table DAT: counts resizes and row writes."""
+
+    def __init__(self, rows=()):
+        self.cells = [list(r) for r in rows]
+        self.resizes = 0
+        self.row_writes = 0
+
+    @property
+    def numRows(self):
+        return len(self.cells)
+
+    @property
+    def numCols(self):
+        return max((len(r) for r in self.cells), default=0)
+
+    def __getitem__(self, key):
+        row, col = key
+        return _Cell(self.cells[row][col])
+
+    def setSize(self, rows, cols):
+        self.resizes += 1
+        self.cells = [(r + [""] * cols)[:cols] for r in self.cells[:rows]]
+        self.cells += [[""] * cols for _ in range(rows - len(self.cells))]
+
+    def replaceRow(self, row, values):
+        self.row_writes += 1
+        self.cells[row] = [str(v) for v in values]
+
+
+class FakeBase:
+    def __init__(self, tables):
+        self.tables = tables
+
+    def op(self, path):
+        return self.tables.get(path.rsplit("/", 1)[-1])
+
+
+def _state(table):
+    st = PaletteState()
+    st.attach_base(FakeBase({"pal_ip": table}))
+    return st
+
+
+def test_replies_are_written_once_per_flush_with_a_single_resize():
+    table = FakeTable()
+    st = _state(table)
+    st.resize_rows("ip", 3)
+    for row in (1, 2, 3):
+        st.stage_row("ip", row, index=row, num=row, uid=f"u{row}")
+        st.stage_row("ip", row, bytype="Color")
+    assert table.numRows == 0  # nothing written before the flush
+    assert st.flush_tables() == 3
+    assert table.resizes == 1
+    assert table.row_writes == 4  # header + three rows
+    assert table.cells[0] == TABLE_HEADER
+    assert table.cells[2] == ["2", "2", "u2", "", "", "Color"]
+    assert st.flush_tables() == 0
+
+
+def test_rows_are_loaded_from_the_table_and_unchanged_count_does_not_resize():
+    table = FakeTable([TABLE_HEADER, ["1", "1", "a", "Warm", "", ""]])
+    st = _state(table)
+    assert st.read_rows("ip") == [["1", "1", "a", "Warm", "", ""]]
+    st.resize_rows("ip", 1)
+    st.stage_row("ip", 1, label="Cold")
+    st.flush_tables()
+    assert table.resizes == 0
+    assert table.cells[1][3] == "Cold"
+
+
+def test_shrinking_drops_staged_rows_beyond_the_new_size():
+    table = FakeTable()
+    st = _state(table)
+    st.stage_row("ip", 5, num=5)
+    st.resize_rows("ip", 2)
+    st.flush_tables()
+    assert table.numRows == 3
+
+
+def test_request_index_zero_is_staged_in_the_first_data_row():
+    table = FakeTable()
+    st = _state(table)
+    st.stage_index("ip", 0, index=0, num=1, uid="a")
+    st.stage_index("ip", 1, index=1, num=2, uid="b")
+    st.flush_tables()
+    assert table.cells[1:] == [["0", "1", "a", "", "", ""], ["1", "2", "b", "", "", ""]]
+    assert st.read_index("ip", 0) == ["0", "1", "a", "", "", ""]
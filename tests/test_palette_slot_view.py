@@ -0,0 +1,47 @@
+"""Tests for the diff-based slot view (palette_logic.update_slot_state.SlotView)."""
+
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+if str(BASE_PATH) not in sys.path:
+    sys.path.insert(0, str(BASE_PATH))
+
+from palette_logic.update_slot_state import SlotView  # noqa: E402
+
+
+def _view(count=25, slots=10):
+    view = SlotView()
+    view.set_slots("ip", [f"slot{i}" for i in range(slots)])
+    view.set_palettes("ip", [(str(n), f"P{n}") for n in range(1, count + 1)])
+    return view
+
+
+def test_first_render_writes_every_cell_then_nothing():
+    view = _view()
+    assert len(view.render("ip", 1)) == 10 * 4
+    assert view.render("ip", 1) == []
+
+
+def test_paging_writes_only_changed_fields_and_fills_empty_slots():
+    view = _view()
+    view.render("ip", 1)
+    changes = view.render("ip", 3)  # palettes 21..25, then 5 empty slots
+    assert (1, 1, "21") in changes and (1, 2, "P21") in changes
+    assert (6, 2, "--") in changes and (6, 3, "0") in changes
+    assert all(field != 0 for _, field, _ in changes)  # slot names unchanged
+
+
+def test_palette_update_touches_only_the_changed_slot():
+    view = _view()
+    view.render("ip", 1)
+    entries = [(str(n), f"P{n}") for n in range(1, 26)]
+    entries[4] = ("5", "Warm")
+    view.set_palettes("ip", entries)
+    assert view.render("ip", 1) == [(5, 2, "Warm")]
+
+
+def test_empty_label_falls_back_to_number():
+    view = _view(count=1, slots=1)
+    view.set_palettes("ip", [("7", "")])
+    assert view.page("ip", 1) == [("slot0", "7", "7", "1")]
@@ -0,0 +1,82 @@
+"""Tests for the cooperative palette sync (palette_logic.sync_task.SyncTask)."""
+
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+for path in (BASE_PATH, BASE_PATH / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from palette_logic.state import SyncStats  # noqa: E402
+from palette_logic.sync_task import SyncTask  # noqa: E402
+
+
+class FakeEngine:
+    def __init__(self):
+        self.requests = []
+
+    def request_count(self, pal_type):
+        self.requests.append(("count", pal_type))
+
+    def request_palettes(self, pal_type, numbers):
+        self.requests.append(("palettes", pal_type, list(numbers)))
+
+
+def _task(**kwargs):
+    engine = FakeEngine()
+    return SyncTask("ip", engine, **kwargs), engine.requests
+
+
+def test_all_palettes_are_handed_to_the_engine_at_once():
+    task, requests = _task()
+    task.start(now=0.0)
+    assert requests == [("count", "ip")]
+    assert task.on_message("/eos/out/get/ip/count", [3])
+    assert requests[-1] == ("palettes", "ip", [1, 2, 3])
+    for num in (3, 1, 2):  # any order
+        assert task.on_message(f"/eos/out/get/ip/{num}/list/0/1", [0, "uid", "Label"])
+    assert task.done and task.completed == 3 and task.progress == 1.0
+    assert not task.step()
+
+
+def test_unrelated_and_duplicate_replies_are_ignored():
+    task, _ = _task()
+    task.start(now=0.0)
+    assert not task.on_message("/eos/out/get/fp/count", [9])
+    assert not task.on_message("/eos/out/get/ip/1/list/0/1", [])
+    task.on_message("/eos/out/get/ip/count", [2])
+    assert task.on_message("/eos/out/get/ip/2/list/0/1", [])
+    assert not task.on_message("/eos/out/get/ip/2/list/0/1", [])
+    assert not task.on_message("/eos/out/get/ip/7/list/0/1", [])
+    assert task.completed == 1 and not task.done
+
+
+def test_no_progress_timeout_fails_the_rest_and_eta_is_reported():
+    task, _ = _task(timeout=1.0)
+    task.start(now=0.0)
+    task.on_message("/eos/out/get/ip/count", [3])
+    task.on_message("/eos/out/get/ip/1/list/0/1", [])
+    assert task.eta(now=task.started_at + 2.0) == 4.0
+    assert task.step(now=task._deadline - 0.1)
+    assert not task.step(now=task._deadline)
+    assert task.done and task.completed == 1 and task.failed == 2
+
+
+def test_count_timeout_falls_back_to_previous_count_or_fails():
+    task, _ = _task(timeout=1.0)
+    task.start(now=0.0)
+    assert not task.step(now=5.0)
+    assert task.error
+
+    task, requests = _task(timeout=1.0, prev_count=2)
+    task.start(now=0.0)
+    task.step(now=5.0)
+    assert task.total == 2 and requests[-1] == ("palettes", "ip", [1, 2])
+
+
+def test_sync_stats_throughput():
+    stats = SyncStats()
+    stats.reset(now=10.0)
+    stats.replies = 50
+    assert stats.throughput(now=12.0) == 25.0
@@ -0,0 +1,73 @@
+"""Tests for the sliding-window palette fetch (palette_logic.state.FetchWindow)."""
+
+import heapq
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+if str(BASE_PATH) not in sys.path:
+    sys.path.insert(0, str(BASE_PATH))
+
+from palette_logic.state import FetchWindow  # noqa: E402
+
+
+def _simulate(window, count, latency=0.05, service=0.002, lost=()):
+    """Console stand-in: fixed network latency, one reply per ``service`` seconds."""
+    window.reset(range(count))
+    now, busy_until, events, lost = 0.0, 0.0, [], set(lost)
+
+    def send(indices):
+        nonlocal busy_until
+        for index in indices:
+            if index in lost:
+                lost.discard(index)  # lost once, the retry gets through
+                continue
+            busy_until = max(busy_until, now + latency / 2) + service
+            heapq.heappush(events, (busy_until + latency / 2, index))
+
+    send(window.take(now))
+    while not window.done:
+        now = events[0][0] if events else now + 0.05
+        while events and events[0][0] <= now:
+            _, index = heapq.heappop(events)
+            window.ack(index, now)
+        resend, _ = window.expire(now)
+        send(resend)
+        send(window.take(now))
+    return now
+
+
+def test_window_sync_is_bounded_by_throughput_not_latency():
+    serial = _simulate(FetchWindow(size=1, max_size=1), 500)
+    windowed = _simulate(FetchWindow(), 500)
+    assert serial > 500 * 0.05
+    assert windowed < 500 * 0.002 * 1.5  # close to the console's service rate
+    assert windowed < serial / 10
+
+
+def test_out_of_order_replies_match_by_index():
+    window = FetchWindow(size=3)
+    window.reset(range(5))
+    assert window.take(0.0) == [0, 1, 2]
+    assert window.ack(2, 0.1) and window.ack(0, 0.1)
+    assert not window.ack(2, 0.1)  # duplicate reply
+    assert window.take(0.1) == [3, 4]
+    assert sorted(window.in_flight) == [1, 3, 4]
+
+
+def test_timeouts_retry_per_index_then_give_up():
+    window = FetchWindow(size=2, retry_limit=2, timeout=1.0)
+    window.reset(range(2))
+    window.take(0.0)
+    window.ack(1, 0.5)
+    assert window.expire(0.9) == ([], [])
+    assert window.expire(1.1) == ([0], [])
+    assert window.expire(2.2) == ([], [0])
+    assert window.done and window.failed == 1 and window.completed == 1
+
+
+def test_lost_requests_are_retried_and_timeout_follows_rtt():
+    window = FetchWindow()
+    _simulate(window, 200, lost={10, 50})
+    assert window.completed == 200 and window.failed == 0
+    assert window.timeout < 1.0  # adapted from the 3s upper bound
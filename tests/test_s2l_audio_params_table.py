@@ -0,0 +1,119 @@
+"""Tests for the incremental audio_params_table (audio_params_exec.on_changes)."""
+
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+import pytest
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+MANAGER_PATH = BASE_PATH / "src" / "s2l_manager"
+if str(MANAGER_PATH) not in sys.path:
+    sys.path.insert(0, str(MANAGER_PATH))
+
+import audio_params_exec as exec_dat  # noqa: E402
+
+# Same fields as dispatcher.ChangeEvent
+Event = namedtuple("Event", "instance parameter old new frame")
+
+
+class _Cell:
+    def __init__(self, val):
+        self.val = val
+
+
+class FakeTable:
+    """Minimal table DAT with row add/delete and per-cell write counting."""
+
+    def __init__(self, rows=()):
+        self.cells = [[str(v) for v in row] for row in rows]
+        self.cell_writes = 0
+
+    @property
+    def numRows(self):
+        return len(self.cells)
+
+    @property
+    def numCols(self):
+        return len(self.cells[0]) if self.cells else 0
+
+    def __getitem__(self, key):
+        row, col = key
+        return _Cell(self.cells[row][col])
+
+    def __setitem__(self, key, value):
+        row, col = key
+        self.cell_writes += 1
+        self.cells[row][col] = str(value)
+
+    def clear(self):
+        self.cells = []
+
+    def appendRow(self, values):
+        self.cells.append([str(v) for v in values])
+
+    def deleteRow(self, row):
+        del self.cells[row]
+
+
+HEADER = ["instance", "Submaster", "Sensitivity", "Threshold", "LowCut_Hz", "HighCut_Hz", "Lag_ms", "MinHold_s"]
+
+
+@pytest.fixture
+def tables(monkeypatch):
+    values = FakeTable([
+        HEADER,
+        ["A", 11, 100, 10, 20, 30, 40, 2],
+        ["B", 12, 50, 5, "", "", "", ""],
+    ])
+    dest = FakeTable()
+    paths = {exec_dat.VALUES_TABLE_PATH: values, exec_dat.AUDIO_PARAMS_TABLE_PATH: dest}
+    monkeypatch.setattr(exec_dat, "op", paths.get)
+    monkeypatch.setattr(exec_dat, "_rows", {})
+    exec_dat.build_table()
+    return values, dest
+
+
+def test_build_table_reads_the_dense_grid(tables):
+    _, dest = tables
+    assert dest.cells[0] == ["instance"] + exec_dat.target_cols
+    assert dest.cells[1] == ["A", "100", "10", "20", "30", "40", "2"]
+    assert dest.cells[2] == ["B", "50", "5", "", "", "", ""]
+    assert exec_dat._rows == {"A": 1, "B": 2}
+
+
+def test_changes_touch_only_their_cells(tables):
+    _, dest = tables
+    exec_dat.on_changes([
+        Event("B", "Threshold", 5, 7, 1),
+        Event("B", "Submaster", 12, 13, 1),  # not an audio parameter
+    ])
+    assert dest.cell_writes == 1
+    assert dest.cells[2][exec_dat._col_index["Threshold"]] == "7"
+
+
+def test_unknown_instance_appends_a_row(tables):
+    _, dest = tables
+    exec_dat.on_changes([Event("C", "Lag_ms", None, 9, 1)])
+    assert dest.numRows == 4
+    assert dest.cells[3] == ["C", "", "", "", "", "9", ""]
+    assert exec_dat._rows["C"] == 3
+
+
+def test_removed_instance_deletes_its_row_and_shifts_the_rest(tables):
+    _, dest = tables
+    exec_dat.on_changes([Event("C", "Lag_ms", None, 9, 1)])
+    exec_dat.on_changes([Event("A", "Sensitivity", 100, None, 2), Event("A", "Lag_ms", 40, None, 2)])
+    assert [row[0] for row in dest.cells[1:]] == ["B", "C"]
+    assert exec_dat._rows == {"B": 1, "C": 2}
+    exec_dat.on_changes([Event("C", "Lag_ms", 9, 10, 3)])
+    assert dest.cells[2][exec_dat._col_index["Lag_ms"]] == "10"
+
+
+def test_row_count_mismatch_rebuilds_from_the_grid(tables):
+    values, dest = tables
+    dest.deleteRow(2)  # table edited behind our back
+    values.cells[2][2] = "60"
+    exec_dat.on_changes([Event("B", "Sensitivity", 50, 60, 1)])
+    assert [row[0] for row in dest.cells[1:]] == ["A", "B"]
+    assert dest.cells[2][1] == "60"
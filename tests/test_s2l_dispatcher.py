@@ -0,0 +1,149 @@
+"""Tests for the dense values grid and change events of the S2L dispatcher."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+SRC_PATH = BASE_PATH / "src"
+MANAGER_PATH = SRC_PATH / "s2l_manager"
+for path in (SRC_PATH, MANAGER_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import s2l_unit as s2l  # noqa: E402
+
+import dispatcher  # noqa: E402
+
+
+class _Cell:
+    def __init__(self, table, row, col):
+        self._table, self._row, self._col = table, row, col
+
+    @property
+    def val(self):
+        return self._table.cells[self._row][self._col]
+
+
+class FakeTable:
+    """Minimal table DAT: counts layout rewrites and row writes."""
+
+    def __init__(self):
+        self.cells = []
+        self.rewrites = 0
+        self.row_writes = 0
+
+    @property
+    def numRows(self):
+        return len(self.cells)
+
+    @property
+    def numCols(self):
+        return len(self.cells[0]) if self.cells else 0
+
+    def __getitem__(self, key):
+        row, col = key
+        return _Cell(self, row, col)
+
+    def clear(self):
+        self.cells = []
+
+    def setSize(self, rows, cols):
+        self.rewrites += 1
+        self.cells = [[""] * cols for _ in range(rows)]
+
+    def replaceRow(self, row, values):
+        self.row_writes += 1
+        self.cells[row] = [str(v) for v in values]
+
+
+def _inst(name, enabled=True):
+    return s2l.InstanceDefinition(
+        instance=name, enabled=enabled, universe=16, start_address=1, eos_ip="127.0.0.1"
+    )
+
+
+@pytest.fixture
+def grid(monkeypatch):
+    table = FakeTable()
+    definitions = [_inst("A"), _inst("B"), _inst("OFF", enabled=False)]
+    monkeypatch.setattr(s2l, "load_instances", lambda *a, **k: list(definitions))
+    monkeypatch.setattr(dispatcher, "op", lambda path: table)
+    monkeypatch.setattr(dispatcher, "_subscribers", [])
+    dispatcher.reset_table()
+    return table, definitions
+
+
+def test_grid_has_one_row_per_enabled_instance_and_one_column_per_parameter(grid):
+    table, _ = grid
+    assert table.cells[0] == list(dispatcher.TABLE_HEADER)
+    assert [row[0] for row in table.cells[1:]] == ["A", "B"]
+    assert dispatcher.row_for("B") == 2
+    assert dispatcher.column_for("Submaster") == 1
+    assert dispatcher.column_for("FX_Auto") == len(dispatcher.TABLE_HEADER) - 1
+
+
+def test_changes_are_written_per_row_and_published_as_events(grid):
+    table, _ = grid
+    received = []
+    dispatcher.subscribe(received.append)
+    writes = table.row_writes
+
+    events = dispatcher.update_from_dmx(16, {"A": {"Submaster": 11, "Mode": 2}}, {}, frame=7)
+    assert events == [
+        dispatcher.ChangeEvent("A", "Submaster", None, 11, 7),
+        dispatcher.ChangeEvent("A", "Mode", None, 2, 7),
+    ]
+    assert received == [events]
+    assert table.row_writes == writes + 1  # one replaceRow for the changed instance
+    assert table.cells[1][dispatcher.column_for("Submaster")] == "11"
+
+    # Unchanged values: no write, no event
+    assert dispatcher.update_from_dmx(16, {"A": {"Submaster": 11}}, {}, frame=8) == []
+    assert len(received) == 1
+    events = dispatcher.update_from_dmx(16, {"A": {"Submaster": 12}}, {}, frame=9)
+    assert events == [dispatcher.ChangeEvent("A", "Submaster", 11, 12, 9)]
+
+
+def test_new_instance_resizes_the_grid_once(grid):
+    table, _ = grid
+    rewrites = table.rewrites
+    dispatcher.update_from_dmx(16, {"NEW": {"Submaster": 1}, "A": {"Submaster": 2}}, {}, frame=1)
+    assert table.rewrites == rewrites + 1
+    assert table.cells[3][0] == "NEW"
+    assert table.cells[3][dispatcher.column_for("Submaster")] == "1"
+
+
+def test_resubscribing_a_callback_replaces_it(grid):
+    calls = []
+
+    def on_changes(events):
+        calls.append(events)
+
+    dispatcher.subscribe(on_changes)
+    dispatcher.subscribe(on_changes)
+    dispatcher.update_from_dmx(16, {"A": {"Mode": 1}}, {}, frame=1)
+    assert len(calls) == 1
+
+
+def test_reload_instances_keeps_values_and_reports_removed_instances(grid):
+    table, definitions = grid
+    dispatcher.update_from_dmx(16, {"A": {"Submaster": 5}, "B": {"Submaster": 6, "Mode": 1}}, {}, frame=1)
+    received = []
+    dispatcher.subscribe(received.append)
+    version = dispatcher.layout_version()
+
+    definitions[:] = [_inst("A"), _inst("C")]
+    dispatcher.reload_instances(frame=2)
+
+    assert dispatcher.layout_version() == version + 1
+    assert dispatcher.instances() == ("A", "C")
+    assert dispatcher.current_values("A") == {"Submaster": 5}
+    assert dispatcher.current_values("B") == {}
+    assert received == [[
+        dispatcher.ChangeEvent("B", "Submaster", 6, None, 2),
+        dispatcher.ChangeEvent("B", "Mode", 1, None, 2),
+    ]]
+    assert [row[0] for row in table.cells[1:]] == ["A", "C"]
+    assert table.cells[1][dispatcher.column_for("Submaster")] == "5"
@@ -0,0 +1,91 @@
+"""Tests for the S2L universe -> decode plan index."""
+
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+SRC_PATH = BASE_PATH / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+import s2l_unit as s2l  # noqa: E402
+
+
+def _inst(name, universe, start, enabled=True):
+    return s2l.InstanceDefinition(
+        instance=name, enabled=enabled, universe=universe, start_address=start, eos_ip="127.0.0.1"
+    )
+
+
+def test_index_groups_enabled_instances_by_universe():
+    index = s2l.build_universe_index(
+        [_inst("A", 16, 21), _inst("B", 16, 1), _inst("C", 17, 1), _inst("D", 17, 41, enabled=False)]
+    )
+    assert list(index) == [16, 17]
+    assert [inst.instance for inst in index[16].instances] == ["B", "A"]
+    assert index[16].required_slots == 39
+    assert [inst.instance for inst in index[17].instances] == ["C"]
+
+
+def test_decoder_skips_unchanged_payloads():
+    index = s2l.build_universe_index([_inst("A", 16, 1), _inst("B", 17, 1)])
+    decoder = s2l.MultiUniverseDecoder(index, scaling=False)
+    payload16 = bytearray(512)
+    payload16[0:2] = b"\x00\x0b"  # Submaster 11
+    payload17 = bytes(512)
+
+    first = decoder.decode_changed({16: bytes(payload16), 17: payload17, 99: payload17})
+    assert set(first) == {16, 17}
+    assert first[16]["A"]["Submaster"] == 11
+
+    payload16[1] = 12
+    second = decoder.decode_changed({16: bytes(payload16), 17: payload17})
+    assert list(second) == [16]
+    assert second[16]["A"]["Submaster"] == 12
+
+
+def test_decoder_reports_short_buffers():
+    decoder = s2l.MultiUniverseDecoder(s2l.build_universe_index([_inst("A", 16, 1)]))
+    assert decoder.decode_changed({16: bytes(5)}) == {}
+    assert 16 in decoder.errors
+
+
+def test_snapshot_service_decodes_once_per_frame():
+    index = s2l.build_universe_index([_inst("A", 16, 1)])
+    service = s2l.DMXSnapshotService(s2l.MultiUniverseDecoder(index, scaling=False))
+    received = []
+    service.register(received.append)
+    service.register(received.append)  # duplicate registration is ignored
+    other = []
+    service.register(other.append)
+
+    payload = bytes([0, 11] + [0] * 510)
+    assert len(service.publish(1, {16: payload})) == 1
+    assert service.publish(1, {16: bytes(512)}) == []  # same frame: no work
+    assert service.publish(2, {16: payload}) == []  # unchanged payload
+
+    assert len(received) == 1 and other[0] is received[0]
+    snap = received[0]
+    assert (snap.universe, snap.frame, snap.sequence) == (16, 1, 1)
+    assert snap.values["A"]["Submaster"] == 11
+    try:
+        snap.values["A"]["Submaster"] = 1  # type: ignore[index]
+    except TypeError:
+        pass
+    else:  # pragma: no cover
+        raise AssertionError("snapshot values must be read-only")
+
+
+def test_snapshot_service_isolates_failing_consumers():
+    index = s2l.build_universe_index([_inst("A", 16, 1)])
+    service = s2l.DMXSnapshotService(s2l.MultiUniverseDecoder(index))
+    received = []
+
+    def broken(_snapshot):
+        raise RuntimeError("boom")
+
+    service.register(broken)
+    service.register(received.append)
+    service.publish(1, {16: bytes(512)})
+    assert len(received) == 1
+    assert service.consumer_errors[0][0] is broken
@@ -30,7 +30,7 @@ st = state_mod.state
 print(f"\nAfter simulation:")
 print(f"  Counts: {dict(st.counts)}")
 print(f"  ip queue: {list(st.queues['ip'])[:5]}... ({len(st.queues['ip'])} total)")
-print(f"  ip active: {st.active['ip']}")
+print(f"  ip in flight: {sorted(st.windows['ip'].in_flight)}")
 
 # Check table
 table = base.op("palette_logic/pal_ip")